@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Artifact passing benchmark for MCPturbo.
+
+Runs a fan-out workflow where one task produces a large multi-file bundle
+(``bytes``, files concatenated with an offset table) and several dependent
+tasks split it into files concurrently. Compares the previous data flow
+(merged dict per task, agents slicing ``bytes``) with :class:`TaskInputs`
+and zero-copy ``memoryview`` slices, reporting peak traced memory.
+
+Example:
+    python benchmarks/bench_artifacts.py --mb 50 --consumers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for package in ("core", "agents", "orchestrator"):
+    sys.path.insert(0, str(ROOT / "packages" / package / "src"))
+
+from mcpturbo_agents.base_agent import LocalAgent  # noqa: E402
+from mcpturbo_core.messages import Priority  # noqa: E402
+from mcpturbo_core.protocol import protocol  # noqa: E402
+from mcpturbo_orchestrator import ProjectOrchestrator, Task, Workflow, WorkflowStatus  # noqa: E402
+
+FILE_SIZE = 64 * 1024
+
+
+class LegacyOrchestrator(ProjectOrchestrator):
+    """The previous ``_execute_task`` data flow, kept for comparison"""
+
+    async def _execute_task(self, workflow, task):
+        task.status = WorkflowStatus.RUNNING
+        task.started_at = datetime.utcnow()
+        task.attempts += 1
+        task_data = {**task.data, **workflow.context}
+        for dep_id in task.dependencies:
+            dep = workflow.get_task(dep_id)
+            if dep and dep.status == WorkflowStatus.COMPLETED:
+                task_data[f"{dep_id}_result"] = dep.result
+        response = await protocol.send_request(
+            "orchestrator", task.agent_id, task.action, data=task_data,
+            timeout=task.timeout, priority=Priority(task.priority.value),
+        )
+        task.result = response.result if response.success else None
+        task.status = WorkflowStatus.COMPLETED if response.success else WorkflowStatus.FAILED
+        task.completed_at = datetime.utcnow()
+
+
+class Generator(LocalAgent):
+    def __init__(self, size: int):
+        super().__init__("bench_generator", "Generator")
+        self.size = size
+
+    async def handle_request(self, request):
+        return bytearray(b"x" * self.size)
+
+
+class Splitter(LocalAgent):
+    """Splits the bundle into files and keeps them while it 'reviews' them"""
+
+    def __init__(self, zero_copy: bool):
+        super().__init__("bench_splitter", "Splitter")
+        self.zero_copy = zero_copy
+
+    async def handle_request(self, request):
+        if self.zero_copy:
+            bundle = request.data.view("gen_result")
+        else:
+            bundle = request.data["gen_result"]
+        files = [bundle[i:i + FILE_SIZE] for i in range(0, len(bundle), FILE_SIZE)]
+        await asyncio.sleep(0.01)
+        return len(files)
+
+
+async def run(orchestrator_cls, zero_copy: bool, size: int, consumers: int) -> dict:
+    protocol.agents.clear()
+    orch = orchestrator_cls()
+    orch.register_agent(Generator(size), rate_limit=10**6)
+    orch.register_agent(Splitter(zero_copy), rate_limit=10**6)
+    tasks = [Task(id="gen", agent_id="bench_generator", action="generate", data={}, timeout=30)]
+    tasks += [
+        Task(id=f"review{i}", agent_id="bench_splitter", action="review", data={},
+             dependencies=["gen"], timeout=30)
+        for i in range(consumers)
+    ]
+    workflow = Workflow(id=f"bench_{zero_copy}", name="bench", tasks=tasks)
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = await orch.execute_workflow(workflow)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert result["status"] == "completed", result
+    return {"peak_mb": peak / 2**20, "seconds": elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark artifact passing between tasks")
+    parser.add_argument("--mb", type=int, default=50, help="Size of the generated bundle in MB")
+    parser.add_argument("--consumers", type=int, default=8, help="Dependent tasks reading the bundle")
+    args = parser.parse_args()
+
+    size = args.mb * 2**20
+    report = {
+        "bundle_mb": args.mb,
+        "consumers": args.consumers,
+        "legacy": asyncio.run(run(LegacyOrchestrator, False, size, args.consumers)),
+        "artifacts": asyncio.run(run(ProjectOrchestrator, True, size, args.consumers)),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Codec benchmark for MCPturbo.
+
+Encodes and decodes a request carrying a large code blob with the standard
+library ``json`` module (what aiohttp's ``json=`` does) and with every codec
+available in :mod:`mcpturbo_core.codecs`, reporting throughput and size.
+
+Example:
+    python benchmarks/bench_codecs.py --blob-kb 256 --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for package in ("core", "agents", "orchestrator"):
+    sys.path.insert(0, str(ROOT / "packages" / package / "src"))
+
+from mcpturbo_core.codecs import available_codecs, get_codec  # noqa: E402
+from mcpturbo_core.messages import Message, create_request  # noqa: E402
+
+
+def make_payload(blob_kb: int) -> dict:
+    line = "    result = compute(value, options)  # comentário ünicode\n"
+    code = line * (blob_kb * 1024 // len(line) + 1)
+    request = create_request(
+        "orchestrator", "coder", "code_review",
+        data={"files": [{"path": f"src/module_{i}.py", "content": code} for i in range(4)]},
+    )
+    return request.to_dict()
+
+
+def rate(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark message codecs")
+    parser.add_argument("--blob-kb", type=int, default=256, help="Size of each code file in KiB")
+    parser.add_argument("--iterations", type=int, default=2000, help="Encode/decode calls per codec")
+    args = parser.parse_args()
+
+    payload = make_payload(args.blob_kb)
+    encoded = json.dumps(payload).encode()
+    report = {
+        "payload_bytes": len(encoded),
+        "stdlib_json": {
+            "encode_per_s": rate(lambda: json.dumps(payload).encode(), args.iterations),
+            "decode_per_s": rate(lambda: json.loads(encoded), args.iterations),
+            "bytes": len(encoded),
+        },
+    }
+    for name, usable in available_codecs().items():
+        if not usable:
+            report[name] = "not installed"
+            continue
+        codec = get_codec(name)
+        data = codec.dumps(payload)
+        report[name] = {
+            "encode_per_s": rate(lambda: codec.dumps(payload), args.iterations),
+            "decode_per_s": rate(lambda: codec.loads(data), args.iterations),
+            "message_roundtrip_per_s": rate(
+                lambda: Message.from_dict(codec.loads(codec.dumps(payload))), args.iterations
+            ),
+            "bytes": len(data),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Event routing benchmark for MCPturbo.
+
+Registers ``--subscriptions`` fine-grained topic patterns (as dashboards
+do: one per workflow and task kind, plus a few wildcards) and measures how
+fast the subscribers of a published topic are resolved by
+
+* a linear scan that matches every pattern against the topic, and
+* :class:`~mcpturbo_core.events.TopicIndex`, cold (trie walk on every
+  event) and warm (cached route per topic).
+
+Example:
+    python benchmarks/bench_events.py --subscriptions 500 --events 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for package in ("core", "agents", "orchestrator"):
+    sys.path.insert(0, str(ROOT / "packages" / package / "src"))
+
+from mcpturbo_core.events import EventBus  # noqa: E402
+
+KINDS = ("started", "completed", "failed", "progress")
+
+
+def matches(pattern: str, topic: str) -> bool:
+    pattern_parts, topic_parts = pattern.split("."), topic.split(".")
+    for index, part in enumerate(pattern_parts):
+        if part == "#":
+            return True
+        if index >= len(topic_parts) or (part != "*" and part != topic_parts[index]):
+            return False
+    return len(pattern_parts) == len(topic_parts)
+
+
+def build(subscriptions: int) -> tuple[EventBus, list[str]]:
+    bus = EventBus()
+    workflows = max(1, subscriptions // len(KINDS))
+    patterns = ["workflow.*.task.failed", "workflow.#", "#"]
+    patterns += [f"workflow.wf{w}.task.{kind}" for w in range(workflows) for kind in KINDS]
+    for pattern in patterns[:subscriptions]:
+        bus.subscribe(pattern, lambda payload: None)
+    topics = [f"workflow.wf{w}.task.{kind}" for w in range(workflows) for kind in KINDS]
+    return bus, topics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark topic routing")
+    parser.add_argument("--subscriptions", type=int, default=500)
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+
+    bus, topics = build(args.subscriptions)
+    rng = random.Random(1)
+    stream = [rng.choice(topics) for _ in range(args.events)]
+    patterns = list(bus.subscriptions)
+
+    start = time.perf_counter()
+    scanned = sum(sum(len(bus.subscriptions[p]) for p in patterns if matches(p, t)) for t in stream)
+    scan = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cold = 0
+    for topic in stream:
+        bus.index._routes.clear()
+        cold += len(bus.handlers(topic))
+    trie = time.perf_counter() - start
+
+    start = time.perf_counter()
+    warm = sum(len(bus.handlers(topic)) for topic in stream)
+    cached = time.perf_counter() - start
+    assert scanned == cold == warm
+
+    report = {
+        "subscriptions": sum(len(s) for s in bus.subscriptions.values()),
+        "linear_scan_us_per_event": scan / args.events * 1e6,
+        "trie_us_per_event": trie / args.events * 1e6,
+        "trie_cached_us_per_event": cached / args.events * 1e6,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Handler execution mode benchmark for MCPturbo.
+
+Sends concurrent requests to a :class:`LocalAgent` whose handler is
+CPU-bound pure Python (tokenizing and re-joining generated source) and
+measures wall time and event loop stalls for the ``inline``, ``thread``
+and ``process`` execution modes.
+
+Example:
+    python benchmarks/bench_executors.py --requests 32 --size 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import sys
+import time
+import tokenize
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for package in ("core", "agents", "orchestrator"):
+    sys.path.insert(0, str(ROOT / "packages" / package / "src"))
+
+from mcpturbo_agents import LocalAgent, shutdown_executors  # noqa: E402
+from mcpturbo_core.messages import create_request  # noqa: E402
+
+
+def format_code(request) -> int:
+    """CPU-bound handler: tokenize the source and count tokens"""
+    source = request.data["source"]
+    tokens = tokenize.generate_tokens(io.StringIO(source).readline)
+    return sum(1 for _ in tokens)
+
+
+async def run(mode: str, requests: int, source: str) -> dict:
+    agent = LocalAgent("formatter", "Formatter", max_concurrent_requests=requests)
+    agent.register_handler("format", format_code, execution_mode=mode)
+    batch = [create_request("bench", "formatter", "format", data={"source": source}) for _ in range(requests)]
+
+    worst_gap = 0.0
+    stop = False
+
+    async def ticker():
+        nonlocal worst_gap
+        last = time.perf_counter()
+        while not stop:
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            worst_gap = max(worst_gap, now - last)
+            last = now
+
+    # Calentar el pool para no medir el arranque de los workers
+    await agent.execute_with_semaphore(batch[0])
+    tick = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(agent.execute_with_semaphore(r) for r in batch))
+    elapsed = time.perf_counter() - start
+    stop = True
+    await tick
+    return {"seconds": elapsed, "max_loop_stall_ms": worst_gap * 1000}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark handler execution modes")
+    parser.add_argument("--requests", type=int, default=32, help="Concurrent requests")
+    parser.add_argument("--size", type=int, default=200000, help="Approximate source size in characters")
+    args = parser.parse_args()
+
+    line = "def handler(x, y):\n    return [i * x + y for i in range(10) if i % 2]\n"
+    source = line * (args.size // len(line))
+    report = {}
+    for mode in ("inline", "thread", "process"):
+        report[mode] = asyncio.run(run(mode, args.requests, source))
+        shutdown_executors()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
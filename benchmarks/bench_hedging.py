@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Hedged request benchmark for MCPturbo.
+
+Two simulated providers share a heavy-tailed latency distribution: most
+calls take ``--base`` seconds, and ``--slow-rate`` of them take ``--slow``
+seconds. The benchmark sends ``--requests`` requests in batches of
+``--concurrency``, with and without a hedge policy, and reports latency
+percentiles and how many extra requests hedging cost.
+
+Example:
+    python benchmarks/bench_hedging.py --requests 400 --slow-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for package in ("core", "agents", "orchestrator"):
+    sys.path.insert(0, str(ROOT / "packages" / package / "src"))
+
+from mcpturbo_agents import LocalAgent  # noqa: E402
+from mcpturbo_core.hedging import HedgeBudget  # noqa: E402
+from mcpturbo_core.protocol import MCPProtocol  # noqa: E402
+from mcpturbo_core.retry import RetryPolicy  # noqa: E402
+
+
+class Provider(LocalAgent):
+    def __init__(self, agent_id: str, base: float, slow: float, slow_rate: float, rng: random.Random):
+        super().__init__(agent_id, agent_id.title(), max_concurrent_requests=1000)
+        self.base, self.slow, self.slow_rate, self.rng = base, slow, slow_rate, rng
+        self.calls = 0
+
+    async def handle_request(self, request):
+        self.calls += 1
+        delay = self.slow if self.rng.random() < self.slow_rate else self.base * self.rng.uniform(0.8, 1.2)
+        await asyncio.sleep(delay)
+        return {"by": self.config.agent_id}
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(hedged: bool, args) -> dict:
+    rng = random.Random(args.seed)
+    protocol = MCPProtocol(retry_policy=RetryPolicy(max_attempts=1), hedge_budget=HedgeBudget(ratio=0.1))
+    primary = Provider("openai", args.base, args.slow, args.slow_rate, rng)
+    backup = Provider("deepseek", args.base, args.slow, args.slow_rate, rng)
+    for agent in (primary, backup):
+        protocol.register_agent(agent.config.agent_id, agent, rate_limit=10**6)
+    if hedged:
+        protocol.hedge("openai", "code_generation", [("deepseek", "fast_coding")],
+                       percentile=0.9, min_samples=20, initial_delay=args.base * 2)
+
+    latencies = []
+
+    async def one():
+        start = time.perf_counter()
+        await protocol.send_request("bench", "openai", "code_generation", {"prompt": "x"})
+        latencies.append(time.perf_counter() - start)
+
+    for offset in range(0, args.requests, args.concurrency):
+        await asyncio.gather(*(one() for _ in range(min(args.concurrency, args.requests - offset))))
+    await protocol.stop()
+
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies) * 1000,
+        "extra_requests_pct": 100 * backup.calls / args.requests,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark hedged requests")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--base", type=float, default=0.02, help="Typical latency (s)")
+    parser.add_argument("--slow", type=float, default=0.2, help="Tail latency (s)")
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    report = {
+        "no_hedging": asyncio.run(run(False, args)),
+        "hedging": asyncio.run(run(True, args)),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
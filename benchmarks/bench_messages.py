@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Message allocation benchmark for MCPturbo.
+
+Compares the slotted message classes in :mod:`mcpturbo_core.messages` with
+the previous dataclass layout (``uuid4`` id, ``datetime.utcnow()`` and a
+fresh dict per message, ``to_dict`` through ``super()`` chains), measuring
+construction throughput, ``to_dict`` throughput and memory per message.
+
+Example:
+    python benchmarks/bench_messages.py --messages 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+for package in ("core", "agents", "orchestrator"):
+    sys.path.insert(0, str(ROOT / "packages" / package / "src"))
+
+from mcpturbo_core.messages import MessageType, Priority, Request, Response  # noqa: E402
+from mcpturbo_core.policy import current_policy  # noqa: E402
+
+
+# Layout anterior, para comparar
+@dataclass
+class LegacyMessage:
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    type: MessageType = MessageType.REQUEST
+    sender: str = ""
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+    data: Dict[str, Any] = field(default_factory=dict)
+    priority: Priority = Priority.NORMAL
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": self.type.value,
+            "sender": self.sender,
+            "timestamp": self.timestamp.isoformat(),
+            "data": self.data,
+            "priority": self.priority.value,
+        }
+
+
+@dataclass
+class LegacyRequest(LegacyMessage):
+    target: str = ""
+    action: str = ""
+    timeout: int = 30
+    correlation_id: Optional[str] = None
+
+    def __post_init__(self):
+        if self.timeout > current_policy().timeout:
+            raise ValueError("timeout")
+
+    def to_dict(self) -> Dict[str, Any]:
+        base = super().to_dict()
+        base.update({
+            "target": self.target,
+            "action": self.action,
+            "timeout": self.timeout,
+            "correlation_id": self.correlation_id,
+        })
+        return base
+
+
+@dataclass
+class LegacyResponse(LegacyMessage):
+    type: MessageType = MessageType.RESPONSE
+    target: str = ""
+    request_id: str = ""
+    success: bool = True
+    result: Any = None
+    error: Optional[str] = None
+    execution_time: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        base = super().to_dict()
+        base.update({
+            "target": self.target,
+            "request_id": self.request_id,
+            "success": self.success,
+            "result": self.result,
+            "error": self.error,
+            "execution_time": self.execution_time,
+        })
+        return base
+
+
+def build_pairs(request_cls, response_cls, count: int) -> list:
+    """A request and its response per iteration, as send_request does."""
+    messages = []
+    for i in range(count):
+        request = request_cls(sender="bench", target="agent", action="run")
+        messages.append(request)
+        messages.append(response_cls(sender="agent", target="bench", request_id=request.id, result=i))
+    return messages
+
+
+def measure(request_cls, response_cls, count: int) -> dict:
+    gc.collect()
+    start = time.perf_counter()
+    messages = build_pairs(request_cls, response_cls, count)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for message in messages:
+        message.to_dict()
+    serialize_time = time.perf_counter() - start
+    del messages
+
+    gc.collect()
+    tracemalloc.start()
+    messages = build_pairs(request_cls, response_cls, count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del messages
+
+    return {
+        "messages_per_s": 2 * count / build_time,
+        "to_dict_per_s": 2 * count / serialize_time,
+        "bytes_per_message": current / (2 * count),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark message allocation")
+    parser.add_argument("--messages", type=int, default=100000, help="Request/response pairs")
+    args = parser.parse_args()
+
+    report = {
+        "legacy_dataclass": measure(LegacyRequest, LegacyResponse, args.messages),
+        "slotted": measure(Request, Response, args.messages),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Agent registry lookup benchmark for MCPturbo.
+
+Registers ``--agents`` local agents spread over ``--tenants`` tenants (each
+tenant has its own capability names, as in a multi-tenant deployment) and
+measures per-call cost of the registry lookups against the linear scans
+they replaced, which are reproduced here.
+
+Example:
+    python benchmarks/bench_registry.py --agents 10000 --tenants 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for package in ("core", "agents", "orchestrator"):
+    sys.path.insert(0, str(ROOT / "packages" / package / "src"))
+
+from mcpturbo_agents import AgentCapability, AgentRegistry, AgentType, create_local_agent  # noqa: E402
+
+
+def scan_by_capability(registry: AgentRegistry, capability: str) -> list[str]:
+    return [
+        agent_id for agent_id, agent in registry.agents.items()
+        if any(cap.name == capability for cap in agent.capabilities)
+    ]
+
+
+def scan_by_action(registry: AgentRegistry, action: str) -> list[str]:
+    return [
+        agent_id for agent_id, agent in registry.agents.items()
+        if action in agent.handlers or any(cap.name == action for cap in agent.capabilities)
+    ]
+
+
+def scan_by_type(registry: AgentRegistry, agent_type: AgentType) -> list[str]:
+    return [i for i, agent in registry.agents.items() if agent.config.agent_type == agent_type]
+
+
+def scan_summary(registry: AgentRegistry) -> dict:
+    type_counts: dict = {}
+    status_counts: dict = {}
+    for agent in registry.agents.values():
+        type_counts[agent.config.agent_type.value] = type_counts.get(agent.config.agent_type.value, 0) + 1
+        status_counts[agent.status.value] = status_counts.get(agent.status.value, 0) + 1
+    capabilities = sorted({cap.name for agent in registry.agents.values() for cap in agent.capabilities})
+    return {"by_type": type_counts, "by_status": status_counts, "capabilities": capabilities,
+            "oldest": min(registry.registered_at.values()), "newest": max(registry.registered_at.values())}
+
+
+def per_call_us(fn, args_list) -> float:
+    start = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark registry lookups")
+    parser.add_argument("--agents", type=int, default=10000)
+    parser.add_argument("--tenants", type=int, default=1000)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    registry = AgentRegistry()
+    start = time.perf_counter()
+    for n in range(args.agents):
+        tenant = n % args.tenants
+        agent = create_local_agent(f"t{tenant}-agent{n}")
+        agent.add_capability(AgentCapability(f"t{tenant}.summarize", "", {}, {}))
+        agent.add_capability(AgentCapability(f"t{tenant}.code_generation", "", {}, {}))
+        registry.register(agent)
+    create_and_register_us = (time.perf_counter() - start) / args.agents * 1e6
+
+    rng = random.Random(1)
+    capabilities = [(registry, f"t{rng.randrange(args.tenants)}.summarize") for _ in range(args.lookups)]
+    actions = [(registry, f"t{rng.randrange(args.tenants)}.code_generation") for _ in range(args.lookups)]
+    summaries = [(registry,)] * max(1, args.lookups // 10)
+
+    assert scan_by_capability(*capabilities[0]) == registry.list_by_capability(capabilities[0][1])
+    assert scan_by_action(*actions[0]) == registry.find_agents_by_action(actions[0][1])
+
+    results = {
+        "list_by_capability": (
+            per_call_us(scan_by_capability, capabilities),
+            per_call_us(lambda r, c: r.list_by_capability(c), capabilities),
+        ),
+        "find_agents_by_action": (
+            per_call_us(scan_by_action, actions),
+            per_call_us(lambda r, a: r.find_agents_by_action(a), actions),
+        ),
+        "list_by_type": (
+            per_call_us(lambda r: scan_by_type(r, AgentType.EXTERNAL_API), summaries),
+            per_call_us(lambda r: r.list_by_type(AgentType.EXTERNAL_API), summaries),
+        ),
+        "get_summary": (
+            per_call_us(scan_summary, summaries),
+            per_call_us(lambda r: r.get_summary(), summaries),
+        ),
+    }
+    report = {
+        "agents": args.agents,
+        "create_and_register_us_per_agent": create_and_register_us,
+        **{
+            name: {"linear_scan_us": scan, "indexed_us": indexed, "speedup": scan / indexed}
+            for name, (scan, indexed) in results.items()
+        },
+        "select_us": per_call_us(lambda r, a: r.select(a), actions),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Request admission-check benchmark for MCPturbo.
+
+Measures the per-request cost of the configuration checks done on every
+``send_request`` and ``Request`` construction: the previous implementation
+(``get_config()`` plus list/dict lookups on each call) against the
+precompiled :class:`RequestPolicy`. Optionally measures the full
+``send_request`` overhead against a no-op local agent.
+
+Example:
+    python benchmarks/bench_request_policy.py --iterations 200000 --send 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for package in ("core", "agents", "orchestrator"):
+    sys.path.insert(0, str(ROOT / "packages" / package / "src"))
+
+from mcpturbo_core.config import MCPConfig, get_config, set_config  # noqa: E402
+from mcpturbo_core.exceptions import MCPError  # noqa: E402
+from mcpturbo_core.messages import Request  # noqa: E402
+from mcpturbo_core.policy import allow_all, current_policy  # noqa: E402
+
+
+def legacy_check(action, data, timeout) -> bool:
+    """The original per-request checks (without the blocking input())."""
+    config = get_config()
+    if action in config.tool_permissions and not config.tool_permissions[action]:
+        raise MCPError(f"Action '{action}' is not permitted by configuration.")
+    needs_confirmation = action in config.sensitive_actions
+    if timeout > config.timeout:
+        raise MCPError("timeout")
+    max_tokens = (data or {}).get("max_tokens")
+    if max_tokens and max_tokens > config.max_tokens:
+        raise MCPError("max_tokens")
+    return needs_confirmation
+
+
+def legacy_post_init(timeout: int):
+    config = get_config()
+    if timeout > config.timeout:
+        raise ValueError("timeout")
+
+
+def policy_check(action, data, timeout) -> bool:
+    return current_policy().check(action, data, timeout)
+
+
+def policy_post_init(timeout: int):
+    if timeout > current_policy().timeout:
+        raise ValueError("timeout")
+
+
+def time_per_call(func, args, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(*args)
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+async def run_send(requests: int) -> dict:
+    from mcpturbo_agents.base_agent import LocalAgent
+    from mcpturbo_core.admission import AdmissionQueue
+    from mcpturbo_core.protocol import MCPProtocol
+    from mcpturbo_core.retry import RetryPolicy
+
+    class NoopAgent(LocalAgent):
+        async def handle_request(self, request):
+            return None
+
+    protocol = MCPProtocol(
+        retry_policy=RetryPolicy(max_attempts=1),
+        admission=AdmissionQueue(max_concurrent=10**6, max_depth=10**6),
+        confirmation_hook=allow_all,
+    )
+    protocol.register_agent("noop", NoopAgent("noop", "Noop"), rate_limit=10**9)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await protocol.send_request("bench", "noop", "noop", {"max_tokens": 100})
+    elapsed = time.perf_counter() - start
+    await protocol.stop()
+    return {"requests": requests, "overhead_us_per_request": elapsed / requests * 1e6}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-request config checks")
+    parser.add_argument("--iterations", type=int, default=200000, help="Calls per micro benchmark")
+    parser.add_argument("--send", type=int, default=0, help="Also time N send_request calls")
+    parser.add_argument(
+        "--sensitive-actions",
+        type=int,
+        default=50,
+        help="Size of the sensitive_actions list (lookup is O(n) in the legacy path)",
+    )
+    args = parser.parse_args()
+
+    set_config(MCPConfig(
+        sensitive_actions=[f"action_{i}" for i in range(args.sensitive_actions)],
+        tool_permissions={f"tool_{i}": True for i in range(20)},
+    ))
+    call = ("generate_text", {"prompt": "hi", "max_tokens": 100}, 30)
+
+    report = {
+        "check_ns": {
+            "legacy": time_per_call(legacy_check, call, args.iterations),
+            "policy": time_per_call(policy_check, call, args.iterations),
+        },
+        "request_post_init_ns": {
+            "legacy": time_per_call(legacy_post_init, (30,), args.iterations),
+            "policy": time_per_call(policy_post_init, (30,), args.iterations),
+        },
+        "request_construction_ns": time_per_call(
+            lambda: Request(sender="a", target="b", action="c"), (), args.iterations // 10
+        ),
+    }
+    if args.send:
+        report["send_request"] = asyncio.run(run_send(args.send))
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
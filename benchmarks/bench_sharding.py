@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Sharded runtime throughput benchmark for MCPturbo.
+
+Starts a local mock LLM server (aiohttp, in its own process) and sends
+requests through :class:`ShardedRuntime` with 1..N worker processes, each
+running its own :class:`MCPProtocol` with an :class:`ExternalAgent` pointed
+at the mock. Rate-limit and circuit state are shared between workers.
+
+Example:
+    python benchmarks/bench_sharding.py --max-workers 4 --requests 4000 --latency-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for package in ("core", "agents", "orchestrator"):
+    sys.path.insert(0, str(ROOT / "packages" / package / "src"))
+
+from aiohttp import web  # noqa: E402
+
+from mcpturbo_agents.base_agent import ExternalAgent  # noqa: E402
+from mcpturbo_core.admission import AdmissionQueue  # noqa: E402
+from mcpturbo_core.retry import RetryPolicy  # noqa: E402
+from mcpturbo_core.sharding import SharedState, ShardedRuntime  # noqa: E402
+
+RATE_LIMIT = 10**7
+
+
+def serve_mock(port: int, latency: float):
+    """Mock chat-completions endpoint: fixed latency plus JSON work"""
+
+    async def chat(request):
+        body = await request.json()
+        await asyncio.sleep(latency)
+        text = " ".join(["token"] * 200)
+        return web.json_response({
+            "choices": [{"message": {"role": "assistant", "content": text}}],
+            "usage": {"prompt_tokens": len(str(body)), "completion_tokens": 200},
+        })
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", chat)
+    web.run_app(app, host="127.0.0.1", port=port, print=None, access_log=None)
+
+
+class MockSetup:
+    """Picklable worker setup registering the mock agent"""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    def __call__(self, protocol, index):
+        agent = ExternalAgent("mock", "Mock LLM", api_url=self.url)
+        protocol.register_agent("mock", agent, rate_limit=RATE_LIMIT)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_port(port: int, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise RuntimeError("mock server did not start")
+
+
+async def run(workers: int, url: str, requests: int, concurrency: int) -> dict:
+    shared = SharedState({"mock": {"rate_limit": RATE_LIMIT}})
+    runtime = ShardedRuntime(
+        workers, MockSetup(url), shared=shared,
+        protocol_options={
+            "retry_policy": RetryPolicy(max_attempts=1),
+            "admission": AdmissionQueue(max_concurrent=10**6, max_depth=10**6),
+        },
+    )
+    await runtime.start()
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def one(i):
+        nonlocal failures
+        async with semaphore:
+            response = await runtime.send_request("bench", "mock", "generate", data={"prompt": f"p{i}"})
+            failures += not response.success
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    await runtime.stop()
+    return {"requests_per_s": requests / elapsed, "seconds": elapsed, "failures": failures}
+
+
+async def main_async(args) -> dict:
+    port = free_port()
+    server = multiprocessing.Process(target=serve_mock, args=(port, args.latency_ms / 1000), daemon=True)
+    server.start()
+    try:
+        await wait_for_port(port)
+        url = f"http://127.0.0.1:{port}/v1/chat/completions"
+        report = {"cpus": os.cpu_count(), "requests": args.requests, "concurrency": args.concurrency}
+        for workers in range(1, args.max_workers + 1):
+            report[f"workers_{workers}"] = await run(workers, url, args.requests, args.concurrency)
+        return report
+    finally:
+        server.terminate()
+        server.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the sharded runtime")
+    parser.add_argument("--max-workers", type=int, default=4, help="Scale from 1 to N workers")
+    parser.add_argument("--requests", type=int, default=4000, help="Requests per run")
+    parser.add_argument("--concurrency", type=int, default=256, help="In-flight requests")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Mock server latency")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Workflow scheduling benchmark for MCPturbo.
+
+Builds synthetic task DAGs and measures the per-task cost of resolving
+dependencies with the indexed :class:`Workflow` model, compared with the
+previous full-rescan ``get_ready_tasks`` implementation. Optionally runs
+the DAG end to end through :class:`ProjectOrchestrator` with a no-op agent
+to measure the complete scheduling overhead per task.
+
+Example:
+    python benchmarks/bench_workflow.py --tasks 10000 --deps 3 --orchestrator
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+for package in ("core", "agents", "orchestrator"):
+    sys.path.insert(0, str(ROOT / "packages" / package / "src"))
+
+from mcpturbo_orchestrator import ProjectOrchestrator, Task, Workflow, WorkflowStatus  # noqa: E402
+
+
+def build_dag(tasks: int, deps: int, agent_id: str = "noop", seed: int = 42) -> List[Task]:
+    """Random DAG where every task depends on up to ``deps`` earlier tasks."""
+    rng = random.Random(seed)
+    result = []
+    for i in range(tasks):
+        parents = rng.sample(range(i), min(deps, i)) if i else []
+        result.append(
+            Task(
+                id=f"t{i}",
+                agent_id=agent_id,
+                action="noop",
+                data={},
+                dependencies=[f"t{p}" for p in parents],
+                timeout=30,
+            )
+        )
+    return result
+
+
+def legacy_get_ready_tasks(tasks: List[Task]) -> List[Task]:
+    """The original O(n^2 * d) rescan, kept here for comparison."""
+    ready_tasks = []
+    for task in tasks:
+        if task.status != WorkflowStatus.PENDING:
+            continue
+        deps_completed = all(
+            any(t.id == dep_id and t.status == WorkflowStatus.COMPLETED for t in tasks)
+            for dep_id in task.dependencies
+        )
+        if not task.dependencies or deps_completed:
+            ready_tasks.append(task)
+    ready_tasks.sort(key=lambda t: t.priority.value, reverse=True)
+    return ready_tasks
+
+
+def run_indexed(tasks: int, deps: int) -> dict:
+    dag = build_dag(tasks, deps)
+    start = time.perf_counter()
+    workflow = Workflow(id="bench", name="bench", tasks=dag)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    queue = workflow.get_ready_tasks()
+    launched = {t.id for t in queue}
+    completed = 0
+    while queue:
+        task = queue.pop()
+        task.status = WorkflowStatus.COMPLETED
+        completed += 1
+        for dependent in workflow.get_dependents(task.id):
+            if dependent.id not in launched and workflow.is_ready(dependent):
+                launched.add(dependent.id)
+                queue.append(dependent)
+    resolve_time = time.perf_counter() - start
+    assert completed == tasks and workflow.is_completed()
+
+    return {
+        "tasks": tasks,
+        "index_build_ms": build_time * 1000,
+        "resolve_ms": resolve_time * 1000,
+        "overhead_us_per_task": (build_time + resolve_time) / tasks * 1e6,
+    }
+
+
+def run_legacy(tasks: int, deps: int) -> dict:
+    dag = build_dag(tasks, deps)
+    start = time.perf_counter()
+    completed = 0
+    while True:
+        ready = legacy_get_ready_tasks(dag)
+        if not ready:
+            break
+        for task in ready:
+            object.__setattr__(task, "status", WorkflowStatus.COMPLETED)
+            completed += 1
+    elapsed = time.perf_counter() - start
+    assert completed == tasks
+
+    return {
+        "tasks": tasks,
+        "resolve_ms": elapsed * 1000,
+        "overhead_us_per_task": elapsed / tasks * 1e6,
+    }
+
+
+async def run_orchestrator(tasks: int, deps: int, concurrency: int) -> dict:
+    from mcpturbo_agents.base_agent import LocalAgent
+
+    class NoopAgent(LocalAgent):
+        async def handle_request(self, request):
+            return None
+
+    orch = ProjectOrchestrator()
+    orch.max_concurrent_tasks = concurrency
+    orch.register_agent(NoopAgent("noop", "Noop Agent"), rate_limit=10**9)
+    workflow = Workflow(id="bench_e2e", name="bench", tasks=build_dag(tasks, deps))
+
+    start = time.perf_counter()
+    result = await orch.execute_workflow(workflow)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "tasks": tasks,
+        "status": result["status"],
+        "duration_s": elapsed,
+        "overhead_us_per_task": elapsed / tasks * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark workflow scheduling")
+    parser.add_argument("--tasks", type=int, default=10000, help="Tasks in the synthetic DAG")
+    parser.add_argument("--deps", type=int, default=3, help="Maximum dependencies per task")
+    parser.add_argument(
+        "--legacy-tasks",
+        type=int,
+        default=1000,
+        help="DAG size for the legacy rescan comparison (0 to skip)",
+    )
+    parser.add_argument(
+        "--orchestrator",
+        action="store_true",
+        help="Also run the DAG end to end through ProjectOrchestrator",
+    )
+    parser.add_argument("--concurrency", type=int, default=10, help="Orchestrator task concurrency")
+    args = parser.parse_args()
+
+    report = {"indexed": run_indexed(args.tasks, args.deps)}
+    if args.legacy_tasks:
+        report["legacy_rescan"] = run_legacy(args.legacy_tasks, args.deps)
+        report["indexed_same_size"] = run_indexed(args.legacy_tasks, args.deps)
+    if args.orchestrator:
+        report["orchestrator"] = asyncio.run(
+            run_orchestrator(args.tasks, args.deps, args.concurrency)
+        )
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,17 +15,23 @@ from .base_agent import (
     AgentType,
     create_local_agent,
     create_external_agent,
+    create_remote_agent,
     LocalAgent,
     ExternalAgent,
+    RemoteAgent,
     HybridAgent,
 )
 from .registry import AgentRegistry
+from .executors import HandlerExecutor, WorkerCrashedError, shutdown_executors
+from .metrics import AgentMetrics, LatencyHistogram
+from .selection import SELECTION_POLICIES
 from .genesis_agent import GenesisAgent
 
 __all__ = [
     "BaseAgent",
     "LocalAgent",
     "ExternalAgent",
+    "RemoteAgent",
     "HybridAgent",
     "GenesisAgent",
     "AgentConfig",
@@ -33,13 +39,28 @@ __all__ = [
     "AgentType",
     "AgentStatus",
     "AgentRegistry",
+    "HandlerExecutor",
+    "WorkerCrashedError",
+    "shutdown_executors",
+    "AgentMetrics",
+    "LatencyHistogram",
+    "SELECTION_POLICIES",
     "create_local_agent",
     "create_external_agent",
+    "create_remote_agent",
     "__version__",
     "__author__",
 ]
 
-registry = AgentRegistry()
+def _circuit_allows(agent_id: str) -> bool:
+    try:
+        from mcpturbo_core.protocol import protocol
+    except ImportError:  # pragma: no cover - optional core
+        return True
+    return protocol.is_available(agent_id)
+
+
+registry = AgentRegistry(health_check=_circuit_allows)
 
 
 def register_agent(agent: BaseAgent, **kwargs) -> None:
@@ -1,14 +1,19 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, Callable, List
 import asyncio
+import time
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
 
+from .executors import EXECUTION_MODES, call_handler
+from .metrics import AgentMetrics
+
 class AgentType(str, Enum):
     LOCAL = "local"
     EXTERNAL_API = "external_api"
     HYBRID = "hybrid"
+    REMOTE = "remote"
 
 class AgentStatus(str, Enum):
     IDLE = "idle"
@@ -34,22 +39,79 @@ class AgentConfig:
     timeout: int = 30
     retry_attempts: int = 3
     rate_limit: int = 50  # requests per minute
+    execution_mode: str = "inline"  # handlers síncronos: inline, thread o process
+
+    def __post_init__(self):
+        if self.execution_mode not in EXECUTION_MODES:
+            raise ValueError(
+                f"Unknown execution mode {self.execution_mode!r}, expected one of {EXECUTION_MODES}"
+            )
+
+class _HandlerMap(dict):
+    """``dict`` of action handlers that reports added and removed actions.
+
+    Lets registries keep their action index current when code assigns
+    ``agent.handlers[action] = handler`` directly.
+    """
+
+    def __init__(self, notify: Callable[[str, Any], None]):
+        super().__init__()
+        self._notify = notify
+
+    def __setitem__(self, action: str, handler: Callable):
+        added = action not in self
+        super().__setitem__(action, handler)
+        if added:
+            self._notify("action", action)
+
+    def __delitem__(self, action: str):
+        super().__delitem__(action)
+        self._notify("action_removed", action)
+
+    def update(self, *args, **kwargs):
+        for action, handler in dict(*args, **kwargs).items():
+            self[action] = handler
+
+    def setdefault(self, action: str, handler: Optional[Callable] = None) -> Callable:
+        if action not in self:
+            self[action] = handler
+        return self[action]
+
+    def pop(self, action: str, *default):
+        if action not in self:
+            return super().pop(action, *default)
+        handler = super().pop(action)
+        self._notify("action_removed", action)
+        return handler
+
+    def popitem(self):
+        action, handler = super().popitem()
+        self._notify("action_removed", action)
+        return action, handler
+
+    def clear(self):
+        for action in list(self):
+            del self[action]
+
 
 class BaseAgent(ABC):
     def __init__(self, config: AgentConfig):
         self.config = config
-        self.status = AgentStatus.IDLE
+        # ERROR/OFFLINE fijados a mano; el resto se deriva de la carga
+        self._status_override: Optional[AgentStatus] = None
         self.capabilities: List[AgentCapability] = []
-        self.handlers: Dict[str, Callable] = {}
+        # Callbacks (agent_id, evento, valor) de los registros donde está el agente
+        self._listeners: List[Callable[[str, str, Any], None]] = []
+        self.handlers: Dict[str, Callable] = _HandlerMap(self._notify)
+        self.handler_modes: Dict[str, str] = {}
         self.metadata: Dict[str, Any] = {}
-        self.stats = {
-            "requests_handled": 0,
-            "successful_requests": 0,
-            "failed_requests": 0,
-            "total_execution_time": 0.0,
-            "last_activity": None
-        }
+        # Contadores e histogramas de latencia (ver metrics.py)
+        self.metrics = AgentMetrics()
         self._semaphore = asyncio.Semaphore(config.max_concurrent_requests)
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_in_flight = 0
+        self.queued_requests = 0
         
         self._register_core_handlers()
     
@@ -68,41 +130,114 @@ class BaseAgent(ABC):
     
     async def execute_with_semaphore(self, request) -> Any:
         """Execute request with concurrency control"""
-        async with self._semaphore:
-            self.status = AgentStatus.RUNNING
-            start_time = datetime.utcnow()
-            
-            try:
-                result = await self.handle_request(request)
-                self._update_stats(True, start_time)
-                return result
-            except Exception as e:
-                self._update_stats(False, start_time)
-                raise e
-            finally:
-                self.status = AgentStatus.IDLE
+        if self._semaphore.locked():
+            self.queued_requests += 1
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self._change_in_flight(1)
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        start_time = time.perf_counter()
+        try:
+            result = await self.handle_request(request)
+            self._update_stats(True, start_time)
+            return result
+        except Exception as e:
+            self._update_stats(False, start_time)
+            raise e
+        finally:
+            self._change_in_flight(-1)
+            self._semaphore.release()
+
+    def _change_in_flight(self, delta: int):
+        if not self._listeners:
+            self.in_flight += delta
+            return
+        before = self.status
+        self.in_flight += delta
+        after = self.status
+        if after is not before:
+            self._notify("status", (before, after))
+
+    @property
+    def status(self) -> AgentStatus:
+        """ERROR/OFFLINE if set, otherwise IDLE, RUNNING or BUSY (every slot taken)"""
+        if self._status_override is not None:
+            return self._status_override
+        if not self.in_flight:
+            return AgentStatus.IDLE
+        return AgentStatus.BUSY if self.saturated else AgentStatus.RUNNING
+
+    @status.setter
+    def status(self, value: AgentStatus):
+        # IDLE/RUNNING/BUSY vuelven al estado derivado de la carga
+        before = self.status if self._listeners else None
+        value = AgentStatus(value)
+        self._status_override = value if value in (AgentStatus.ERROR, AgentStatus.OFFLINE) else None
+        if before is not None and self.status is not before:
+            self._notify("status", (before, self.status))
+
+    @property
+    def saturated(self) -> bool:
+        return self.in_flight >= self.config.max_concurrent_requests
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of concurrency slots in use, plus queued requests"""
+        return (self.in_flight + self.waiting) / max(1, self.config.max_concurrent_requests)
+
+    def get_load(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "capacity": self.config.max_concurrent_requests,
+            "utilization": self.utilization,
+            "saturated": self.saturated,
+            "peak_in_flight": self.peak_in_flight,
+            "queued_requests": self.queued_requests,
+        }
     
-    def _update_stats(self, success: bool, start_time: datetime):
-        """Update agent statistics"""
-        execution_time = (datetime.utcnow() - start_time).total_seconds()
-        
-        self.stats["requests_handled"] += 1
-        self.stats["total_execution_time"] += execution_time
-        self.stats["last_activity"] = datetime.utcnow().isoformat()
-        
-        if success:
-            self.stats["successful_requests"] += 1
-        else:
-            self.stats["failed_requests"] += 1
+    def _update_stats(self, success: bool, start_time: float):
+        """Record one request started at ``start_time`` (``time.perf_counter()``)"""
+        self.metrics.record(success, time.perf_counter() - start_time)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Request counters (see :attr:`metrics` for latency percentiles)"""
+        return self.metrics.counters()
     
     def add_capability(self, capability: AgentCapability):
         """Add a capability to this agent"""
         self.capabilities.append(capability)
         self.handlers[capability.name] = getattr(self, f"handle_{capability.name}", self._handle_unknown)
+        self._notify("capability", capability.name)
     
-    def register_handler(self, action: str, handler: Callable):
-        """Register custom handler for an action"""
+    def register_handler(self, action: str, handler: Callable, execution_mode: Optional[str] = None):
+        """Register custom handler for an action.
+
+        ``execution_mode`` overrides ``config.execution_mode`` for this
+        handler when it is synchronous (see :mod:`mcpturbo_agents.executors`).
+        """
         self.handlers[action] = handler
+        self._set_handler_mode(action, execution_mode)
+
+    def _notify(self, event: str, value: Any):
+        for listener in self._listeners:
+            listener(self.config.agent_id, event, value)
+
+    def _set_handler_mode(self, action: str, execution_mode: Optional[str]):
+        if execution_mode is None:
+            self.handler_modes.pop(action, None)
+        elif execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode {execution_mode!r}, expected one of {EXECUTION_MODES}")
+        else:
+            self.handler_modes[action] = execution_mode
+
+    async def _call_handler(self, action: str, handler: Callable, request) -> Any:
+        mode = self.handler_modes.get(action, self.config.execution_mode)
+        return await call_handler(handler, request, mode)
     
     async def _handle_ping(self, request) -> Dict[str, Any]:
         return {
@@ -120,6 +255,7 @@ class BaseAgent(ABC):
             "name": self.config.name,
             "type": self.config.agent_type.value,
             "status": self.status.value,
+            "load": self.get_load(),
             "capabilities": [cap.name for cap in self.capabilities],
             "handlers": list(self.handlers.keys()),
             "metadata": self.metadata
@@ -141,15 +277,7 @@ class BaseAgent(ABC):
         }
     
     async def _handle_stats(self, request) -> Dict[str, Any]:
-        avg_execution_time = 0
-        if self.stats["requests_handled"] > 0:
-            avg_execution_time = self.stats["total_execution_time"] / self.stats["requests_handled"]
-        
-        return {
-            **self.stats,
-            "average_execution_time": avg_execution_time,
-            "success_rate": (self.stats["successful_requests"] / max(1, self.stats["requests_handled"])) * 100
-        }
+        return self.metrics.snapshot()
     
     async def _handle_unknown(self, request) -> Dict[str, Any]:
         return {
@@ -172,15 +300,13 @@ class LocalAgent(BaseAgent):
     async def handle_request(self, request) -> Any:
         action = getattr(request, 'action', 'unknown')
         handler = self.handlers.get(action, self._handle_unknown)
-        
-        if asyncio.iscoroutinefunction(handler):
-            return await handler(request)
-        return handler(request)
+        return await self._call_handler(action, handler, request)
 
 class ExternalAgent(BaseAgent):
     """Agent that communicates with external API"""
     
-    def __init__(self, agent_id: str, name: str, api_url: str, api_key: str = None, **kwargs):
+    def __init__(self, agent_id: str, name: str, api_url: str, api_key: str = None,
+                 codec: str = "json", **kwargs):
         config = AgentConfig(
             agent_id=agent_id,
             name=name,
@@ -190,6 +316,8 @@ class ExternalAgent(BaseAgent):
         super().__init__(config)
         self.api_url = api_url
         self.api_key = api_key
+        # Formato del cuerpo HTTP ("json" o "msgpack" para servicios propios)
+        self.codec = codec
         self.headers = {"Content-Type": "application/json"}
         if api_key:
             self.headers["Authorization"] = f"Bearer {api_key}"
@@ -206,6 +334,28 @@ class ExternalAgent(BaseAgent):
             "data": getattr(request, 'data', {})
         }
 
+class RemoteAgent(BaseAgent):
+    """Proxy for an agent served by an AgentServer on another node"""
+
+    def __init__(self, agent_id: str, name: str, host: str, port: int,
+                 remote_agent_id: Optional[str] = None, codec: str = "json", **kwargs):
+        config = AgentConfig(
+            agent_id=agent_id,
+            name=name,
+            agent_type=AgentType.REMOTE,
+            **kwargs
+        )
+        super().__init__(config)
+        self.remote_address = (host, port)
+        # Id del agente en el nodo remoto (por defecto el mismo)
+        self.remote_agent_id = remote_agent_id or agent_id
+        self.codec = codec
+
+    async def handle_request(self, request) -> Any:
+        """Forward the request over the node's persistent connection"""
+        from mcpturbo_core.protocol import protocol
+        return await protocol._send_remote_request(self, request)
+
 class HybridAgent(BaseAgent):
     """Agent that can work both locally and with external APIs"""
     
@@ -220,9 +370,10 @@ class HybridAgent(BaseAgent):
         self.local_handlers: Dict[str, Callable] = {}
         self.external_endpoints: Dict[str, str] = {}
     
-    def register_local_handler(self, action: str, handler: Callable):
+    def register_local_handler(self, action: str, handler: Callable, execution_mode: Optional[str] = None):
         """Register handler for local execution"""
         self.local_handlers[action] = handler
+        self._set_handler_mode(action, execution_mode)
     
     def register_external_endpoint(self, action: str, endpoint: str):
         """Register endpoint for external API calls"""
@@ -233,10 +384,7 @@ class HybridAgent(BaseAgent):
         
         # Try local handler first
         if action in self.local_handlers:
-            handler = self.local_handlers[action]
-            if asyncio.iscoroutinefunction(handler):
-                return await handler(request)
-            return handler(request)
+            return await self._call_handler(action, self.local_handlers[action], request)
         
         # Fall back to external API
         if action in self.external_endpoints:
@@ -257,6 +405,10 @@ def create_local_agent(agent_id: str, name: str = None, **kwargs) -> LocalAgent:
     """Create a simple local agent"""
     return LocalAgent(agent_id, name or agent_id.replace("_", " ").title(), **kwargs)
 
+def create_remote_agent(agent_id: str, host: str, port: int, name: str = None, **kwargs) -> RemoteAgent:
+    """Create a proxy for an agent living on another node"""
+    return RemoteAgent(agent_id, name or agent_id.replace("_", " ").title(), host, port, **kwargs)
+
 def create_external_agent(agent_id: str, name: str, api_url: str, api_key: str = None, **kwargs) -> ExternalAgent:
     """Create an external API agent"""
     return ExternalAgent(agent_id, name, api_url, api_key, **kwargs)
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""Execution modes for synchronous agent handlers.
+
+``"inline"`` calls the handler on the event loop (the historical behaviour).
+``"thread"`` runs it in a shared thread pool, which keeps the loop
+responsive for handlers that block on I/O or release the GIL. ``"process"``
+runs it in a shared process pool so CPU-bound handlers (formatting, AST
+analysis, template rendering) use every core.
+
+In process mode the handler and the request are pickled to the worker and
+the result is pickled back, so the handler must be a module-level function
+(not a bound method of the agent) and results must be picklable. A worker
+that dies raises :class:`WorkerCrashedError` and the pool is rebuilt for
+the next call.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+EXECUTION_MODES = ("inline", "thread", "process")
+
+
+class WorkerCrashedError(RuntimeError):
+    """A process worker died while running a handler"""
+
+
+class HandlerExecutor:
+    """Runs sync handlers in a thread or process pool, created lazily"""
+
+    def __init__(self, mode: str = "thread", max_workers: Optional[int] = None):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown execution mode {mode!r}, expected 'thread' or 'process'")
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.crashes = 0
+
+    def _get_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                if self.mode == "thread":
+                    self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="mcpturbo-handler")
+                else:
+                    self._pool = ProcessPoolExecutor(self.max_workers)
+            return self._pool
+
+    async def run(self, handler: Callable[[Any], Any], request: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        if self.mode == "thread":
+            call = functools.partial(contextvars.copy_context().run, handler, request)
+            return await loop.run_in_executor(pool, call)
+        try:
+            return await loop.run_in_executor(pool, handler, request)
+        except BrokenProcessPool as e:
+            self._discard(pool)
+            name = getattr(handler, "__qualname__", repr(handler))
+            raise WorkerCrashedError(f"Worker process died while running {name}") from e
+
+    def _discard(self, pool: Executor):
+        # Un pool roto no acepta más trabajo: el siguiente run crea otro
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+                self.crashes += 1
+        pool.shutdown(wait=False)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+_executors: Dict[str, HandlerExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(mode: str) -> HandlerExecutor:
+    """Process-wide executor shared by every agent using ``mode``"""
+    with _executors_lock:
+        executor = _executors.get(mode)
+        if executor is None:
+            executor = _executors[mode] = HandlerExecutor(mode)
+        return executor
+
+
+def set_executor(mode: str, executor: HandlerExecutor):
+    """Replace the shared executor for ``mode`` (e.g. to size the pool)"""
+    with _executors_lock:
+        previous = _executors.get(mode)
+        _executors[mode] = executor
+    if previous is not None and previous is not executor:
+        previous.shutdown(wait=False)
+
+
+def shutdown_executors(wait: bool = True):
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
+
+
+async def call_handler(handler: Callable, request: Any, mode: str = "inline") -> Any:
+    """Call an agent handler honouring its execution mode"""
+    if asyncio.iscoroutinefunction(handler):
+        return await handler(request)
+    if mode == "inline":
+        return handler(request)
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode {mode!r}, expected one of {EXECUTION_MODES}")
+    return await get_executor(mode).run(handler, request)
@@ -0,0 +1,190 @@
+"""Per-agent request metrics with latency histograms.
+
+:class:`LatencyHistogram` counts latencies in fixed log-spaced buckets
+(8 per doubling, so a reported percentile is within ~9% of the true
+value) from 10 µs to about 20 minutes. Recording a sample is one
+``bisect`` and one list increment. :class:`RollingHistogram` keeps the
+same buckets for the last ``window`` seconds in a ring of time slots.
+
+:class:`AgentMetrics` is what :class:`~mcpturbo_agents.base_agent.BaseAgent`
+updates on every request. It only touches plain counters and the
+histograms; timestamps are taken from the monotonic clock and converted to
+ISO strings only when a snapshot is requested. All updates happen on the
+event loop thread (handlers in thread or process mode return to it before
+the agent records their timing), so no locks are needed.
+"""
+
+import time
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+_MIN_LATENCY = 1e-5
+_BUCKETS_PER_DOUBLING = 8
+_BOUNDS: List[float] = [
+    _MIN_LATENCY * 2 ** (i / _BUCKETS_PER_DOUBLING) for i in range(27 * _BUCKETS_PER_DOUBLING + 1)
+]
+PERCENTILES = (0.5, 0.95, 0.99)
+EWMA_ALPHA = 0.3
+
+
+def _percentile(counts: List[int], total: int, q: float, maximum: float) -> float:
+    if not total:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(counts):
+        seen += count
+        if count and seen >= rank:
+            bound = _BOUNDS[index] if index < len(_BOUNDS) else maximum
+            return min(bound, maximum)
+    return maximum
+
+
+class LatencyHistogram:
+    """Latency distribution in fixed log-spaced buckets (seconds)"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect_left(_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        return _percentile(self.counts, self.count, q, self.max)
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def summary(self) -> Dict[str, float]:
+        result = {"count": self.count, "mean": self.total / self.count if self.count else 0.0}
+        for q in PERCENTILES:
+            result[f"p{round(q * 100)}"] = self.percentile(q)
+        result["max"] = self.max
+        return result
+
+
+class RollingHistogram:
+    """Latency histogram and error count over the last ``window`` seconds"""
+
+    def __init__(self, window: float = 60.0, slots: int = 6):
+        self.window = window
+        self.slot_length = window / slots
+        self._slots = [LatencyHistogram() for _ in range(slots)]
+        self._errors = [0] * slots
+        self._epochs = [-1] * slots
+
+    def _slot(self, now: float) -> int:
+        epoch = int(now / self.slot_length)
+        index = epoch % len(self._slots)
+        if self._epochs[index] != epoch:
+            # La ranura pertenece a una vuelta anterior del anillo
+            self._slots[index].reset()
+            self._errors[index] = 0
+            self._epochs[index] = epoch
+        return index
+
+    def record(self, seconds: float, success: bool = True, now: Optional[float] = None):
+        index = self._slot(time.monotonic() if now is None else now)
+        self._slots[index].record(seconds)
+        if not success:
+            self._errors[index] += 1
+
+    def _live(self, now: Optional[float]) -> List[int]:
+        current = int((time.monotonic() if now is None else now) / self.slot_length)
+        return [i for i, epoch in enumerate(self._epochs) if current - len(self._slots) < epoch <= current]
+
+    def merged(self, now: Optional[float] = None) -> LatencyHistogram:
+        result = LatencyHistogram()
+        for index in self._live(now):
+            result.merge(self._slots[index])
+        return result
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, float]:
+        live = self._live(now)
+        merged = LatencyHistogram()
+        for index in live:
+            merged.merge(self._slots[index])
+        result = merged.summary()
+        result["errors"] = sum(self._errors[i] for i in live)
+        result["window"] = self.window
+        return result
+
+
+class AgentMetrics:
+    """Request counters and latency histograms of one agent"""
+
+    __slots__ = ("requests", "successes", "failures", "latency", "recent", "ewma_latency",
+                 "_last_activity", "_clock_offset")
+
+    def __init__(self, window: float = 60.0):
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.latency = LatencyHistogram()
+        self.recent = RollingHistogram(window)
+        # Media móvil exponencial, usada para elegir agente (ver selection.py)
+        self.ewma_latency: Optional[float] = None
+        self._last_activity: Optional[float] = None
+        # Convierte el reloj monótono a hora de pared solo al reportar
+        self._clock_offset = time.time() - time.monotonic()
+
+    def record(self, success: bool, seconds: float, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        self.requests += 1
+        if success:
+            self.successes += 1
+        else:
+            self.failures += 1
+        self.latency.record(seconds)
+        self.recent.record(seconds, success, now)
+        if self.ewma_latency is None:
+            self.ewma_latency = seconds
+        else:
+            self.ewma_latency += EWMA_ALPHA * (seconds - self.ewma_latency)
+        self._last_activity = now
+
+    @property
+    def last_activity(self) -> Optional[str]:
+        if self._last_activity is None:
+            return None
+        moment = datetime.fromtimestamp(self._last_activity + self._clock_offset, timezone.utc)
+        return moment.replace(tzinfo=None).isoformat()
+
+    def counters(self) -> Dict[str, Any]:
+        """The historical ``BaseAgent.stats`` keys"""
+        return {
+            "requests_handled": self.requests,
+            "successful_requests": self.successes,
+            "failed_requests": self.failures,
+            "total_execution_time": self.latency.total,
+            "last_activity": self.last_activity,
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.counters(),
+            "average_execution_time": self.latency.total / self.requests if self.requests else 0,
+            "success_rate": self.successes / max(1, self.requests) * 100,
+            "ewma_latency": self.ewma_latency,
+            "latency": self.latency.summary(),
+            "recent": self.recent.summary(),
+        }
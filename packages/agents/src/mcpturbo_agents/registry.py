@@ -1,24 +1,49 @@
 """
 Agent registry for managing and discovering agents
+
+Lookups by type, capability, action and status go through inverted
+indexes (key -> ids of agents, kept as insertion-ordered dicts) that are
+updated on register/unregister and when a registered agent adds a
+capability or handler (also through ``agent.handlers[action] = ...``),
+removes a handler or changes status, so they cost O(result) instead of a
+scan over every agent. Changes that bypass the agent, such as replacing
+``agent.handlers`` or ``agent.capabilities`` wholesale, need
+:meth:`AgentRegistry.reindex`.
 """
 
-from typing import Dict, List, Optional, Type
+import random
+from typing import Callable, Dict, Iterable, List, Optional, Type
 from datetime import datetime
 from .base_agent import BaseAgent, AgentType, AgentStatus
+from .selection import SELECTION_POLICIES
 
 class AgentRegistry:
     """Registry for managing agent instances and metadata"""
     
-    def __init__(self):
+    def __init__(self, health_check: Optional[Callable[[str], bool]] = None):
         self.agents: Dict[str, BaseAgent] = {}
         self.agent_metadata: Dict[str, dict] = {}
         self.registered_at: Dict[str, datetime] = {}
+        # Índices invertidos: clave -> ids de agentes (dict como conjunto ordenado)
+        self._by_type: Dict[AgentType, Dict[str, None]] = {}
+        self._by_capability: Dict[str, Dict[str, None]] = {}
+        self._by_action: Dict[str, Dict[str, None]] = {}
+        self._by_status: Dict[AgentStatus, Dict[str, None]] = {}
+        # id -> claves indexadas, para dar de baja sin recorrer los índices
+        self._indexed: Dict[str, Dict[str, set]] = {}
+        # Devuelve False si el agente no debe recibir tráfico (p. ej. circuito abierto)
+        self.health_check = health_check
+        self._rng = random.Random()
     
     def register(self, agent: BaseAgent, **metadata):
         """Register an agent instance"""
         agent_id = agent.config.agent_id
+        if agent_id in self.agents:
+            self.unregister(agent_id)
         
         self.agents[agent_id] = agent
+        self._index_agent(agent)
+        agent._listeners.append(self._on_agent_change)
         self.agent_metadata[agent_id] = {
             "name": agent.config.name,
             "type": agent.config.agent_type.value,
@@ -31,7 +56,9 @@ class AgentRegistry:
     def unregister(self, agent_id: str) -> bool:
         """Unregister an agent"""
         if agent_id in self.agents:
-            del self.agents[agent_id]
+            agent = self.agents.pop(agent_id)
+            self._detach(agent)
+            self._unindex_agent(agent)
             self.agent_metadata.pop(agent_id, None)
             self.registered_at.pop(agent_id, None)
             return True
@@ -51,17 +78,15 @@ class AgentRegistry:
     
     def list_by_type(self, agent_type: AgentType) -> List[str]:
         """List agents by type"""
-        return [
-            agent_id for agent_id, agent in self.agents.items()
-            if agent.config.agent_type == agent_type
-        ]
+        return list(self._by_type.get(agent_type, ()))
     
     def list_by_capability(self, capability: str) -> List[str]:
         """List agents that have a specific capability"""
-        return [
-            agent_id for agent_id, agent in self.agents.items()
-            if any(cap.name == capability for cap in agent.capabilities)
-        ]
+        return list(self._by_capability.get(capability, ()))
+
+    def list_by_status(self, status: AgentStatus) -> List[str]:
+        """List agents currently in ``status``"""
+        return list(self._by_status.get(status, ()))
     
     def get_agent_info(self, agent_id: str) -> Optional[dict]:
         """Get detailed agent information"""
@@ -87,6 +112,7 @@ class AgentRegistry:
             ],
             "handlers": list(agent.handlers.keys()),
             "stats": agent.stats,
+            "load": agent.get_load(),
             "config": {
                 "max_concurrent_requests": agent.config.max_concurrent_requests,
                 "timeout": agent.config.timeout,
@@ -106,29 +132,113 @@ class AgentRegistry:
     
     def find_agents_by_action(self, action: str) -> List[str]:
         """Find agents that can handle a specific action"""
-        matching_agents = []
-        
-        for agent_id, agent in self.agents.items():
-            if action in agent.handlers:
-                matching_agents.append(agent_id)
-            elif any(cap.name == action for cap in agent.capabilities):
-                matching_agents.append(agent_id)
-        
-        return matching_agents
+        return list(self._by_action.get(action, ()))
     
+    @staticmethod
+    def _add(index: Dict, key, agent_id: str):
+        index.setdefault(key, {})[agent_id] = None
+
+    @staticmethod
+    def _discard(index: Dict, key, agent_id: str):
+        ids = index.get(key)
+        if ids is not None:
+            ids.pop(agent_id, None)
+            if not ids:
+                del index[key]
+
+    def reindex(self, agent_id: str):
+        """Rebuild the index entries of ``agent_id`` from the agent itself.
+
+        Needed only after changes the agent cannot report, e.g. assigning a
+        new ``agent.handlers`` or ``agent.capabilities`` object, or a new
+        ``config.agent_type``.
+        """
+        agent = self.agents[agent_id]
+        self._unindex_agent(agent)
+        self._index_agent(agent)
+
+    def _index_agent(self, agent: BaseAgent):
+        agent_id = agent.config.agent_id
+        self._indexed[agent_id] = {"capability": set(), "action": set()}
+        self._add(self._by_type, agent.config.agent_type, agent_id)
+        self._add(self._by_status, agent.status, agent_id)
+        for capability in agent.capabilities:
+            self._on_agent_change(agent_id, "capability", capability.name)
+        for action in agent.handlers:
+            self._on_agent_change(agent_id, "action", action)
+
+    def _unindex_agent(self, agent: BaseAgent):
+        agent_id = agent.config.agent_id
+        indexed = self._indexed.pop(agent_id)
+        # Tipo y estado pueden haber cambiado sin aviso: se quitan de todas las claves
+        for index in (self._by_type, self._by_status):
+            for key in list(index):
+                self._discard(index, key, agent_id)
+        for capability in indexed["capability"]:
+            self._discard(self._by_capability, capability, agent_id)
+        for action in indexed["action"]:
+            self._discard(self._by_action, action, agent_id)
+
+    def _on_agent_change(self, agent_id: str, event: str, value):
+        """Listener called by registered agents (see ``BaseAgent._notify``)"""
+        if event == "status":
+            before, after = value
+            self._discard(self._by_status, before, agent_id)
+            self._add(self._by_status, after, agent_id)
+            return
+        indexed = self._indexed[agent_id]
+        if event == "action_removed":
+            # Una capacidad sigue siendo una acción aunque se quite su handler
+            if value not in indexed["capability"]:
+                indexed["action"].discard(value)
+                self._discard(self._by_action, value, agent_id)
+            return
+        if event == "capability":
+            indexed["capability"].add(value)
+            self._add(self._by_capability, value, agent_id)
+        # Una capacidad también es una acción que el agente atiende
+        indexed["action"].add(value)
+        self._add(self._by_action, value, agent_id)
+
+    def _detach(self, agent: BaseAgent):
+        if self._on_agent_change in agent._listeners:
+            agent._listeners.remove(self._on_agent_change)
+
+    def select(self, action: str, policy: str = "least_in_flight",
+               exclude: Iterable[str] = ()) -> Optional[str]:
+        """Pick an agent that handles ``action`` according to ``policy``.
+
+        Agents in ERROR/OFFLINE, saturated, or rejected by ``health_check``
+        are skipped while another candidate is left; if none is, the least
+        bad group is used rather than failing. Returns ``None`` when no
+        registered agent handles the action. See :mod:`mcpturbo_agents.selection`
+        for the policies.
+        """
+        choose = SELECTION_POLICIES.get(policy)
+        if choose is None:
+            raise ValueError(f"Unknown selection policy {policy!r}, expected one of {list(SELECTION_POLICIES)}")
+        excluded = set(exclude)
+        candidates = [self.agents[i] for i in self._by_action.get(action, ()) if i not in excluded]
+        if not candidates:
+            return None
+        usable = [a for a in candidates if a.status not in (AgentStatus.ERROR, AgentStatus.OFFLINE)]
+        if self.health_check is not None:
+            usable = [a for a in usable if self.health_check(a.config.agent_id)] or usable
+        usable = usable or candidates
+        usable = [a for a in usable if not a.saturated] or usable
+        return choose(usable, action, self._rng).config.agent_id
+
     def get_healthy_agents(self) -> List[str]:
         """Get list of healthy (non-error) agents"""
-        return [
-            agent_id for agent_id, agent in self.agents.items()
-            if agent.status != AgentStatus.ERROR
-        ]
+        failing = self._by_status.get(AgentStatus.ERROR)
+        if not failing:
+            return list(self.agents)
+        return [agent_id for agent_id in self.agents if agent_id not in failing]
     
     def get_available_agents(self) -> List[str]:
-        """Get list of available (idle or running) agents"""
-        return [
-            agent_id for agent_id, agent in self.agents.items()
-            if agent.status in [AgentStatus.IDLE, AgentStatus.RUNNING]
-        ]
+        """Get available (idle or running, not saturated) agents, least loaded first"""
+        available = self.list_by_status(AgentStatus.IDLE) + self.list_by_status(AgentStatus.RUNNING)
+        return sorted(available, key=lambda agent_id: self.agents[agent_id].utilization)
     
     def update_metadata(self, agent_id: str, **metadata):
         """Update agent metadata"""
@@ -137,7 +247,11 @@ class AgentRegistry:
     
     def clear(self):
         """Clear all registered agents"""
+        for agent in self.agents.values():
+            self._detach(agent)
         self.agents.clear()
+        for index in (self._by_type, self._by_capability, self._by_action, self._by_status, self._indexed):
+            index.clear()
         self.agent_metadata.clear()
         self.registered_at.clear()
     
@@ -147,31 +261,24 @@ class AgentRegistry:
     
     def get_summary(self) -> dict:
         """Get registry summary"""
-        type_counts = {}
-        status_counts = {}
-        
-        for agent in self.agents.values():
-            agent_type = agent.config.agent_type.value
-            agent_status = agent.status.value
-            
-            type_counts[agent_type] = type_counts.get(agent_type, 0) + 1
-            status_counts[agent_status] = status_counts.get(agent_status, 0) + 1
+        # Solo los agentes RUNNING/BUSY tienen peticiones en curso
+        busy = [
+            agent_id for status in (AgentStatus.RUNNING, AgentStatus.BUSY)
+            for agent_id in self._by_status.get(status, ())
+        ]
+        # registered_at conserva el orden de registro
+        timestamps = self.registered_at.values()
         
         return {
             "total_agents": len(self.agents),
-            "by_type": type_counts,
-            "by_status": status_counts,
+            "by_type": {agent_type.value: len(ids) for agent_type, ids in self._by_type.items()},
+            "by_status": {status.value: len(ids) for status, ids in self._by_status.items()},
+            "in_flight": sum(self.agents[agent_id].in_flight for agent_id in busy),
             "capabilities": self._get_all_capabilities(),
-            "oldest_registration": min(self.registered_at.values()).isoformat() if self.registered_at else None,
-            "newest_registration": max(self.registered_at.values()).isoformat() if self.registered_at else None
+            "oldest_registration": next(iter(timestamps)).isoformat() if self.registered_at else None,
+            "newest_registration": next(reversed(timestamps)).isoformat() if self.registered_at else None
         }
     
     def _get_all_capabilities(self) -> List[str]:
         """Get list of all unique capabilities across agents"""
-        all_capabilities = set()
-        
-        for agent in self.agents.values():
-            for capability in agent.capabilities:
-                all_capabilities.add(capability.name)
-        
-        return sorted(list(all_capabilities))
\ No newline at end of file
+        return sorted(self._by_capability)
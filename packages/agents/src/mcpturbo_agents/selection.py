@@ -0,0 +1,72 @@
+"""Policies for picking one agent among several that handle an action.
+
+Each policy receives the candidate agents (already filtered to healthy,
+non-saturated ones when possible), the action and a ``random.Random`` and
+returns one of them:
+
+* ``"least_in_flight"`` (default): lowest utilization, i.e. in-flight plus
+  waiting requests over ``max_concurrent_requests``; ties are broken at
+  random so idle agents share sequential traffic.
+* ``"ewma"``: lowest recent latency (EWMA) scaled by the requests already
+  in flight, so a fast agent stops winning once it queues up. Agents
+  without samples are tried first.
+* ``"p2c"``: power of two choices; compare the load of two random
+  candidates. O(1) and avoids herding on the single least loaded agent.
+* ``"cost"``: cheapest ``cost_per_request`` for the action, then least
+  loaded; traffic spills to pricier agents when the cheap ones saturate.
+"""
+
+import random
+from typing import Callable, Dict, List, Optional
+
+from .base_agent import BaseAgent
+
+
+def _load(agent: BaseAgent) -> float:
+    return agent.utilization
+
+
+def _pick_min(agents: List[BaseAgent], key: Callable[[BaseAgent], float], rng: random.Random) -> BaseAgent:
+    best = min(key(agent) for agent in agents)
+    return rng.choice([agent for agent in agents if key(agent) == best])
+
+
+def least_in_flight(agents: List[BaseAgent], action: str, rng: random.Random) -> BaseAgent:
+    return _pick_min(agents, _load, rng)
+
+
+def ewma_latency(agents: List[BaseAgent], action: str, rng: random.Random) -> BaseAgent:
+    def score(agent: BaseAgent) -> float:
+        latency = agent.metrics.ewma_latency
+        return 0.0 if latency is None else latency * (agent.in_flight + agent.waiting + 1)
+    return _pick_min(agents, score, rng)
+
+
+def power_of_two(agents: List[BaseAgent], action: str, rng: random.Random) -> BaseAgent:
+    if len(agents) == 1:
+        return agents[0]
+    first, second = rng.sample(agents, 2)
+    return second if _load(second) < _load(first) else first
+
+
+def action_cost(agent: BaseAgent, action: str) -> Optional[float]:
+    for capability in agent.capabilities:
+        if capability.name == action:
+            return capability.cost_per_request
+    return None
+
+
+def cheapest(agents: List[BaseAgent], action: str, rng: random.Random) -> BaseAgent:
+    def cost(agent: BaseAgent) -> float:
+        value = action_cost(agent, action)
+        return float("inf") if value is None else value
+    lowest = min(cost(agent) for agent in agents)
+    return _pick_min([agent for agent in agents if cost(agent) == lowest], _load, rng)
+
+
+SELECTION_POLICIES: Dict[str, Callable[[List[BaseAgent], str, random.Random], BaseAgent]] = {
+    "least_in_flight": least_in_flight,
+    "ewma": ewma_latency,
+    "p2c": power_of_two,
+    "cost": cheapest,
+}
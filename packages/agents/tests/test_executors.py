@@ -0,0 +1,86 @@
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from mcpturbo_agents import LocalAgent, WorkerCrashedError
+from mcpturbo_agents.executors import get_executor, shutdown_executors
+
+
+def blocking(request):
+    time.sleep(0.2)
+    return "slept"
+
+
+def worker_pid(request):
+    return {"pid": os.getpid(), "n": sum(range(request.data["n"]))}
+
+
+def crash(request):
+    os._exit(1)
+
+
+@pytest.fixture(autouse=True)
+def _pools():
+    yield
+    shutdown_executors()
+
+
+async def _ticks_while(coro):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.ensure_future(ticker())
+    try:
+        result = await coro
+    finally:
+        task.cancel()
+    return result, ticks
+
+
+@pytest.mark.asyncio
+async def test_thread_mode_keeps_loop_responsive():
+    agent = LocalAgent("formatter", "Formatter", execution_mode="thread")
+    agent.register_handler("format", blocking)
+    result, ticks = await _ticks_while(agent.handle_request(SimpleNamespace(action="format")))
+    assert result == "slept" and ticks >= 5
+
+    agent.register_handler("format", blocking, execution_mode="inline")
+    _, ticks = await _ticks_while(agent.handle_request(SimpleNamespace(action="format")))
+    assert ticks <= 1
+
+
+@pytest.mark.asyncio
+async def test_process_mode_runs_in_worker():
+    agent = LocalAgent("ast", "AST")
+    agent.register_handler("analyze", worker_pid, execution_mode="process")
+    result = await agent.handle_request(SimpleNamespace(action="analyze", data={"n": 1000}))
+    assert result["n"] == sum(range(1000)) and result["pid"] != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_worker_crash_is_reported_and_pool_recovers():
+    agent = LocalAgent("fragile", "Fragile", execution_mode="process")
+    agent.register_handler("crash", crash)
+    agent.register_handler("ok", worker_pid)
+
+    with pytest.raises(WorkerCrashedError):
+        await agent.execute_with_semaphore(SimpleNamespace(action="crash"))
+    assert agent.stats["failed_requests"] == 1 and get_executor("process").crashes == 1
+
+    result = await agent.handle_request(SimpleNamespace(action="ok", data={"n": 3}))
+    assert result["n"] == 3
+
+
+def test_invalid_execution_mode():
+    with pytest.raises(ValueError):
+        LocalAgent("bad", "Bad", execution_mode="gpu")
+    with pytest.raises(ValueError):
+        LocalAgent("ok", "Ok").register_handler("x", blocking, execution_mode="gpu")
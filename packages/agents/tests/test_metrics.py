@@ -0,0 +1,66 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from mcpturbo_agents import AgentMetrics, LatencyHistogram, LocalAgent
+from mcpturbo_agents.metrics import RollingHistogram
+
+
+def test_histogram_percentiles_are_close():
+    rng = random.Random(3)
+    samples = [rng.lognormvariate(-4, 1) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.record(sample)
+
+    ordered = sorted(samples)
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * len(ordered)) - 1]
+        assert abs(histogram.percentile(q) - exact) / exact < 0.1
+    assert histogram.percentile(1.0) == max(samples)
+    assert histogram.summary()["count"] == 20000
+
+
+def test_rolling_window_expires_old_slots():
+    rolling = RollingHistogram(window=60, slots=6)
+    rolling.record(0.5, success=False, now=1000.0)
+    rolling.record(0.01, now=1030.0)
+
+    recent = rolling.summary(now=1035.0)
+    assert recent["count"] == 2 and recent["errors"] == 1
+    recent = rolling.summary(now=1075.0)
+    assert recent["count"] == 1 and recent["errors"] == 0 and recent["max"] == 0.01
+    assert rolling.summary(now=2000.0)["count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_agent_stats_include_latency_histogram():
+    agent = LocalAgent("m1", "Metrics")
+
+    async def ok(request):
+        return "ok"
+
+    async def broken(request):
+        raise RuntimeError("boom")
+
+    agent.register_handler("ok", ok)
+    agent.register_handler("broken", broken)
+    for _ in range(3):
+        await agent.execute_with_semaphore(SimpleNamespace(action="ok", data={}))
+    with pytest.raises(RuntimeError):
+        await agent.execute_with_semaphore(SimpleNamespace(action="broken", data={}))
+
+    assert agent.stats["requests_handled"] == 4 and agent.stats["failed_requests"] == 1
+    assert agent.stats["last_activity"] is not None
+    snapshot = await agent._handle_stats(None)
+    assert snapshot["success_rate"] == 75
+    assert snapshot["latency"]["count"] == 4 and snapshot["latency"]["p99"] > 0
+    assert snapshot["recent"]["errors"] == 1
+
+
+def test_metrics_last_activity_is_iso():
+    metrics = AgentMetrics()
+    assert metrics.counters()["last_activity"] is None
+    metrics.record(True, 0.002)
+    assert "T" in metrics.last_activity
@@ -1,4 +1,6 @@
 import asyncio
+from types import SimpleNamespace
+
 import pytest
 
 from mcpturbo_agents import (
@@ -7,6 +9,10 @@ from mcpturbo_agents import (
     get_agent,
     list_agents,
     registry,
+    AgentCapability,
+    AgentRegistry,
+    AgentStatus,
+    AgentType,
 )
 
 
@@ -19,3 +25,99 @@ async def test_agent_registration():
 
     assert "genesis" in list_agents()
     assert get_agent("genesis") is agent
+
+
+@pytest.mark.asyncio
+async def test_status_follows_in_flight_requests():
+    registry.clear()
+    busy = create_local_agent("busy", "Busy", max_concurrent_requests=2)
+    spare = create_local_agent("spare", "Spare", max_concurrent_requests=2)
+
+    async def wait(request):
+        await request.data.wait()
+
+    busy.register_handler("wait", wait)
+    register_agent(busy)
+    register_agent(spare)
+    gates = [asyncio.Event() for _ in range(3)]
+
+    def start(gate):
+        return asyncio.ensure_future(busy.execute_with_semaphore(SimpleNamespace(action="wait", data=gate)))
+
+    first = start(gates[0])
+    await asyncio.sleep(0)
+    assert busy.status == AgentStatus.RUNNING
+    assert registry.get_available_agents() == ["spare", "busy"]
+
+    others = [start(gate) for gate in gates[1:]]
+    await asyncio.sleep(0)
+    load = busy.get_load()
+    assert busy.status == AgentStatus.BUSY and load["in_flight"] == 2 and load["waiting"] == 1
+    assert registry.get_available_agents() == ["spare"]
+
+    gates[0].set()
+    await first
+    # Las otras peticiones siguen en curso: el agente no pasa a IDLE
+    assert busy.status == AgentStatus.BUSY
+    for gate in gates[1:]:
+        gate.set()
+    await asyncio.gather(*others)
+    assert busy.status == AgentStatus.IDLE and busy.get_load()["peak_in_flight"] == 2
+
+    busy.status = AgentStatus.OFFLINE
+    assert registry.get_available_agents() == ["spare"]
+    busy.status = AgentStatus.IDLE
+    assert busy.status == AgentStatus.IDLE
+
+
+@pytest.mark.asyncio
+async def test_indexes_follow_agent_changes():
+    index = AgentRegistry()
+    first = create_local_agent("a1", "A1")
+    second = create_local_agent("a2", "A2")
+    first.add_capability(AgentCapability("summarize", "", {}, {}))
+    index.register(first)
+    index.register(second)
+
+    assert index.list_by_capability("summarize") == ["a1"]
+    second.add_capability(AgentCapability("summarize", "", {}, {}))
+    second.register_handler("translate", lambda request: "ok")
+    assert index.list_by_capability("summarize") == ["a1", "a2"]
+    assert index.find_agents_by_action("translate") == ["a2"]
+    assert index.list_by_type(AgentType.LOCAL) == ["a1", "a2"]
+
+    second.status = AgentStatus.ERROR
+    assert index.list_by_status(AgentStatus.ERROR) == ["a2"]
+    assert index.get_healthy_agents() == ["a1"]
+    summary = index.get_summary()
+    assert summary["by_status"] == {"idle": 1, "error": 1} and summary["capabilities"] == ["summarize"]
+
+    index.unregister("a2")
+    second.add_capability(AgentCapability("extra", "", {}, {}))
+    assert index.find_agents_by_action("translate") == []
+    assert index.list_by_capability("summarize") == ["a1"]
+    assert "extra" not in index.get_summary()["capabilities"]
+    assert index.list_by_status(AgentStatus.ERROR) == []
+
+
+def test_action_index_follows_handler_dict_and_reindex():
+    local = AgentRegistry()
+    agent = create_local_agent("direct", "Direct")
+    agent.add_capability(AgentCapability("summarize", "", {}, {}))
+    local.register(agent)
+
+    agent.handlers["translate"] = lambda request: "ok"
+    assert local.find_agents_by_action("translate") == ["direct"]
+    assert local.select("translate") == "direct"
+    del agent.handlers["translate"]
+    assert local.find_agents_by_action("translate") == []
+    agent.handlers.pop("summarize")
+    assert local.find_agents_by_action("summarize") == ["direct"]  # sigue siendo capacidad
+
+    # Reemplazar el dict entero no se puede observar: hace falta reindex()
+    agent.handlers = {"review": lambda request: "ok"}
+    agent.config.agent_type = AgentType.HYBRID
+    local.reindex("direct")
+    assert local.find_agents_by_action("review") == ["direct"]
+    assert local.list_by_type(AgentType.HYBRID) == ["direct"]
+    assert local.list_by_type(AgentType.LOCAL) == []
@@ -0,0 +1,73 @@
+import asyncio
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from mcpturbo_agents import AgentCapability, AgentRegistry, AgentStatus, create_local_agent
+
+
+def _provider(agent_id, cost=None, capacity=2):
+    agent = create_local_agent(agent_id, max_concurrent_requests=capacity)
+    agent.add_capability(AgentCapability("code_generation", "code", {}, {}, cost_per_request=cost))
+    return agent
+
+
+def test_select_spreads_idle_agents_and_honors_index():
+    registry = AgentRegistry()
+    for agent_id in ("key1", "key2", "key3"):
+        registry.register(_provider(agent_id))
+    other = create_local_agent("other")
+    registry.register(other)
+
+    picks = Counter(registry.select("code_generation") for _ in range(300))
+    assert set(picks) == {"key1", "key2", "key3"} and min(picks.values()) > 50
+    assert registry.select("missing") is None
+    assert registry.select("code_generation", exclude=["key1", "key2"]) == "key3"
+
+    # Acciones añadidas después del registro y agentes dados de baja
+    other.register_handler("code_generation", lambda request: "ok")
+    assert "other" in {registry.select("code_generation", policy="p2c") for _ in range(200)}
+    registry.unregister("other")
+    assert "other" not in {registry.select("code_generation") for _ in range(50)}
+    with pytest.raises(ValueError):
+        registry.select("code_generation", policy="fastest")
+
+
+@pytest.mark.asyncio
+async def test_least_in_flight_and_cost_avoid_saturated_agents():
+    registry = AgentRegistry()
+    cheap, pricey = _provider("cheap", cost=0.001, capacity=1), _provider("pricey", cost=0.01)
+    registry.register(cheap)
+    registry.register(pricey)
+    assert {registry.select("code_generation", policy="cost") for _ in range(20)} == {"cheap"}
+
+    gate = asyncio.Event()
+
+    async def wait(request):
+        await gate.wait()
+
+    cheap.register_handler("wait", wait)
+    running = asyncio.ensure_future(cheap.execute_with_semaphore(SimpleNamespace(action="wait", data={})))
+    await asyncio.sleep(0)
+    assert registry.select("code_generation", policy="cost") == "pricey"
+    assert registry.select("code_generation") == "pricey"
+    gate.set()
+    await running
+
+
+def test_ewma_prefers_fast_agents_and_health_check_filters():
+    open_circuits = {"fast"}
+    registry = AgentRegistry(health_check=lambda agent_id: agent_id not in open_circuits)
+    fast, slow = _provider("fast"), _provider("slow")
+    for _ in range(5):
+        fast.metrics.record(True, 0.01)
+        slow.metrics.record(True, 0.5)
+    registry.register(fast)
+    registry.register(slow)
+
+    assert registry.select("code_generation", policy="ewma") == "slow"
+    open_circuits.clear()
+    assert registry.select("code_generation", policy="ewma") == "fast"
+    fast.status = AgentStatus.OFFLINE
+    assert registry.select("code_generation", policy="ewma") == "slow"
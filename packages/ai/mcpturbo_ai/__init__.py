@@ -17,6 +17,7 @@ from .adapters import (
     create_deepseek_agent,
     create_multi_llm_setup,
 )
+from .batch import BatchJob, OpenAIBatchClient, ClaudeBatchClient
 from .genesis_agents import (
     GenesisArchitectAgent,
     GenesisBackendAgent,
@@ -36,6 +37,11 @@ __all__ = [
     "GenesisFrontendAgent",
     "GenesisDevOpsAgent",
 
+    # Provider batch APIs
+    "BatchJob",
+    "OpenAIBatchClient",
+    "ClaudeBatchClient",
+
     # Factory functions
     "create_openai_agent",
     "create_claude_agent",
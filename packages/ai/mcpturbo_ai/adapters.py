@@ -1,6 +1,19 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from mcpturbo_agents import ExternalAgent, AgentCapability
 from mcpturbo_core.exceptions import APIError, AuthenticationError, RateLimitError
+from mcpturbo_core.streaming import SSEEvent, StreamDelta
+from .batch import ClaudeBatchClient, OpenAIBatchClient
+
+
+def _parse_chat_completion_chunk(event: SSEEvent) -> Optional[StreamDelta]:
+    """Parse an OpenAI-compatible ``chat.completion.chunk`` SSE event"""
+    if event.data == "[DONE]":
+        return StreamDelta(done=True)
+
+    chunk = event.json()
+    choices = chunk.get("choices") or [{}]
+    text = (choices[0].get("delta") or {}).get("content") or ""
+    return StreamDelta(text=text, usage=chunk.get("usage"), model=chunk.get("model"))
 
 
 class OpenAIAgent(ExternalAgent):
@@ -84,6 +97,25 @@ class OpenAIAgent(ExternalAgent):
             "stream": False,
         }
 
+    def build_stream_payload(self, request) -> Dict[str, Any]:
+        payload = self.build_payload(request)
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+        return payload
+
+    def parse_stream_event(self, event: SSEEvent) -> Optional[StreamDelta]:
+        return _parse_chat_completion_chunk(event)
+
+    def build_stream_result(
+        self, text: str, usage: Dict[str, Any], model: Optional[str], request
+    ) -> Dict[str, Any]:
+        response = {
+            "choices": [{"message": {"content": text}}],
+            "usage": usage,
+            "model": model or self.model,
+        }
+        return self._parse_openai_response(response, request)
+
     async def handle_request(self, request) -> Any:
         try:
             response_data = await super().handle_request(request)
@@ -95,6 +127,18 @@ class OpenAIAgent(ExternalAgent):
                 raise RateLimitError("OpenAI rate limit exceeded")
             raise APIError(f"OpenAI API error: {str(e)}", provider="openai")
 
+    def batch_client(self, base_url: str = None, session=None) -> OpenAIBatchClient:
+        """Client for the provider batch API (discounted, results within 24h)"""
+        return OpenAIBatchClient(self, base_url=base_url, session=session)
+
+    async def run_batch(
+        self, requests, poll_interval: float = 30.0, timeout: float = None, base_url: str = None
+    ) -> Dict[str, Any]:
+        """Run ``requests`` as one provider batch; returns Responses keyed by request id"""
+        return await self.batch_client(base_url).run(
+            requests, poll_interval=poll_interval, timeout=timeout
+        )
+
     def _parse_openai_response(
         self, response: Dict[str, Any], request
     ) -> Dict[str, Any]:
@@ -208,6 +252,39 @@ class ClaudeAgent(ExternalAgent):
 
         return payload
 
+    def build_stream_payload(self, request) -> Dict[str, Any]:
+        payload = self.build_payload(request)
+        payload["stream"] = True
+        return payload
+
+    def parse_stream_event(self, event: SSEEvent) -> Optional[StreamDelta]:
+        data = event.json()
+        event_type = data.get("type", event.event)
+
+        if event_type == "message_start":
+            message = data.get("message", {})
+            return StreamDelta(usage=message.get("usage"), model=message.get("model"))
+        elif event_type == "content_block_delta":
+            return StreamDelta(text=data.get("delta", {}).get("text", ""))
+        elif event_type == "message_delta":
+            return StreamDelta(usage=data.get("usage"))
+        elif event_type == "message_stop":
+            return StreamDelta(done=True)
+        elif event_type == "error":
+            error = data.get("error", {})
+            raise APIError(f"Claude API error: {error.get('message', event.data)}", provider="claude")
+        return None
+
+    def build_stream_result(
+        self, text: str, usage: Dict[str, Any], model: Optional[str], request
+    ) -> Dict[str, Any]:
+        response = {
+            "content": [{"text": text}],
+            "usage": usage,
+            "model": model or self.model,
+        }
+        return self._parse_claude_response(response, request)
+
     async def handle_request(self, request) -> Any:
         try:
             response_data = await super().handle_request(request)
@@ -219,6 +296,18 @@ class ClaudeAgent(ExternalAgent):
                 raise RateLimitError("Claude rate limit exceeded")
             raise APIError(f"Claude API error: {str(e)}", provider="claude")
 
+    def batch_client(self, base_url: str = None, session=None) -> ClaudeBatchClient:
+        """Client for the provider batch API (discounted, results within 24h)"""
+        return ClaudeBatchClient(self, base_url=base_url, session=session)
+
+    async def run_batch(
+        self, requests, poll_interval: float = 30.0, timeout: float = None, base_url: str = None
+    ) -> Dict[str, Any]:
+        """Run ``requests`` as one provider batch; returns Responses keyed by request id"""
+        return await self.batch_client(base_url).run(
+            requests, poll_interval=poll_interval, timeout=timeout
+        )
+
     def _parse_claude_response(
         self, response: Dict[str, Any], request
     ) -> Dict[str, Any]:
@@ -333,6 +422,25 @@ class DeepSeekAgent(ExternalAgent):
             "stream": False,
         }
 
+    def build_stream_payload(self, request) -> Dict[str, Any]:
+        payload = self.build_payload(request)
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+        return payload
+
+    def parse_stream_event(self, event: SSEEvent) -> Optional[StreamDelta]:
+        return _parse_chat_completion_chunk(event)
+
+    def build_stream_result(
+        self, text: str, usage: Dict[str, Any], model: Optional[str], request
+    ) -> Dict[str, Any]:
+        response = {
+            "choices": [{"message": {"content": text}}],
+            "usage": usage,
+            "model": model or self.model,
+        }
+        return self._parse_deepseek_response(response, request)
+
     async def handle_request(self, request) -> Any:
         try:
             response_data = await super().handle_request(request)
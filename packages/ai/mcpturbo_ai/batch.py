@@ -0,0 +1,262 @@
+"""Provider-native asynchronous batch APIs for OpenAI and Claude.
+
+Batches trade latency (results within 24h) for a large price discount and
+a separate rate limit pool, which suits bulk jobs such as nightly code
+reviews. Requests are serialized with the agent's own ``build_payload``,
+submitted, polled and mapped back to :class:`Response` objects keyed by
+``request.id``.
+"""
+
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import aiohttp
+
+from mcpturbo_core.exceptions import APIError, AuthenticationError, TimeoutError
+from mcpturbo_core.messages import Request, Response
+
+# Estados finales de cada proveedor
+_FINAL_STATES = {
+    "openai": ("completed", "failed", "expired", "cancelled"),
+    "claude": ("ended",),
+}
+
+
+@dataclass
+class BatchJob:
+    """A submitted provider batch"""
+    id: str
+    provider: str
+    status: str
+    requests: Dict[str, Request] = field(default_factory=dict)
+    results_url: Optional[str] = None
+    error_url: Optional[str] = None
+    raw: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def done(self) -> bool:
+        return self.status in _FINAL_STATES.get(self.provider, ())
+
+
+class _BatchClient(ABC):
+    provider = ""
+
+    def __init__(self, agent: Any, base_url: Optional[str] = None,
+                 session: Optional[aiohttp.ClientSession] = None):
+        self.agent = agent
+        self.base_url = (base_url or self._default_base_url(agent.api_url)).rstrip("/")
+        self._session = session
+
+    @staticmethod
+    def _default_base_url(api_url: str) -> str:
+        return api_url.rsplit("/", 1)[0]
+
+    async def _request(self, method: str, url: str, *, json_body: Any = None,
+                       data: Any = None, raw: bool = False) -> Any:
+        headers = {k: v for k, v in self.agent.headers.items() if v is not None}
+        if data is not None:
+            # aiohttp fija el boundary del multipart
+            headers.pop("Content-Type", None)
+
+        session = self._session or aiohttp.ClientSession()
+        try:
+            async with session.request(method, url, json=json_body, data=data, headers=headers) as resp:
+                if resp.status == 401:
+                    raise AuthenticationError(f"API error 401: {await resp.text()}", provider=self.provider)
+                if resp.status >= 400:
+                    raise APIError(
+                        f"API error {resp.status}: {await resp.text()}",
+                        status_code=resp.status, provider=self.provider,
+                    )
+                return await resp.text() if raw else await resp.json()
+        finally:
+            if self._session is None:
+                await session.close()
+
+    async def wait(self, job: BatchJob, poll_interval: float = 30.0,
+                   timeout: Optional[float] = None) -> BatchJob:
+        """Poll until ``job`` reaches a final state"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not job.done:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Batch {job.id} not finished after {timeout}s", timeout=timeout)
+            await asyncio.sleep(poll_interval)
+            job = await self.poll(job)
+        return job
+
+    async def run(self, requests: Sequence[Request], poll_interval: float = 30.0,
+                  timeout: Optional[float] = None) -> Dict[str, Response]:
+        """Submit, wait and return the responses keyed by ``request.id``"""
+        if self._session is not None:
+            job = await self.submit(requests)
+            job = await self.wait(job, poll_interval=poll_interval, timeout=timeout)
+            return await self.results(job)
+
+        # Una sola sesión (y su pool de conexiones) para todo el ciclo del batch
+        async with aiohttp.ClientSession() as session:
+            self._session = session
+            try:
+                return await self.run(requests, poll_interval=poll_interval, timeout=timeout)
+            finally:
+                self._session = None
+
+    def _response(self, request: Request, success: bool, result: Any = None,
+                  error: Optional[str] = None) -> Response:
+        return Response(
+            sender=request.target or self.agent.config.agent_id,
+            target=request.sender,
+            request_id=request.id,
+            success=success,
+            result=result,
+            error=error,
+        )
+
+    def _missing(self, job: BatchJob, responses: Dict[str, Response]) -> Dict[str, Response]:
+        for request_id, request in job.requests.items():
+            if request_id not in responses:
+                responses[request_id] = self._response(
+                    request, False, error=f"No result in batch {job.id} ({job.status})"
+                )
+        return responses
+
+    @staticmethod
+    def _jsonl(text: str) -> List[Dict[str, Any]]:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    @abstractmethod
+    async def submit(self, requests: Sequence[Request]) -> BatchJob:
+        ...
+
+    @abstractmethod
+    async def poll(self, job: BatchJob) -> BatchJob:
+        ...
+
+    @abstractmethod
+    async def results(self, job: BatchJob) -> Dict[str, Response]:
+        ...
+
+
+class OpenAIBatchClient(_BatchClient):
+    """OpenAI ``/files`` + ``/batches`` flow over ``/v1/chat/completions``"""
+
+    provider = "openai"
+    endpoint = "/v1/chat/completions"
+
+    def build_lines(self, requests: Sequence[Request]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "custom_id": request.id,
+                "method": "POST",
+                "url": self.endpoint,
+                "body": self.agent.build_payload(request),
+            }
+            for request in requests
+        ]
+
+    async def submit(self, requests: Sequence[Request],
+                     completion_window: str = "24h") -> BatchJob:
+        content = "\n".join(json.dumps(line) for line in self.build_lines(requests)) + "\n"
+        form = aiohttp.FormData()
+        form.add_field("purpose", "batch")
+        form.add_field("file", content.encode("utf-8"), filename="batch.jsonl",
+                       content_type="application/jsonl")
+        uploaded = await self._request("POST", f"{self.base_url}/files", data=form)
+
+        batch = await self._request("POST", f"{self.base_url}/batches", json_body={
+            "input_file_id": uploaded["id"],
+            "endpoint": self.endpoint,
+            "completion_window": completion_window,
+        })
+        job = BatchJob(id=batch["id"], provider=self.provider, status=batch.get("status", "validating"),
+                       requests={r.id: r for r in requests})
+        return self._update(job, batch)
+
+    async def poll(self, job: BatchJob) -> BatchJob:
+        return self._update(job, await self._request("GET", f"{self.base_url}/batches/{job.id}"))
+
+    def _update(self, job: BatchJob, batch: Dict[str, Any]) -> BatchJob:
+        job.status = batch.get("status", job.status)
+        job.raw = batch
+        if batch.get("output_file_id"):
+            job.results_url = f"{self.base_url}/files/{batch['output_file_id']}/content"
+        if batch.get("error_file_id"):
+            job.error_url = f"{self.base_url}/files/{batch['error_file_id']}/content"
+        return job
+
+    async def results(self, job: BatchJob) -> Dict[str, Response]:
+        lines = []
+        for url in (job.results_url, job.error_url):
+            if url:
+                lines.extend(self._jsonl(await self._request("GET", url, raw=True)))
+
+        responses: Dict[str, Response] = {}
+        for line in lines:
+            request = job.requests.get(line.get("custom_id"))
+            if request is None:
+                continue
+            response = line.get("response") or {}
+            error = line.get("error")
+            if not error and response.get("status_code", 200) < 400:
+                result = self.agent._parse_openai_response(response.get("body", {}), request)
+                responses[request.id] = self._response(request, True, result=result)
+            else:
+                error = error or (response.get("body") or {}).get("error")
+                message = error.get("message") if isinstance(error, dict) else str(error)
+                responses[request.id] = self._response(request, False, error=message)
+        return self._missing(job, responses)
+
+
+class ClaudeBatchClient(_BatchClient):
+    """Anthropic Message Batches API (``/v1/messages/batches``)"""
+
+    provider = "claude"
+
+    @staticmethod
+    def _default_base_url(api_url: str) -> str:
+        return api_url.rstrip("/")
+
+    def build_lines(self, requests: Sequence[Request]) -> List[Dict[str, Any]]:
+        return [
+            {"custom_id": request.id, "params": self.agent.build_payload(request)}
+            for request in requests
+        ]
+
+    async def submit(self, requests: Sequence[Request]) -> BatchJob:
+        batch = await self._request("POST", f"{self.base_url}/batches",
+                                    json_body={"requests": self.build_lines(requests)})
+        job = BatchJob(id=batch["id"], provider=self.provider,
+                       status=batch.get("processing_status", "in_progress"),
+                       requests={r.id: r for r in requests})
+        return self._update(job, batch)
+
+    async def poll(self, job: BatchJob) -> BatchJob:
+        return self._update(job, await self._request("GET", f"{self.base_url}/batches/{job.id}"))
+
+    def _update(self, job: BatchJob, batch: Dict[str, Any]) -> BatchJob:
+        job.status = batch.get("processing_status", job.status)
+        job.raw = batch
+        job.results_url = batch.get("results_url") or job.results_url
+        return job
+
+    async def results(self, job: BatchJob) -> Dict[str, Response]:
+        responses: Dict[str, Response] = {}
+        if job.results_url:
+            for line in self._jsonl(await self._request("GET", job.results_url, raw=True)):
+                request = job.requests.get(line.get("custom_id"))
+                if request is None:
+                    continue
+                result = line.get("result") or {}
+                if result.get("type") == "succeeded":
+                    parsed = self.agent._parse_claude_response(result.get("message", {}), request)
+                    responses[request.id] = self._response(request, True, result=parsed)
+                else:
+                    error = (result.get("error") or {}).get("error") or result.get("error") or {}
+                    message = error.get("message") if isinstance(error, dict) else None
+                    responses[request.id] = self._response(
+                        request, False, error=message or f"Batch request {result.get('type', 'failed')}"
+                    )
+        return self._missing(job, responses)
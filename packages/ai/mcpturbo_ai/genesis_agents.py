@@ -1,8 +1,21 @@
 from typing import Dict, Any
-from mcpturbo_agents import LocalAgent, AgentCapability
+from mcpturbo_agents import LocalAgent, AgentCapability, registry
 from mcpturbo_core.protocol import protocol
 
 
+def _target(action: str, default: str) -> str:
+    """Agent picked by the registry for ``action`` among those ``protocol`` knows"""
+    skipped = set()
+    while True:
+        agent_id = registry.select(action, exclude=skipped)
+        if agent_id is None:
+            return default
+        if agent_id in protocol.agents:
+            return agent_id
+        # Registrado solo en el registry (p.ej. un agente local): no se puede enviar
+        skipped.add(agent_id)
+
+
 class GenesisArchitectAgent(LocalAgent):
     """Agent that designs software architecture using other LLM agents."""
 
@@ -25,7 +38,7 @@ class GenesisArchitectAgent(LocalAgent):
         )
         response = await protocol.send_request(
             sender_id=self.config.agent_id,
-            target_id="claude",
+            target_id=_target("reasoning", "claude"),
             action="reasoning",
             data={"prompt": prompt},
         )
@@ -54,7 +67,7 @@ class GenesisBackendAgent(LocalAgent):
         language = request.data.get("language", "python")
         response = await protocol.send_request(
             sender_id=self.config.agent_id,
-            target_id="openai",
+            target_id=_target("code_generation", "openai"),
             action="code_generation",
             data={"prompt": spec, "language": language},
         )
@@ -83,7 +96,7 @@ class GenesisFrontendAgent(LocalAgent):
         language = request.data.get("language", "typescript")
         response = await protocol.send_request(
             sender_id=self.config.agent_id,
-            target_id="deepseek",
+            target_id=_target("fast_coding", "deepseek"),
             action="fast_coding",
             data={"prompt": spec, "language": language},
         )
@@ -112,7 +125,7 @@ class GenesisDevOpsAgent(LocalAgent):
         )
         response = await protocol.send_request(
             sender_id=self.config.agent_id,
-            target_id="openai",
+            target_id=_target("code_generation", "openai"),
             action="code_generation",
             data={"prompt": prompt, "language": "bash"},
         )
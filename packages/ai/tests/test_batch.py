@@ -0,0 +1,186 @@
+import json
+import socket
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'orchestrator'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'agents'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'core'))
+
+from aiohttp import web
+
+from mcpturbo_ai.adapters import OpenAIAgent, ClaudeAgent
+from mcpturbo_core.exceptions import AuthenticationError, TimeoutError
+from mcpturbo_core.messages import create_request
+
+
+async def _run_app(app):
+    runner = web.AppRunner(app)
+    await runner.setup()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner, f"http://127.0.0.1:{port}/v1"
+
+
+def _openai_stub(polls_until_done=1):
+    state = {"polls": 0, "lines": [], "peers": set()}
+
+    @web.middleware
+    async def track_peer(request, handler):
+        state["peers"].add(request.transport.get_extra_info("peername"))
+        return await handler(request)
+
+    async def upload(request):
+        form = await request.post()
+        assert form["purpose"] == "batch"
+        state["lines"] = [json.loads(l) for l in form["file"].file.read().decode().splitlines()]
+        return web.json_response({"id": "file-in"})
+
+    async def create(request):
+        body = await request.json()
+        assert body["input_file_id"] == "file-in"
+        assert body["endpoint"] == "/v1/chat/completions"
+        return web.json_response({"id": "batch_1", "status": "validating"})
+
+    async def retrieve(request):
+        state["polls"] += 1
+        if state["polls"] < polls_until_done:
+            return web.json_response({"id": "batch_1", "status": "in_progress"})
+        return web.json_response({
+            "id": "batch_1", "status": "completed",
+            "output_file_id": "file-out", "error_file_id": "file-err",
+        })
+
+    async def content(request):
+        ok, failed = state["lines"][0], state["lines"][1]
+        if request.match_info["file_id"] == "file-out":
+            lines = [{
+                "custom_id": ok["custom_id"],
+                "response": {"status_code": 200, "body": {
+                    "choices": [{"message": {"content": "echo " + ok["body"]["messages"][-1]["content"]}}],
+                    "usage": {"total_tokens": 7}, "model": ok["body"]["model"],
+                }},
+                "error": None,
+            }]
+        else:
+            lines = [{
+                "custom_id": failed["custom_id"],
+                "response": {"status_code": 400, "body": {"error": {"message": "bad prompt"}}},
+                "error": None,
+            }]
+        return web.Response(text="\n".join(json.dumps(l) for l in lines))
+
+    app = web.Application(middlewares=[track_peer])
+    app.router.add_post("/v1/files", upload)
+    app.router.add_post("/v1/batches", create)
+    app.router.add_get("/v1/batches/{batch_id}", retrieve)
+    app.router.add_get("/v1/files/{file_id}/content", content)
+    return app, state
+
+
+@pytest.mark.asyncio
+async def test_openai_batch_round_trip():
+    app, state = _openai_stub(polls_until_done=2)
+    runner, base_url = await _run_app(app)
+    try:
+        agent = OpenAIAgent(api_key="sk-test")
+        requests = [
+            create_request("nightly", "openai", "generate_text", data={"prompt": "one"}),
+            create_request("nightly", "openai", "generate_text", data={"prompt": "two"}),
+            create_request("nightly", "openai", "generate_text", data={"prompt": "three"}),
+        ]
+        responses = await agent.run_batch(requests, poll_interval=0.01, base_url=base_url)
+
+        assert state["polls"] == 2
+        # Subida, creación, sondeos y descargas comparten una conexión
+        assert len(state["peers"]) == 1
+        assert [l["custom_id"] for l in state["lines"]] == [r.id for r in requests]
+        ok, failed, missing = (responses[r.id] for r in requests)
+        assert ok.success and ok.result["text"] == "echo one" and ok.result["tokens_used"] == 7
+        assert ok.request_id == requests[0].id and ok.target == "nightly"
+        assert not failed.success and failed.error == "bad prompt"
+        assert not missing.success
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_claude_batch_round_trip():
+    state = {}
+
+    async def create(request):
+        state["body"] = await request.json()
+        return web.json_response({"id": "msgbatch_1", "processing_status": "in_progress"})
+
+    async def retrieve(request):
+        return web.json_response({
+            "id": "msgbatch_1", "processing_status": "ended",
+            "results_url": str(request.url.with_path("/v1/messages/batches/msgbatch_1/results")),
+        })
+
+    async def results(request):
+        first, second = state["body"]["requests"]
+        lines = [
+            {"custom_id": first["custom_id"], "result": {"type": "succeeded", "message": {
+                "content": [{"type": "text", "text": "step one\n\nconclusion"}],
+                "usage": {"output_tokens": 3}, "model": first["params"]["model"],
+            }}},
+            {"custom_id": second["custom_id"], "result": {"type": "errored", "error": {
+                "type": "error", "error": {"type": "invalid_request_error", "message": "too long"},
+            }}},
+        ]
+        return web.Response(text="\n".join(json.dumps(l) for l in lines))
+
+    app = web.Application()
+    app.router.add_post("/v1/messages/batches", create)
+    app.router.add_get("/v1/messages/batches/msgbatch_1", retrieve)
+    app.router.add_get("/v1/messages/batches/msgbatch_1/results", results)
+    runner, base_url = await _run_app(app)
+    try:
+        agent = ClaudeAgent(api_key="key")
+        requests = [
+            create_request("nightly", "claude", "reasoning", data={"prompt": "why"}),
+            create_request("nightly", "claude", "reasoning", data={"prompt": "x" * 10}),
+        ]
+        client = agent.batch_client(base_url=base_url + "/messages")
+        responses = await client.run(requests, poll_interval=0.01)
+
+        assert state["body"]["requests"][0]["params"]["messages"][0]["content"] == "why"
+        ok, failed = responses[requests[0].id], responses[requests[1].id]
+        assert ok.success and ok.result["conclusion"] == "conclusion"
+        assert not failed.success and failed.error == "too long"
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_batch_errors():
+    async def unauthorized(request):
+        return web.Response(status=401, text="bad key")
+
+    async def pending(request):
+        return web.json_response({"id": "msgbatch_1", "processing_status": "in_progress"})
+
+    app = web.Application()
+    app.router.add_post("/v1/files", unauthorized)
+    app.router.add_post("/v1/messages/batches", pending)
+    app.router.add_get("/v1/messages/batches/msgbatch_1", pending)
+    runner, base_url = await _run_app(app)
+    try:
+        request = create_request("nightly", "openai", "generate_text", data={"prompt": "one"})
+        with pytest.raises(AuthenticationError):
+            await OpenAIAgent(api_key="sk-test").batch_client(base_url).submit([request])
+
+        with pytest.raises(TimeoutError):
+            await ClaudeAgent(api_key="key").batch_client(base_url + "/messages").run(
+                [request], poll_interval=0.01, timeout=0.05
+            )
+    finally:
+        await runner.cleanup()
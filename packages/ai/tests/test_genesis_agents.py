@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'orchestrator'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'agents'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'core'))
+
+from mcpturbo_agents import AgentCapability, create_local_agent, registry
+from mcpturbo_core.protocol import protocol
+from mcpturbo_ai.genesis_agents import _target
+
+
+def test_target_skips_agents_the_protocol_cannot_reach(monkeypatch):
+    local_only = create_local_agent("local_reasoner")
+    reachable = create_local_agent("remote_reasoner")
+    for agent in (local_only, reachable):
+        agent.add_capability(AgentCapability("reasoning", "", {}, {}))
+        registry.register(agent)
+    try:
+        assert _target("reasoning", "claude") == "claude"  # none of them in protocol
+
+        monkeypatch.setitem(protocol.agents, "remote_reasoner", reachable)
+        assert {_target("reasoning", "claude") for _ in range(20)} == {"remote_reasoner"}
+    finally:
+        registry.unregister("local_reasoner")
+        registry.unregister("remote_reasoner")
@@ -0,0 +1,117 @@
+import json
+import socket
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'orchestrator'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'agents'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'core'))
+
+from aiohttp import web
+
+from mcpturbo_ai.adapters import OpenAIAgent, ClaudeAgent, DeepSeekAgent
+from mcpturbo_core.protocol import MCPProtocol
+
+
+def _sse(*events):
+    body = b""
+    for name, data in events:
+        if name:
+            body += f"event: {name}\n".encode()
+        payload = data if isinstance(data, str) else json.dumps(data)
+        body += f"data: {payload}\n\n".encode()
+    return body
+
+
+async def _run_server(body):
+    async def handler(request):
+        handler.payload = await request.json()
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+        await resp.write(body)
+        return resp
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner, handler, f"http://127.0.0.1:{port}/"
+
+
+OPENAI_STREAM = _sse(
+    (None, {"model": "gpt-4", "choices": [{"delta": {"role": "assistant"}}]}),
+    (None, {"model": "gpt-4", "choices": [{"delta": {"content": "```python\nprint("}}]}),
+    (None, {"model": "gpt-4", "choices": [{"delta": {"content": "'hi')\n```"}}]}),
+    (None, {"model": "gpt-4", "choices": [], "usage": {"total_tokens": 12}}),
+    (None, "[DONE]"),
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("agent_cls, action, field", [
+    (OpenAIAgent, "code_generation", "code"),
+    (DeepSeekAgent, "fast_coding", "code"),
+])
+async def test_openai_compatible_streaming(agent_cls, action, field):
+    runner, handler, url = await _run_server(OPENAI_STREAM)
+    protocol = MCPProtocol()
+    await protocol.start()
+    try:
+        agent = agent_cls(api_key="key")
+        agent.api_url = url
+        protocol.register_agent(agent.config.agent_id, agent)
+
+        stream = await protocol.stream_request("u", agent.config.agent_id, action, data={"prompt": "hi"})
+        deltas = [d async for d in stream]
+
+        assert handler.payload["stream"] is True
+        assert handler.payload["stream_options"] == {"include_usage": True}
+        assert "".join(deltas) == "```python\nprint('hi')\n```"
+        assert stream.response.tokens_used == 12
+        assert stream.response.model_used == "gpt-4"
+        assert stream.response.result[field].strip() == "print('hi')"
+    finally:
+        await protocol.stop()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_claude_streaming():
+    body = _sse(
+        ("message_start", {"type": "message_start", "message": {
+            "model": "claude-3-sonnet-20240229", "usage": {"input_tokens": 5, "output_tokens": 1}}}),
+        ("content_block_start", {"type": "content_block_start", "index": 0}),
+        ("ping", {"type": "ping"}),
+        ("content_block_delta", {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Step one"}}),
+        ("content_block_delta", {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "\n\nDone"}}),
+        ("message_delta", {"type": "message_delta", "usage": {"output_tokens": 9}}),
+        ("message_stop", {"type": "message_stop"}),
+    )
+    runner, handler, url = await _run_server(body)
+    protocol = MCPProtocol()
+    await protocol.start()
+    try:
+        agent = ClaudeAgent(api_key="key")
+        agent.api_url = url
+        protocol.register_agent(agent.config.agent_id, agent)
+
+        stream = await protocol.stream_request("u", "claude", "reasoning", data={"prompt": "think"})
+        response = await stream.collect()
+
+        assert handler.payload["stream"] is True
+        assert response.result["text"] == "Step one\n\nDone"
+        assert response.result["conclusion"] == "Done"
+        assert response.tokens_used == 9
+        assert response.model_used == "claude-3-sonnet-20240229"
+    finally:
+        await protocol.stop()
+        await runner.cleanup()
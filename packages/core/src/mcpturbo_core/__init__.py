@@ -11,11 +11,12 @@ __author__ = "Federico Monfasani"
 from .protocol import MCPProtocol, protocol
 from .config import MCPConfig, get_config, load_config, save_config, validate_environment
 from .exceptions import (
-    MCPError, TimeoutError, RateLimitError, CircuitBreakerError,
+    MCPError, TimeoutError, RateLimitError, CircuitBreakerError, QueueFullError,
     AgentNotFoundError, AuthenticationError, ValidationError, APIError,
     ConfigurationError, SerializationError
 )
 from .logger import configure_logging
+from .transport import AgentServer, TransportClient
 
 # Message types
 from .messages import (
@@ -29,6 +30,8 @@ __all__ = [
     # Core classes
     "MCPProtocol",
     "MCPConfig", 
+    "AgentServer",
+    "TransportClient",
     
     # Global instances
     "protocol",
@@ -61,6 +64,7 @@ __all__ = [
     "TimeoutError",
     "RateLimitError", 
     "CircuitBreakerError",
+    "QueueFullError",
     "AgentNotFoundError",
     "AuthenticationError",
     "ValidationError",
@@ -0,0 +1,246 @@
+"""Priority-aware admission control for outgoing requests."""
+
+import asyncio
+import contextvars
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Deque, Dict, Optional
+
+from .config import get_config
+from .exceptions import QueueFullError, TimeoutError
+from .messages import Priority
+
+DEFAULT_WEIGHTS: Dict[Priority, int] = {
+    Priority.CRITICAL: 8,
+    Priority.HIGH: 4,
+    Priority.NORMAL: 2,
+    Priority.LOW: 1,
+}
+
+OVERFLOW_MODES = ("shed", "reject", "wait")
+
+# Marca las tareas que ya tienen un slot, para no bloquear peticiones anidadas
+_admitted: contextvars.ContextVar[bool] = contextvars.ContextVar("mcpturbo_admitted", default=False)
+
+
+@dataclass
+class _Waiter:
+    priority: Priority
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class AdmissionQueue:
+    """Global concurrency cap with per-priority lanes.
+
+    When all ``max_concurrent`` slots are busy, callers queue in the lane of
+    their priority. Freed slots go to the lanes by smooth weighted
+    round-robin, so CRITICAL work gets most slots without starving LOW.
+    Queue depth is bounded by ``max_depth``; on overflow the queue either
+    sheds the newest waiter of a lower priority (``"shed"``), rejects the
+    caller (``"reject"``) or makes it wait for room (``"wait"``).
+
+    Requests issued from inside an admitted request (an agent calling
+    another agent) bypass the queue, so nested calls cannot deadlock.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, max_depth: Optional[int] = None,
+                 weights: Optional[Dict[Priority, int]] = None, overflow: str = "shed"):
+        if overflow not in OVERFLOW_MODES:
+            raise ValueError(f"Unknown overflow mode {overflow!r}, expected one of {OVERFLOW_MODES}")
+        self._max_concurrent = max_concurrent
+        self._max_depth = max_depth
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.overflow = overflow
+
+        self._lanes: Dict[Priority, Deque[_Waiter]] = {p: deque() for p in Priority}
+        self._credit: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._room: Deque[asyncio.Future] = deque()
+        self.active = 0
+        self.depth = 0
+
+        self.admitted = 0
+        self.shed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_seconds: Dict[Priority, float] = {p: 0.0 for p in Priority}
+
+    @property
+    def max_concurrent(self) -> int:
+        if self._max_concurrent is None:
+            self._max_concurrent = get_config().max_concurrent_requests
+        return self._max_concurrent
+
+    @property
+    def max_depth(self) -> int:
+        if self._max_depth is None:
+            self._max_depth = get_config().queue_size
+        return self._max_depth
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.NORMAL,
+                   timeout: Optional[float] = None) -> AsyncIterator[None]:
+        if _admitted.get():
+            yield
+            return
+        await self.acquire(priority, timeout)
+        token = _admitted.set(True)
+        try:
+            yield
+        finally:
+            _admitted.reset(token)
+            self.release()
+
+    async def reserve(self, priority: Priority = Priority.NORMAL,
+                      timeout: Optional[float] = None) -> Callable[[], None]:
+        """Take a slot that outlives the calling block (e.g. a stream).
+
+        Returns the function that gives it back; calling it again is a
+        no-op. Inside a :meth:`slot` it reserves nothing, like nested slots.
+        """
+        if _admitted.get():
+            return lambda: None
+        await self.acquire(priority, timeout)
+        held = [True]
+
+        def release():
+            if held[0]:
+                held[0] = False
+                self.release()
+        return release
+
+    async def acquire(self, priority: Priority = Priority.NORMAL, timeout: Optional[float] = None):
+        """Wait for a slot; raises QueueFullError or TimeoutError"""
+        priority = Priority(priority)
+        if self.active < self.max_concurrent and self.depth == 0:
+            self.active += 1
+            self.admitted += 1
+            return
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.depth >= self.max_depth:
+            await self._make_room(priority, deadline)
+
+        waiter = _Waiter(priority, asyncio.get_running_loop().create_future())
+        self._lanes[priority].append(waiter)
+        self.depth += 1
+        try:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            await asyncio.wait_for(asyncio.shield(waiter.future), remaining)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self.timed_out += 1
+            raise TimeoutError(f"Request not admitted within {timeout}s", timeout=timeout)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        self.wait_seconds[priority] += time.monotonic() - waiter.enqueued_at
+
+    def release(self):
+        self.active -= 1
+        self._dispatch()
+
+    def _abandon(self, waiter: _Waiter):
+        """Undo a waiter that gave up; hand its slot on if it was already granted"""
+        if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+            self.release()
+            return
+        try:
+            self._lanes[waiter.priority].remove(waiter)
+        except ValueError:
+            return
+        self.depth -= 1
+        waiter.future.cancel()
+        self._notify_room()
+
+    async def _make_room(self, priority: Priority, deadline: Optional[float]):
+        if self.overflow == "shed":
+            victim = self._lowest_below(priority)
+            if victim is not None:
+                self._lanes[victim.priority].remove(victim)
+                self.depth -= 1
+                self.shed += 1
+                victim.future.set_exception(QueueFullError(
+                    "Request shed from full admission queue",
+                    priority=victim.priority.name, depth=self.depth,
+                ))
+                return
+        if self.overflow in ("shed", "reject"):
+            self.rejected += 1
+            raise QueueFullError("Admission queue is full", priority=priority.name, depth=self.depth)
+
+        # Backpressure: esperar a que se libere hueco en la cola
+        room = asyncio.get_running_loop().create_future()
+        self._room.append(room)
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            await asyncio.wait_for(room, remaining)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise TimeoutError("Admission queue stayed full", timeout=remaining)
+        finally:
+            if room in self._room:
+                self._room.remove(room)
+
+    def _lowest_below(self, priority: Priority) -> Optional[_Waiter]:
+        for lane in sorted(self._lanes):
+            if lane >= priority:
+                break
+            if self._lanes[lane]:
+                return self._lanes[lane][-1]
+        return None
+
+    def _next_lane(self) -> Optional[Priority]:
+        """Smooth weighted round-robin over the non-empty lanes"""
+        busy = []
+        for p, lane in self._lanes.items():
+            if lane:
+                busy.append(p)
+            else:
+                self._credit[p] = 0
+        if not busy:
+            return None
+        total = 0
+        for p in busy:
+            self._credit[p] += self.weights.get(p, 1)
+            total += self.weights.get(p, 1)
+        chosen = max(busy, key=lambda p: (self._credit[p], p))
+        self._credit[chosen] -= total
+        return chosen
+
+    def _dispatch(self):
+        while self.active < self.max_concurrent:
+            lane = self._next_lane()
+            if lane is None:
+                return
+            waiter = self._lanes[lane].popleft()
+            self.depth -= 1
+            self._notify_room()
+            if waiter.future.done():
+                continue
+            self.active += 1
+            self.admitted += 1
+            waiter.future.set_result(None)
+
+    def _notify_room(self):
+        while self._room:
+            room = self._room.popleft()
+            if not room.done():
+                room.set_result(None)
+                return
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "active": self.active,
+            "max_concurrent": self.max_concurrent,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "queued": {p.name: len(lane) for p, lane in self._lanes.items()},
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_seconds": {p.name: round(t, 6) for p, t in self.wait_seconds.items()},
+        }
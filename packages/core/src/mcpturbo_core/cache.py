@@ -0,0 +1,252 @@
+"""Content-addressed response cache for external agent calls.
+
+Responses are stored under a SHA-256 of the agent URL and the request
+payload, in two tiers: an in-memory LRU and an on-disk sqlite database in
+``MCPConfig.cache_dir``. Caching is opt-in per ``(agent_id, action)``.
+
+Values must be JSON-serializable and both tiers keep them as JSON, so a hit
+always returns a fresh copy with the same types whichever tier served it.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .codecs import key_default
+from .config import get_config
+
+
+@dataclass
+class CachePolicy:
+    ttl: float
+    deterministic_only: bool = False
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + sqlite) cache with TTLs and size-based eviction."""
+
+    DB_NAME = "responses.sqlite3"
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None, default_ttl: Optional[float] = None):
+        self._cache_dir = cache_dir
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._default_ttl = default_ttl
+        self._policies: Dict[Tuple[str, str], CachePolicy] = {}
+
+        self._memory: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._disk_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # Configuración
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is None:
+            self._max_entries = get_config().cache_max_entries
+        return self._max_entries
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is None:
+            self._max_bytes = get_config().cache_max_bytes
+        return self._max_bytes
+
+    @property
+    def default_ttl(self) -> float:
+        if self._default_ttl is None:
+            self._default_ttl = get_config().cache_ttl
+        return self._default_ttl
+
+    def enable(self, agent_id: str, actions: Iterable[str], ttl: Optional[float] = None,
+               deterministic_only: bool = False):
+        """Opt ``actions`` of ``agent_id`` into caching.
+
+        With ``deterministic_only`` only payloads sent with ``temperature`` 0
+        are cached.
+        """
+        for action in actions:
+            self._policies[(agent_id, action)] = CachePolicy(
+                ttl=self.default_ttl if ttl is None else ttl,
+                deterministic_only=deterministic_only,
+            )
+
+    def disable(self, agent_id: str, actions: Optional[Iterable[str]] = None):
+        for key in list(self._policies):
+            if key[0] == agent_id and (actions is None or key[1] in actions):
+                del self._policies[key]
+
+    def enabled_for(self, agent_id: str, action: str) -> bool:
+        return (agent_id, action) in self._policies
+
+    def policy_for(self, agent_id: str, action: str, payload: Any) -> Optional[CachePolicy]:
+        """Return the cache policy for a call, or None if it must not be cached"""
+        policy = self._policies.get((agent_id, action))
+        if policy is None:
+            return None
+        if policy.deterministic_only:
+            temperature = payload.get("temperature") if isinstance(payload, dict) else None
+            if temperature != 0:
+                return None
+        return policy
+
+    @staticmethod
+    def make_key(url: str, payload: Any) -> str:
+        canonical = json.dumps([url, payload], sort_keys=True, separators=(",", ":"), default=key_default)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    # Acceso
+
+    async def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, blob = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return json.loads(blob)
+            del self._memory[key]
+            self.expirations += 1
+
+        entry = await asyncio.to_thread(self._disk_get, key, now)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, blob = entry
+        self.disk_hits += 1
+        self._memory_set(key, expires_at, blob)
+        return json.loads(blob)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store ``value``; raises ``TypeError`` if it is not JSON-serializable"""
+        blob = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        self._memory_set(key, expires_at, blob)
+        await asyncio.to_thread(self._disk_set, key, blob, expires_at)
+
+    async def clear(self):
+        self._memory.clear()
+        await asyncio.to_thread(self._disk_clear)
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.memory_hits + self.disk_hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "memory_entries": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    # Tier en memoria
+
+    def _memory_set(self, key: str, expires_at: float, blob: bytes):
+        self._memory[key] = (expires_at, blob)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    # Tier en disco (se ejecuta en un thread)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            cache_dir = Path(self._cache_dir or get_config().cache_dir).expanduser()
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(cache_dir / self.DB_NAME), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+            )
+            self._db.commit()
+            self._disk_bytes = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+        return self._db
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, bytes]]:
+        with self._db_lock:
+            db = self._connect()
+            row = db.execute(
+                "SELECT value, size, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, size, expires_at = row
+            if expires_at <= now:
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                db.commit()
+                self._disk_bytes -= size
+                self.expirations += 1
+                return None
+            db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            db.commit()
+        return expires_at, value
+
+    def _disk_set(self, key: str, blob: bytes, expires_at: float):
+        with self._db_lock:
+            db = self._connect()
+            row = db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._disk_bytes -= row[0]
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), expires_at, time.time()),
+            )
+            self._disk_bytes += len(blob)
+            self._evict_disk(db)
+            db.commit()
+
+    def _evict_disk(self, db: sqlite3.Connection):
+        if self._disk_bytes <= self.max_bytes:
+            return
+        removed = db.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),)).rowcount
+        self.expirations += max(removed, 0)
+        self._disk_bytes = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+        # Least recently used first
+        for key, size in db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            if self._disk_bytes <= self.max_bytes:
+                break
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._disk_bytes -= size
+            self.evictions += 1
+
+    def _disk_clear(self):
+        with self._db_lock:
+            db = self._connect()
+            db.execute("DELETE FROM responses")
+            db.commit()
+            self._disk_bytes = 0
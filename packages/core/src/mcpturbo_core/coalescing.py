@@ -0,0 +1,55 @@
+"""Single-flight coalescing of identical in-flight requests."""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .codecs import key_default
+
+
+def request_key(target: str, action: str, data: Optional[Dict[str, Any]]) -> str:
+    """Canonical hash of a ``(target, action, data)`` request.
+
+    Raises ``TypeError`` if ``data`` holds values without a canonical form.
+    """
+    canonical = json.dumps(
+        [target, action, data or {}],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=key_default,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RequestCoalescer:
+    """Share one in-flight call between concurrent identical requests.
+
+    The first caller for a key starts the call in its own task; callers that
+    arrive while it is running await the same task and receive the same
+    result (or exception). Cancelling one waiter does not cancel the shared
+    call for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        shared = self._inflight.get(key)
+        if shared is None:
+            self.calls += 1
+            shared = asyncio.ensure_future(call())
+            self._inflight[key] = shared
+            shared.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(shared)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
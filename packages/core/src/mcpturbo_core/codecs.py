@@ -0,0 +1,179 @@
+"""Wire codecs for MCP messages and external payloads.
+
+A codec turns plain Python values into bytes and back. ``"json"`` uses
+orjson when it is installed (falling back to the standard library) and is
+what HTTP APIs expect; ``"msgpack"`` is a compact binary format for
+agent-to-agent traffic and needs the optional ``msgpack`` package.
+
+Naive and aware datetimes survive a msgpack round trip through an extension
+type; with JSON they travel as ISO 8601 strings, which
+:meth:`Message.from_dict <mcpturbo_core.messages.Message.from_dict>` parses
+back for the message fields.
+"""
+
+import json
+from collections.abc import Mapping
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+from .exceptions import SerializationError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+# Código de extensión msgpack para datetimes (ISO 8601 en UTF-8)
+DATETIME_EXT = 1
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types the encoders do not know natively"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, Mapping):
+        return dict(value)
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def key_default(value: Any) -> Any:
+    """``default=`` for canonical JSON used in hashing.
+
+    Only values with a canonical form are accepted. Anything else raises
+    ``TypeError`` instead of falling back to ``str()``, which would give two
+    different objects with the same text the same key.
+    """
+    if isinstance(value, Mapping):
+        return dict(value)
+    if hasattr(value, "to_dict"):
+        return {"__type__": type(value).__qualname__, "value": value.to_dict()}
+    raise TypeError(f"Object of type {type(value).__name__} has no canonical key form")
+
+
+class Codec:
+    """Encode/decode plain values; subclasses set ``name`` and ``content_type``"""
+    name = ""
+    content_type = "application/octet-stream"
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JSONCodec(Codec):
+    name = "json"
+    content_type = "application/json"
+
+    def __init__(self):
+        if orjson is not None:
+            options = orjson.OPT_NON_STR_KEYS
+            self._dumps: Callable[[Any], bytes] = (
+                lambda value: orjson.dumps(value, default=_default, option=options)
+            )
+            self._loads: Callable[[bytes], Any] = orjson.loads
+        else:
+            encoder = json.JSONEncoder(default=_default, ensure_ascii=False, separators=(",", ":"))
+            self._dumps = lambda value: encoder.encode(value).encode()
+            self._loads = json.loads
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return self._dumps(value)
+        except (TypeError, ValueError) as e:
+            raise SerializationError(f"Cannot encode as JSON: {e}", data_type=type(value).__name__) from e
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return self._loads(data)
+        except ValueError as e:
+            raise SerializationError(f"Invalid JSON: {e}", data_type="json") from e
+
+
+class MsgpackCodec(Codec):
+    name = "msgpack"
+    content_type = "application/msgpack"
+
+    def __init__(self):
+        if msgpack is None:
+            raise SerializationError(
+                "msgpack codec requires the 'msgpack' package (pip install msgpack)",
+                data_type="msgpack",
+            )
+
+    @staticmethod
+    def _encode_ext(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return msgpack.ExtType(DATETIME_EXT, value.isoformat().encode())
+        return _default(value)
+
+    @staticmethod
+    def _decode_ext(code: int, payload: bytes) -> Any:
+        if code == DATETIME_EXT:
+            return datetime.fromisoformat(payload.decode())
+        return msgpack.ExtType(code, payload)
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return msgpack.packb(value, default=self._encode_ext, use_bin_type=True, datetime=False)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise SerializationError(f"Cannot encode as msgpack: {e}", data_type=type(value).__name__) from e
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return msgpack.unpackb(data, raw=False, ext_hook=self._decode_ext, strict_map_key=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as e:
+            raise SerializationError(f"Invalid msgpack data: {e}", data_type="msgpack") from e
+
+
+_codec_factories: Dict[str, Callable[[], Codec]] = {
+    JSONCodec.name: JSONCodec,
+    MsgpackCodec.name: MsgpackCodec,
+}
+_codecs: Dict[str, Codec] = {}
+
+
+def register_codec(name: str, factory: Callable[[], Codec]):
+    """Register a codec factory under ``name`` (replaces an existing one)"""
+    _codec_factories[name] = factory
+    _codecs.pop(name, None)
+
+
+def get_codec(codec: Optional[Any] = None) -> Codec:
+    """Resolve a codec instance, a registered name or ``None`` (JSON)"""
+    if isinstance(codec, Codec):
+        return codec
+    name = codec or JSONCodec.name
+    instance = _codecs.get(name)
+    if instance is None:
+        factory = _codec_factories.get(name)
+        if factory is None:
+            raise SerializationError(f"Unknown codec '{name}'", data_type=name)
+        instance = _codecs[name] = factory()
+    return instance
+
+
+def available_codecs() -> Dict[str, bool]:
+    """Registered codec names and whether they can be used here"""
+    result = {}
+    for name in _codec_factories:
+        try:
+            get_codec(name)
+        except SerializationError:
+            result[name] = False
+        else:
+            result[name] = True
+    return result
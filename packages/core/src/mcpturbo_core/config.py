@@ -17,6 +17,8 @@ if load_dotenv and load_dotenv():
         RuntimeWarning,
     )
 
+_config_version = 0
+
 @dataclass
 class AgentConfig:
     api_key: str = ""
@@ -53,12 +55,29 @@ class MCPConfig:
     cache_dir: str = field(default_factory=lambda: os.getenv("MCP_CACHE_DIR", "~/.mcpturbo/cache"))
     config_dir: str = field(default_factory=lambda: os.getenv("MCP_CONFIG_DIR", "~/.mcpturbo"))
 
+    # Response cache (see mcpturbo_core.cache)
+    cache_ttl: int = 3600
+    cache_max_entries: int = 1024
+    cache_max_bytes: int = 256 * 1024 * 1024
+
+    # Pools HTTP por host (see mcpturbo_core.pools); "default" aplica al resto
+    connection_pools: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
     # Tool permissions
     tool_permissions: Dict[str, bool] = field(default_factory=dict)
     sensitive_actions: List[str] = field(
         default_factory=lambda: ["write_file", "delete_file", "execute_command"]
     )
     
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        # Cualquier cambio invalida las políticas precompiladas
+        _bump_config_version()
+
+    def touch(self):
+        """Mark the config as changed after mutating one of its dicts/lists in place"""
+        _bump_config_version()
+
     def __post_init__(self):
         # Expand user paths
         self.cache_dir = str(Path(self.cache_dir).expanduser())
@@ -131,6 +150,10 @@ class MCPConfig:
             "log_level": self.log_level,
             "cache_dir": self.cache_dir,
             "config_dir": self.config_dir,
+            "cache_ttl": self.cache_ttl,
+            "cache_max_entries": self.cache_max_entries,
+            "cache_max_bytes": self.cache_max_bytes,
+            "connection_pools": self.connection_pools,
             "tool_permissions": self.tool_permissions,
             "sensitive_actions": self.sensitive_actions,
             "agents": {
@@ -188,6 +211,10 @@ class MCPConfig:
             log_level=config_dict.get("log_level", "INFO"),
             cache_dir=config_dict.get("cache_dir", "~/.mcpturbo/cache"),
             config_dir=config_dict.get("config_dir", "~/.mcpturbo"),
+            cache_ttl=config_dict.get("cache_ttl", 3600),
+            cache_max_entries=config_dict.get("cache_max_entries", 1024),
+            cache_max_bytes=config_dict.get("cache_max_bytes", 256 * 1024 * 1024),
+            connection_pools=config_dict.get("connection_pools", {}),
             tool_permissions=config_dict.get("tool_permissions", {}),
             sensitive_actions=config_dict.get(
                 "sensitive_actions", ["write_file", "delete_file", "execute_command"]
@@ -242,6 +269,15 @@ def set_config(config: MCPConfig):
     """Set global configuration instance"""
     global _config
     _config = config
+    _bump_config_version()
+
+def config_version() -> int:
+    """Counter bumped whenever the global configuration changes"""
+    return _config_version
+
+def _bump_config_version():
+    global _config_version
+    _config_version += 1
 
 def load_config(config_path: Optional[str] = None) -> MCPConfig:
     """Load configuration from file and set as global"""
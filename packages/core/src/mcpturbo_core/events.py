@@ -0,0 +1,345 @@
+"""Asynchronous event bus for protocol and workflow events.
+
+Each subscription has its own bounded queue and worker task, so
+:meth:`EventBus.publish` returns as soon as the event is queued and a slow
+or failing handler only delays its own events. When a queue is full the
+subscription's ``overflow`` policy applies:
+
+* ``"drop_oldest"`` (default) discards the oldest queued event;
+* ``"drop_new"`` discards the event being published;
+* ``"block"`` makes ``publish`` wait for room (back-pressure).
+
+With ``batch_size > 1`` the handler receives a list of up to
+``batch_size`` events, collected for at most ``batch_interval`` seconds,
+which suits high-frequency events such as per-task progress.
+
+Event names are dot-separated topics. Subscription patterns may use
+``*`` for exactly one segment and a trailing ``#`` for any number of
+segments: ``task.*`` matches ``task.started``, ``workflow.#`` matches
+``workflow`` and ``workflow.wf1.task.done``, and ``#`` matches everything.
+Patterns live in a :class:`TopicIndex` trie and each topic's subscribers
+are resolved once and cached until the subscriptions change.
+
+A subscription can carry a ``subscriber`` id and a ``scope``. An event
+published with ``recipients`` only reaches subscriptions whose
+``subscriber`` is listed, and an event with a ``scope`` other than
+``"all"`` only reaches subscriptions in that scope.
+"""
+
+import asyncio
+import itertools
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_new", "block")
+TOPIC_SEPARATOR = "."
+
+_sequence = itertools.count()
+
+
+class Subscription:
+    """One handler with its queue, worker and delivery counters"""
+
+    def __init__(self, event: str, handler: Callable, queue_size: int = 1000,
+                 overflow: str = "drop_oldest", batch_size: int = 1, batch_interval: float = 0.0,
+                 subscriber: Optional[str] = None, scope: Optional[str] = None):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r}, expected one of {OVERFLOW_POLICIES}")
+        if queue_size < 1 or batch_size < 1:
+            raise ValueError("queue_size and batch_size must be positive")
+        self.event = event
+        self.handler = handler
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.subscriber = subscriber
+        self.scope = scope
+        self._order = next(_sequence)
+        self.name = getattr(handler, "__qualname__", repr(handler))
+        self._is_async = asyncio.iscoroutinefunction(handler)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.batches = 0
+        self.last_error: Optional[str] = None
+        self.handler_time = 0.0
+        self.max_handler_time = 0.0
+        self.queue_delay = 0.0
+        self.max_queue_delay = 0.0
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # Nuevo loop (p. ej. otro asyncio.run): la cola anterior no sirve
+            if self._loop is not loop:
+                self._queue = asyncio.Queue(self.queue_size)
+            self._loop = loop
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    async def put(self, item: Any):
+        queue = self._ensure_worker()
+        self.published += 1
+        entry = (time.perf_counter(), item)
+        if not queue.full():
+            queue.put_nowait(entry)
+        elif self.overflow == "drop_oldest":
+            queue.get_nowait()
+            queue.task_done()
+            self.dropped += 1
+            queue.put_nowait(entry)
+        elif self.overflow == "drop_new":
+            self.dropped += 1
+        else:
+            await queue.put(entry)
+
+    async def _next_batch(self, queue: asyncio.Queue) -> List[Any]:
+        batch = [await queue.get()]
+        if self.batch_size == 1:
+            return batch
+        deadline = time.perf_counter() + self.batch_interval
+        while len(batch) < self.batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        queue = self._queue
+        while True:
+            batch = await self._next_batch(queue)
+            start = time.perf_counter()
+            for queued_at, _ in batch:
+                delay = start - queued_at
+                self.queue_delay += delay
+                self.max_queue_delay = max(self.max_queue_delay, delay)
+            payload = [item for _, item in batch] if self.batch_size > 1 else batch[0][1]
+            try:
+                result = self.handler(payload)
+                if self._is_async or asyncio.iscoroutine(result):
+                    await result
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+            finally:
+                elapsed = time.perf_counter() - start
+                self.handler_time += elapsed
+                self.max_handler_time = max(self.max_handler_time, elapsed)
+                self.delivered += len(batch)
+                self.batches += 1
+                for _ in batch:
+                    queue.task_done()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def drain(self):
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def close(self):
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            if self._loop is asyncio.get_running_loop():
+                try:
+                    await self._worker
+                except asyncio.CancelledError:
+                    pass
+        self._worker = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        batches = self.batches or 1
+        delivered = self.delivered or 1
+        return {
+            "event": self.event,
+            "handler": self.name,
+            "subscriber": self.subscriber,
+            "overflow": self.overflow,
+            "pending": self.pending,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "batches": self.batches,
+            "avg_handler_ms": self.handler_time / batches * 1000,
+            "max_handler_ms": self.max_handler_time * 1000,
+            "avg_queue_delay_ms": self.queue_delay / delivered * 1000,
+            "max_queue_delay_ms": self.max_queue_delay * 1000,
+        }
+
+
+class _Node:
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.subscriptions: List[Subscription] = []
+
+
+class _Route:
+    """Subscribers of one topic, pre-grouped for recipient and scope filters"""
+    __slots__ = ("all", "by_subscriber", "by_scope")
+
+    def __init__(self, subscriptions: List[Subscription]):
+        self.all = subscriptions
+        self.by_subscriber: Dict[str, List[Subscription]] = {}
+        self.by_scope: Dict[str, List[Subscription]] = {}
+        for subscription in subscriptions:
+            if subscription.subscriber is not None:
+                self.by_subscriber.setdefault(subscription.subscriber, []).append(subscription)
+            if subscription.scope is not None:
+                self.by_scope.setdefault(subscription.scope, []).append(subscription)
+
+
+class TopicIndex:
+    """Trie of subscription patterns with a per-topic route cache"""
+
+    def __init__(self, max_cached_topics: int = 10000):
+        self._root = _Node()
+        self._routes: Dict[str, _Route] = {}
+        self.max_cached_topics = max_cached_topics
+
+    @staticmethod
+    def _parts(pattern: str) -> List[str]:
+        parts = pattern.split(TOPIC_SEPARATOR)
+        if "#" in parts[:-1]:
+            raise ValueError(f"'#' must be the last segment of a topic pattern: {pattern!r}")
+        return parts
+
+    def add(self, pattern: str, subscription: Subscription):
+        node = self._root
+        for part in self._parts(pattern):
+            node = node.children.setdefault(part, _Node())
+        node.subscriptions.append(subscription)
+        self._routes.clear()
+
+    def remove(self, pattern: str, subscription: Subscription) -> bool:
+        path = [self._root]
+        parts = self._parts(pattern)
+        for part in parts:
+            child = path[-1].children.get(part)
+            if child is None:
+                return False
+            path.append(child)
+        if subscription not in path[-1].subscriptions:
+            return False
+        path[-1].subscriptions.remove(subscription)
+        # Podar las ramas que quedaron vacías
+        for depth in range(len(parts), 0, -1):
+            node = path[depth]
+            if node.subscriptions or node.children:
+                break
+            del path[depth - 1].children[parts[depth - 1]]
+        self._routes.clear()
+        return True
+
+    def route(self, topic: str) -> _Route:
+        route = self._routes.get(topic)
+        if route is None:
+            found: List[Subscription] = []
+            self._collect(self._root, topic.split(TOPIC_SEPARATOR), 0, found)
+            found.sort(key=lambda s: s._order)
+            route = _Route(found)
+            if len(self._routes) >= self.max_cached_topics:
+                self._routes.clear()
+            self._routes[topic] = route
+        return route
+
+    def match(self, topic: str) -> List[Subscription]:
+        return self.route(topic).all
+
+    def _collect(self, node: _Node, parts: List[str], index: int, found: List[Subscription]):
+        rest = node.children.get("#")
+        if rest is not None:
+            found.extend(rest.subscriptions)
+        if index == len(parts):
+            found.extend(node.subscriptions)
+            return
+        child = node.children.get(parts[index])
+        if child is not None:
+            self._collect(child, parts, index + 1, found)
+        star = node.children.get("*")
+        if star is not None:
+            self._collect(star, parts, index + 1, found)
+
+
+class EventBus:
+    """Fan events out to subscriptions without waiting for their handlers"""
+
+    def __init__(self, **defaults):
+        # Opciones por defecto de Subscription (queue_size, overflow, ...)
+        self.defaults = defaults
+        self.subscriptions: Dict[str, List[Subscription]] = {}
+        self.index = TopicIndex()
+
+    def subscribe(self, event: str, handler: Callable, **options) -> Subscription:
+        """Subscribe ``handler`` to the topic pattern ``event``"""
+        subscription = Subscription(event, handler, **{**self.defaults, **options})
+        self.index.add(event, subscription)
+        self.subscriptions.setdefault(event, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self.subscriptions.get(subscription.event, [])
+        if subscription in subscriptions:
+            subscriptions.remove(subscription)
+            if not subscriptions:
+                del self.subscriptions[subscription.event]
+            self.index.remove(subscription.event, subscription)
+        if subscription._worker is not None:
+            subscription._worker.cancel()
+
+    def handlers(self, event: str, scope: str = "all",
+                 recipients: Optional[Iterable[str]] = None) -> List[Subscription]:
+        """Subscriptions that receive ``event`` with the given scope and recipients"""
+        route = self.index.route(event)
+        if recipients:
+            found = [s for r in dict.fromkeys(recipients) for s in route.by_subscriber.get(r, ())]
+            if scope and scope != "all":
+                found = [s for s in found if s.scope == scope]
+            return found
+        if scope and scope != "all":
+            return route.by_scope.get(scope, [])
+        return route.all
+
+    async def publish(self, event: str, payload: Any, scope: str = "all",
+                      recipients: Optional[Iterable[str]] = None) -> int:
+        """Queue ``payload`` for every subscriber of ``event``; returns how many"""
+        subscriptions = self.handlers(event, scope, recipients)
+        for subscription in subscriptions:
+            await subscription.put(payload)
+        return len(subscriptions)
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Wait until every queued event has been handled"""
+        every = [s for subs in self.subscriptions.values() for s in subs]
+        await asyncio.wait_for(asyncio.gather(*(s.drain() for s in every)), timeout)
+
+    async def close(self, timeout: Optional[float] = 5.0):
+        """Deliver what is queued (up to ``timeout``) and stop the workers"""
+        every = [s for subs in self.subscriptions.values() for s in subs]
+        try:
+            await self.drain(timeout)
+        except asyncio.TimeoutError:
+            pass
+        for subscription in every:
+            await subscription.close()
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [s.get_stats() for subs in self.subscriptions.values() for s in subs]
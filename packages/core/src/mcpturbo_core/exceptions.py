@@ -18,6 +18,14 @@ class RateLimitError(MCPError):
             "reset_time": reset_time
         })
 
+class QueueFullError(MCPError):
+    """Admission queue is full or the request was shed"""
+    def __init__(self, message: str, priority: str = None, depth: int = None):
+        super().__init__(message, "QUEUE_FULL_ERROR", {
+            "priority": priority,
+            "depth": depth
+        })
+
 class CircuitBreakerError(MCPError):
     """Circuit breaker is open error"""
     def __init__(self, message: str, failure_count: int = None):
@@ -0,0 +1,172 @@
+"""Hedged requests across equivalent agents.
+
+A :class:`HedgePolicy` says that an ``(agent, action)`` pair can also be
+served by backup targets, for example OpenAI ``code_generation`` by
+DeepSeek ``fast_coding``. When the primary has not answered after the
+policy's latency percentile, :meth:`MCPProtocol.send_request` sends the
+same data to the next backup. The first successful response wins and the
+other requests are cancelled.
+
+Every hedge is paid for out of a :class:`HedgeBudget`. Hedges may be at
+most ``ratio`` of recent requests, and their summed cost (the targets'
+``cost_per_request``) may not exceed ``max_cost`` per window. So a slow
+provider cannot double the bill.
+"""
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+
+@dataclass
+class HedgeTarget:
+    agent_id: str
+    action: Optional[str] = None  # por defecto la misma acción
+    cost: Optional[float] = None  # por defecto cost_per_request de la capability
+
+
+@dataclass
+class HedgePolicy:
+    """When and where to hedge requests for one ``(agent, action)``.
+
+    The hedge delay is the ``percentile`` of the primary's recent
+    latencies, clamped to ``[min_delay, max_delay]``; ``initial_delay`` is
+    used until ``min_samples`` latencies have been seen.
+    """
+    backups: List[HedgeTarget]
+    percentile: float = 0.95
+    initial_delay: float = 1.0
+    min_delay: float = 0.05
+    max_delay: float = 10.0
+    min_samples: int = 20
+    max_hedges: int = 1
+    hedge_on_failure: bool = True  # lanzar el backup en cuanto falle el primario
+
+    def __post_init__(self):
+        if not 0 < self.percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        self.backups = [
+            b if isinstance(b, HedgeTarget) else HedgeTarget(b) if isinstance(b, str) else HedgeTarget(*b)
+            for b in self.backups
+        ]
+
+
+class LatencyTracker:
+    """Recent latencies of one ``(agent, action)``"""
+
+    def __init__(self, size: int = 500):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+@dataclass
+class HedgeBudget:
+    """Cap hedges per ``window`` seconds.
+
+    Hedges are allowed while ``hedges < min_hedges + ratio * requests`` and
+    their summed cost stays within ``max_cost`` (``None``: no cost cap).
+    """
+    ratio: float = 0.1
+    min_hedges: int = 3
+    max_cost: Optional[float] = None
+    window: float = 60.0
+
+    _requests: Deque[float] = field(default_factory=deque, init=False, repr=False)
+    _hedges: Deque[Tuple[float, float]] = field(default_factory=deque, init=False, repr=False)
+    _spent: float = field(default=0.0, init=False)
+    denied: int = field(default=0, init=False)
+
+    def _prune(self, now: float):
+        horizon = now - self.window
+        while self._requests and self._requests[0] <= horizon:
+            self._requests.popleft()
+        while self._hedges and self._hedges[0][0] <= horizon:
+            self._spent -= self._hedges.popleft()[1]
+
+    def record_request(self):
+        self._requests.append(time.monotonic())
+
+    def try_spend(self, cost: float) -> bool:
+        """Reserve one hedge costing ``cost``; False if it would break the cap"""
+        now = time.monotonic()
+        self._prune(now)
+        over_ratio = len(self._hedges) + 1 > self.min_hedges + self.ratio * len(self._requests)
+        over_cost = self.max_cost is not None and self._spent + cost > self.max_cost
+        if over_ratio or over_cost:
+            self.denied += 1
+            return False
+        self._hedges.append((now, cost))
+        self._spent += cost
+        return True
+
+    def reset(self):
+        self._requests.clear()
+        self._hedges.clear()
+        self._spent = 0.0
+        self.denied = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._prune(time.monotonic())
+        return {
+            "requests": len(self._requests),
+            "hedges": len(self._hedges),
+            "spent": self._spent,
+            "denied": self.denied,
+        }
+
+
+class Hedger:
+    """Hedge policies, latency history and outcome counters of a protocol"""
+
+    def __init__(self, budget: Optional[HedgeBudget] = None):
+        self.budget = budget or HedgeBudget()
+        self.policies: Dict[Tuple[str, str], HedgePolicy] = {}
+        self.latencies: Dict[Tuple[str, str], LatencyTracker] = {}
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.primary_wins = 0
+
+    def add_policy(self, agent_id: str, action: str,
+                   backups: List[Union[HedgeTarget, Tuple[Any, ...], str]], **options) -> HedgePolicy:
+        policy = self.policies[(agent_id, action)] = HedgePolicy(list(backups), **options)
+        return policy
+
+    def remove_policy(self, agent_id: str, action: str):
+        self.policies.pop((agent_id, action), None)
+
+    def policy_for(self, agent_id: str, action: str) -> Optional[HedgePolicy]:
+        return self.policies.get((agent_id, action))
+
+    def record_latency(self, agent_id: str, action: str, seconds: float):
+        tracker = self.latencies.get((agent_id, action))
+        if tracker is None:
+            tracker = self.latencies[(agent_id, action)] = LatencyTracker()
+        tracker.record(seconds)
+
+    def delay_for(self, agent_id: str, action: str, policy: HedgePolicy) -> float:
+        tracker = self.latencies.get((agent_id, action))
+        if tracker is None or len(tracker) < policy.min_samples:
+            return policy.initial_delay
+        delay = tracker.percentile(policy.percentile)
+        return min(max(delay, policy.min_delay), policy.max_delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "primary_wins": self.primary_wins,
+            "budget": self.budget.get_stats(),
+        }
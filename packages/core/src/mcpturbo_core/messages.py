@@ -1,9 +1,15 @@
-from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
-from datetime import datetime
-from enum import Enum
+import itertools
+import operator
+import os
+import time
 import uuid
-from .config import get_config
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple
+
+from .codecs import get_codec
+from .exceptions import SerializationError
+from .policy import current_policy
 
 class MessageType(str, Enum):
     REQUEST = "request"
@@ -16,17 +22,127 @@ class Priority(int, Enum):
     HIGH = 3
     CRITICAL = 4
 
-@dataclass
+# Ids y timestamps se materializan solo cuando se leen: cada mensaje guarda
+# un contador y un instante monotónico, que es mucho más barato que uuid4()
+# y datetime.utcnow().
+_id_counter = itertools.count(1)
+_id_prefix = uuid.uuid4().hex[:16]
+_MONO_ANCHOR_NS = time.monotonic_ns()
+_WALL_ANCHOR = datetime.utcnow()
+
+
+def _reset_id_prefix():
+    # El contador sigue: los mensajes heredados del padre no colisionan
+    global _id_prefix
+    _id_prefix = uuid.uuid4().hex[:16]
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_id_prefix)
+
+_BASE_FIELDS = ("id", "type", "sender", "timestamp", "data", "priority")
+
+
 class Message:
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    type: MessageType = MessageType.REQUEST
-    sender: str = ""
-    timestamp: datetime = field(default_factory=datetime.utcnow)
-    data: Dict[str, Any] = field(default_factory=dict)
-    priority: Priority = Priority.NORMAL
-    
+    """Base message with ``__slots__`` storage.
+
+    ``id`` (``"<process prefix>-<counter>"``), ``timestamp`` (naive UTC, like
+    ``datetime.utcnow()``) and ``data`` are created lazily on first access.
+    Subclasses declare their own ``_own_fields``; constructor signatures,
+    equality, ``repr`` and :meth:`to_dict` match the former dataclasses.
+    """
+    __slots__ = ("_id", "_seq", "_created_ns", "_timestamp", "_data", "type", "sender", "priority")
+
+    _own_fields: Tuple[str, ...] = ()
+    _extra_fields: Tuple[str, ...] = ()
+    _state_slots: Tuple[str, ...] = __slots__
+    _default_type = MessageType.REQUEST
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        parent = cls.__mro__[1]
+        cls._extra_fields = parent._extra_fields + cls.__dict__.get("_own_fields", ())
+        cls._state_slots = parent._state_slots + tuple(cls.__dict__.get("__slots__", ()))
+        if cls._extra_fields:
+            cls._extra_getter = operator.attrgetter(*cls._extra_fields)
+
+    def __init__(self, id: Optional[str] = None, type: Optional[MessageType] = None,
+                 sender: str = "", timestamp: Optional[datetime] = None,
+                 data: Optional[Dict[str, Any]] = None, priority: Priority = Priority.NORMAL):
+        self._id = id
+        self._seq = next(_id_counter) if id is None else 0
+        self._created_ns = time.monotonic_ns()
+        self._timestamp = timestamp
+        self._data = data
+        self.type = self._default_type if type is None else type
+        self.sender = sender
+        self.priority = priority
+
+    @property
+    def id(self) -> str:
+        if self._id is None:
+            self._id = f"{_id_prefix}-{self._seq:x}"
+        return self._id
+
+    @id.setter
+    def id(self, value: str):
+        self._id = value
+
+    @property
+    def timestamp(self) -> datetime:
+        if self._timestamp is None:
+            elapsed_us = (self._created_ns - _MONO_ANCHOR_NS) // 1000
+            self._timestamp = _WALL_ANCHOR + timedelta(microseconds=elapsed_us)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value: datetime):
+        self._timestamp = value
+
+    @property
+    def created_ns(self) -> int:
+        """``time.monotonic_ns()`` at creation, for cheap ordering and latency math"""
+        return self._created_ns
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = {}
+        return self._data
+
+    @data.setter
+    def data(self, value: Dict[str, Any]):
+        self._data = value
+
+    def _field_values(self) -> Tuple[Any, ...]:
+        extra = self._extra_getter(self) if self._extra_fields else ()
+        return (self.id, self.type, self.sender, self.timestamp, self.data, self.priority) + extra
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._field_values() == other._field_values()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        names = _BASE_FIELDS + self._extra_fields
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(names, self._field_values()))
+        return f"{self.__class__.__qualname__}({fields})"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {name: getattr(self, name) for name in self._state_slots}
+        # Fijar id y timestamp aquí: en otro proceso saldrían de su prefijo y su reloj
+        state["_id"] = self.id
+        state["_timestamp"] = self.timestamp
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        result = {
             "id": self.id,
             "type": self.type.value,
             "sender": self.sender,
@@ -34,111 +150,157 @@ class Message:
             "data": self.data,
             "priority": self.priority.value
         }
+        if self._extra_fields:
+            result.update(zip(self._extra_fields, self._extra_getter(self)))
+        return result
+
+    def to_bytes(self, codec: Any = None) -> bytes:
+        """Encode :meth:`to_dict` with a codec name or instance (JSON by default)"""
+        return get_codec(codec).dumps(self.to_dict())
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Message":
+        """Rebuild a message from :meth:`to_dict` output.
+
+        Called on :class:`Message` itself, the concrete class is picked from
+        ``type`` and the AI-specific fields. Enums and the timestamp are
+        restored; unknown keys are ignored.
+        """
+        if not isinstance(data, dict):
+            raise SerializationError("Message payload must be a mapping", data_type=type(data).__name__)
+        if cls is Message:
+            cls = _message_class(data)
+        kwargs = {name: data[name] for name in _BASE_FIELDS + cls._extra_fields if name in data}
+        try:
+            if "type" in kwargs:
+                kwargs["type"] = MessageType(kwargs["type"])
+            if "priority" in kwargs:
+                kwargs["priority"] = Priority(kwargs["priority"])
+            if isinstance(kwargs.get("timestamp"), str):
+                kwargs["timestamp"] = datetime.fromisoformat(kwargs["timestamp"])
+            return cls(**kwargs)
+        except (TypeError, ValueError) as e:
+            raise SerializationError(f"Invalid {cls.__name__} payload: {e}", data_type=cls.__name__) from e
+
+    @classmethod
+    def from_bytes(cls, payload: bytes, codec: Any = None) -> "Message":
+        return cls.from_dict(get_codec(codec).loads(payload))
+
 
-@dataclass
 class Request(Message):
-    type: MessageType = MessageType.REQUEST
-    target: str = ""
-    action: str = ""
-    timeout: int = 30
-    correlation_id: Optional[str] = None
+    __slots__ = ("target", "action", "timeout", "correlation_id")
+    _own_fields = __slots__
+
+    def __init__(self, id: Optional[str] = None, type: Optional[MessageType] = None,
+                 sender: str = "", timestamp: Optional[datetime] = None,
+                 data: Optional[Dict[str, Any]] = None, priority: Priority = Priority.NORMAL,
+                 target: str = "", action: str = "", timeout: int = 30,
+                 correlation_id: Optional[str] = None):
+        self.target = target
+        self.action = action
+        self.timeout = timeout
+        self.correlation_id = correlation_id
+        Message.__init__(self, id, type, sender, timestamp, data, priority)
+        self.__post_init__()
 
     def __post_init__(self):
-        config = get_config()
-        if self.timeout > config.timeout:
+        limit = current_policy().timeout
+        if self.timeout > limit:
             raise ValueError(
-                f"Request timeout {self.timeout} exceeds allowed maximum {config.timeout}"
+                f"Request timeout {self.timeout} exceeds allowed maximum {limit}"
             )
-    
-    def to_dict(self) -> Dict[str, Any]:
-        base = super().to_dict()
-        base.update({
-            "target": self.target,
-            "action": self.action,
-            "timeout": self.timeout,
-            "correlation_id": self.correlation_id
-        })
-        return base
-
-@dataclass
+
+
 class Response(Message):
-    type: MessageType = MessageType.RESPONSE
-    target: str = ""
-    request_id: str = ""
-    success: bool = True
-    result: Any = None
-    error: Optional[str] = None
-    execution_time: Optional[float] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        base = super().to_dict()
-        base.update({
-            "target": self.target,
-            "request_id": self.request_id,
-            "success": self.success,
-            "result": self.result,
-            "error": self.error,
-            "execution_time": self.execution_time
-        })
-        return base
-
-@dataclass
+    _default_type = MessageType.RESPONSE
+    __slots__ = ("target", "request_id", "success", "result", "error", "execution_time")
+    _own_fields = __slots__
+
+    def __init__(self, id: Optional[str] = None, type: Optional[MessageType] = None,
+                 sender: str = "", timestamp: Optional[datetime] = None,
+                 data: Optional[Dict[str, Any]] = None, priority: Priority = Priority.NORMAL,
+                 target: str = "", request_id: str = "", success: bool = True,
+                 result: Any = None, error: Optional[str] = None,
+                 execution_time: Optional[float] = None):
+        self.target = target
+        self.request_id = request_id
+        self.success = success
+        self.result = result
+        self.error = error
+        self.execution_time = execution_time
+        Message.__init__(self, id, type, sender, timestamp, data, priority)
+
+
 class Event(Message):
-    type: MessageType = MessageType.EVENT
-    event: str = ""
-    scope: str = "all"
-    recipients: Optional[list] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        base = super().to_dict()
-        base.update({
-            "event": self.event,
-            "scope": self.scope,
-            "recipients": self.recipients
-        })
-        return base
+    _default_type = MessageType.EVENT
+    __slots__ = ("event", "scope", "recipients")
+    _own_fields = __slots__
+
+    def __init__(self, id: Optional[str] = None, type: Optional[MessageType] = None,
+                 sender: str = "", timestamp: Optional[datetime] = None,
+                 data: Optional[Dict[str, Any]] = None, priority: Priority = Priority.NORMAL,
+                 event: str = "", scope: str = "all", recipients: Optional[list] = None):
+        self.event = event
+        self.scope = scope
+        self.recipients = recipients
+        Message.__init__(self, id, type, sender, timestamp, data, priority)
+
 
 # Mensajes específicos para agentes de IA
 
-@dataclass
 class AIRequest(Request):
-    model: Optional[str] = None
-    temperature: float = 0.7
-    max_tokens: Optional[int] = None
-    system_prompt: Optional[str] = None
+    __slots__ = ("model", "temperature", "max_tokens", "system_prompt")
+    _own_fields = __slots__
+
+    def __init__(self, id: Optional[str] = None, type: Optional[MessageType] = None,
+                 sender: str = "", timestamp: Optional[datetime] = None,
+                 data: Optional[Dict[str, Any]] = None, priority: Priority = Priority.NORMAL,
+                 target: str = "", action: str = "", timeout: int = 30,
+                 correlation_id: Optional[str] = None, model: Optional[str] = None,
+                 temperature: float = 0.7, max_tokens: Optional[int] = None,
+                 system_prompt: Optional[str] = None):
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.system_prompt = system_prompt
+        Request.__init__(self, id, type, sender, timestamp, data, priority,
+                         target, action, timeout, correlation_id)
 
     def __post_init__(self):
         super().__post_init__()
-        config = get_config()
-        if self.max_tokens and self.max_tokens > config.max_tokens:
+        limit = current_policy().max_tokens
+        if self.max_tokens and self.max_tokens > limit:
             raise ValueError(
-                f"Request max_tokens {self.max_tokens} exceeds allowed maximum {config.max_tokens}"
+                f"Request max_tokens {self.max_tokens} exceeds allowed maximum {limit}"
             )
-    
-    def to_dict(self) -> Dict[str, Any]:
-        base = super().to_dict()
-        base.update({
-            "model": self.model,
-            "temperature": self.temperature,
-            "max_tokens": self.max_tokens,
-            "system_prompt": self.system_prompt
-        })
-        return base
-
-@dataclass
+
+
 class AIResponse(Response):
-    model_used: Optional[str] = None
-    tokens_used: Optional[int] = None
-    cost: Optional[float] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        base = super().to_dict()
-        base.update({
-            "model_used": self.model_used,
-            "tokens_used": self.tokens_used,
-            "cost": self.cost
-        })
-        return base
+    __slots__ = ("model_used", "tokens_used", "cost")
+    _own_fields = __slots__
+
+    def __init__(self, id: Optional[str] = None, type: Optional[MessageType] = None,
+                 sender: str = "", timestamp: Optional[datetime] = None,
+                 data: Optional[Dict[str, Any]] = None, priority: Priority = Priority.NORMAL,
+                 target: str = "", request_id: str = "", success: bool = True,
+                 result: Any = None, error: Optional[str] = None,
+                 execution_time: Optional[float] = None, model_used: Optional[str] = None,
+                 tokens_used: Optional[int] = None, cost: Optional[float] = None):
+        self.model_used = model_used
+        self.tokens_used = tokens_used
+        self.cost = cost
+        Response.__init__(self, id, type, sender, timestamp, data, priority, target,
+                          request_id, success, result, error, execution_time)
+
+def _message_class(data: Dict[str, Any]) -> type:
+    kind = data.get("type", MessageType.REQUEST.value)
+    if kind == MessageType.RESPONSE.value:
+        return AIResponse if "model_used" in data else Response
+    if kind == MessageType.EVENT.value:
+        return Event
+    if kind == MessageType.REQUEST.value:
+        return AIRequest if "model" in data else Request
+    raise SerializationError(f"Unknown message type '{kind}'", data_type=str(kind))
 
 # Factory functions para crear mensajes comunes
 
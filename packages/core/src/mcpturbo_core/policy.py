@@ -0,0 +1,91 @@
+"""Precompiled request policy and confirmation hooks.
+
+The checks driven by :class:`MCPConfig` (tool permissions, sensitive
+actions, timeout and ``max_tokens`` limits) are compiled into an immutable
+:class:`RequestPolicy` once per configuration version, so the request hot
+path only does a version comparison and a few set lookups.
+"""
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional
+
+from . import config as _config_module
+from .config import MCPConfig, get_config
+from .exceptions import MCPError
+
+# (action, data) -> True para continuar
+ConfirmationHook = Callable[[str, Dict[str, Any]], Awaitable[bool]]
+
+
+@dataclass(frozen=True)
+class RequestPolicy:
+    version: int
+    timeout: int
+    max_tokens: int
+    denied_actions: FrozenSet[str]
+    sensitive_actions: FrozenSet[str]
+
+    @classmethod
+    def compile(cls, config: MCPConfig, version: int = 0) -> "RequestPolicy":
+        return cls(
+            version=version,
+            timeout=config.timeout,
+            max_tokens=config.max_tokens,
+            denied_actions=frozenset(a for a, allowed in config.tool_permissions.items() if not allowed),
+            sensitive_actions=frozenset(config.sensitive_actions),
+        )
+
+    def check(self, action: str, data: Optional[Dict[str, Any]], timeout: int) -> bool:
+        """Validate a request; returns True if it needs confirmation"""
+        if action in self.denied_actions:
+            raise MCPError(f"Action '{action}' is not permitted by configuration.")
+        if timeout > self.timeout:
+            raise MCPError(
+                f"Request timeout {timeout} exceeds configured maximum {self.timeout}"
+            )
+        max_tokens = data.get("max_tokens") if data else None
+        if max_tokens and max_tokens > self.max_tokens:
+            raise MCPError(
+                f"Request max_tokens {max_tokens} exceeds configured maximum {self.max_tokens}"
+            )
+        return action in self.sensitive_actions
+
+
+_policy: Optional[RequestPolicy] = None
+
+
+def current_policy() -> RequestPolicy:
+    """Policy for the current global config, recompiled only when it changes"""
+    global _policy
+    policy = _policy
+    if policy is not None and policy.version == _config_module._config_version:
+        return policy
+    config = get_config()
+    # get_config() puede cargar la configuración y cambiar la versión
+    _policy = RequestPolicy.compile(config, _config_module._config_version)
+    return _policy
+
+
+_console_lock = threading.Lock()
+
+
+def _prompt(action: str) -> str:
+    with _console_lock:
+        return input(f"Action '{action}' requires confirmation. Proceed? (y/N): ")
+
+
+async def console_confirmation(action: str, data: Dict[str, Any]) -> bool:
+    """Default hook: ask on the terminal from a worker thread, one prompt at a time"""
+    answer = await asyncio.to_thread(_prompt, action)
+    return answer.strip().lower() in {"y", "yes"}
+
+
+async def deny_all(action: str, data: Dict[str, Any]) -> bool:
+    """Hook for unattended servers: refuse every sensitive action"""
+    return False
+
+
+async def allow_all(action: str, data: Dict[str, Any]) -> bool:
+    return True
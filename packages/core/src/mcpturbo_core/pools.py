@@ -0,0 +1,325 @@
+"""Per-host HTTP connection pools for external agents.
+
+Every origin (``scheme://host:port``) gets its own session and connector,
+so a slow provider cannot use up the connections another one needs. Pool
+size, keepalive, DNS caching and timeouts can be tuned per host with
+:class:`PoolConfig`. ``http2=True`` switches a host to the optional
+``httpx`` backend (``pip install httpx[http2]``), which multiplexes every
+request over one TLS connection.
+
+Pools listed with ``warmup > 0`` open their connections in
+:meth:`ConnectionPools.start`, so the first requests skip the TCP and TLS
+handshakes.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, fields, replace
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .config import get_config
+from .exceptions import ConfigurationError
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def origin_of(url: str) -> str:
+    """``scheme://host:port`` of a URL, with the default port made explicit"""
+    parts = urlsplit(url)
+    scheme = parts.scheme or "http"
+    port = parts.port or _DEFAULT_PORTS.get(scheme, 80)
+    return f"{scheme}://{parts.hostname}:{port}"
+
+
+@dataclass
+class PoolConfig:
+    limit: int = 100  # conexiones simultáneas hacia el host
+    keepalive_timeout: float = 30.0
+    ttl_dns_cache: Optional[int] = 300
+    connect_timeout: Optional[float] = 10.0
+    total_timeout: Optional[float] = 60.0
+    http2: bool = False
+    warmup: int = 0  # conexiones abiertas en start()
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PoolConfig":
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ConfigurationError(f"Unknown pool options: {sorted(unknown)}", "connection_pools")
+        return cls(**data)
+
+
+class _PoolStats:
+    __slots__ = ("requests", "in_flight", "peak_in_flight", "saturated", "warmed", "warmup_errors")
+
+    def __init__(self):
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.saturated = 0  # peticiones que encontraron el pool lleno
+        self.warmed = 0
+        self.warmup_errors = 0
+
+
+class HostPool:
+    """Session, connector and usage counters for one origin"""
+
+    def __init__(self, origin: str, config: PoolConfig):
+        self.origin = origin
+        self.config = config
+        self.stats = _PoolStats()
+        if config.http2:
+            if httpx is None:
+                raise ConfigurationError(
+                    f"http2 pool for {origin} requires httpx (pip install httpx[http2])",
+                    "connection_pools",
+                )
+            self.session: Any = _HTTPXSession(config)
+        else:
+            connector = aiohttp.TCPConnector(
+                limit=config.limit,
+                limit_per_host=config.limit,
+                keepalive_timeout=config.keepalive_timeout,
+                ttl_dns_cache=config.ttl_dns_cache,
+                use_dns_cache=config.ttl_dns_cache is not None,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=config.total_timeout, connect=config.connect_timeout),
+            )
+
+    def acquire(self) -> Any:
+        """Count a request against the pool; pair with :meth:`release`"""
+        stats = self.stats
+        stats.requests += 1
+        if stats.in_flight >= self.config.limit and not self.config.http2:
+            stats.saturated += 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        return self.session
+
+    def release(self):
+        self.stats.in_flight -= 1
+
+    @asynccontextmanager
+    async def track(self) -> AsyncIterator[Any]:
+        try:
+            yield self.acquire()
+        finally:
+            self.release()
+
+    async def warm_up(self):
+        # Con HTTP/2 basta una conexión: todo se multiplexa sobre ella
+        count = 1 if self.config.http2 else min(self.config.warmup, self.config.limit)
+
+        async def touch():
+            try:
+                async with self.session.request("HEAD", self.origin + "/"):
+                    pass
+            except Exception:
+                self.stats.warmup_errors += 1
+            else:
+                self.stats.warmed += 1
+
+        await asyncio.gather(*(touch() for _ in range(count)))
+
+    def utilization(self) -> float:
+        if self.config.http2:
+            return 0.0
+        return self.stats.in_flight / self.config.limit
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats
+        return {
+            "backend": "httpx-h2" if self.config.http2 else "aiohttp",
+            "limit": self.config.limit,
+            "in_flight": stats.in_flight,
+            "peak_in_flight": stats.peak_in_flight,
+            "utilization": self.utilization(),
+            "requests": stats.requests,
+            "saturated": stats.saturated,
+            "warmed": stats.warmed,
+            "warmup_errors": stats.warmup_errors,
+        }
+
+    async def close(self):
+        await self.session.close()
+
+
+class ConnectionPools:
+    """One :class:`HostPool` per origin, created on first use.
+
+    ``hosts`` maps a host name (``"api.openai.com"``) or a full origin
+    (``"https://api.openai.com:443"``) to a :class:`PoolConfig` or a dict of
+    its fields; hosts not listed use ``default``.
+    """
+
+    def __init__(self, default: Optional[PoolConfig] = None,
+                 hosts: Optional[Mapping[str, Any]] = None):
+        self._default = default
+        self.hosts: Dict[str, PoolConfig] = {}
+        self.pools: Dict[str, HostPool] = {}
+        self._config_loaded = False
+        for host, config in (hosts or {}).items():
+            self.configure(host, config)
+
+    @property
+    def default(self) -> PoolConfig:
+        self._load_config()
+        return self._default or PoolConfig()
+
+    def _load_config(self):
+        # MCPConfig.connection_pools se lee en el primer uso, como la cache
+        if self._config_loaded:
+            return
+        self._config_loaded = True
+        options = dict(get_config().connection_pools)
+        default = options.pop("default", None)
+        if default is not None and self._default is None:
+            self._default = PoolConfig.from_dict(default)
+        for host, config in options.items():
+            if host not in self.hosts:
+                self.hosts[host] = PoolConfig.from_dict(config)
+
+    def configure(self, host: str, config: Any = None, **options):
+        """Set the pool options for ``host``; applies to pools opened afterwards"""
+        if isinstance(config, Mapping):
+            config = PoolConfig.from_dict(config)
+        config = config or self.hosts.get(host) or self.default
+        self.hosts[host] = replace(config, **options) if options else config
+
+    def config_for(self, origin: str) -> PoolConfig:
+        self._load_config()
+        config = self.hosts.get(origin)
+        if config is None:
+            config = self.hosts.get(urlsplit(origin).hostname, self.default)
+        return config
+
+    def pool_for(self, url: str) -> HostPool:
+        origin = origin_of(url)
+        pool = self.pools.get(origin)
+        if pool is None:
+            pool = self.pools[origin] = HostPool(origin, self.config_for(origin))
+        return pool
+
+    async def start(self, urls: Iterable[str] = ()):
+        """Open the pools for ``urls`` and warm up those that ask for it"""
+        pools = {self.pool_for(url) for url in urls}
+        await asyncio.gather(*(
+            pool.warm_up() for pool in pools if pool.config.warmup > 0
+        ))
+
+    async def close(self):
+        pools, self.pools = list(self.pools.values()), {}
+        for pool in pools:
+            await pool.close()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {origin: pool.get_stats() for origin, pool in self.pools.items()}
+
+
+class _HTTPXResponse:
+    """The subset of ``aiohttp.ClientResponse`` that MCPProtocol uses"""
+
+    def __init__(self, response: Any):
+        self._response = response
+        self.status = response.status_code
+        self.headers = response.headers
+        self.content = self
+
+    async def read(self) -> bytes:
+        return await self._response.aread()
+
+    async def text(self) -> str:
+        await self._response.aread()
+        return self._response.text
+
+    async def json(self, loads=None) -> Any:
+        body = await self.read()
+        return loads(body) if loads else self._response.json()
+
+    async def iter_any(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._response.aiter_raw():
+                yield chunk
+        except httpx.TimeoutException as e:
+            raise asyncio.TimeoutError(str(e)) from e
+
+    def release(self):
+        asyncio.ensure_future(self._response.aclose())
+
+
+class _HTTPXRequest:
+    """Awaitable and async context manager, like aiohttp's request helpers"""
+
+    def __init__(self, session: "_HTTPXSession", method: str, url: str, kwargs: Dict[str, Any]):
+        self._session = session
+        self._args = (method, url, kwargs)
+        self._response: Optional[_HTTPXResponse] = None
+
+    def __await__(self):
+        return self._send().__await__()
+
+    async def _send(self) -> _HTTPXResponse:
+        method, url, kwargs = self._args
+        timeout = self._session.timeout_for(kwargs.get("timeout"))
+        request = self._session.client.build_request(
+            method, url, content=kwargs.get("data"), headers=kwargs.get("headers"), timeout=timeout
+        )
+        try:
+            response = await self._session.client.send(request, stream=True)
+        except httpx.TimeoutException as e:
+            raise asyncio.TimeoutError(str(e)) from e
+        except httpx.TransportError as e:
+            # Los reintentos tratan los errores de conexión como transitorios
+            raise aiohttp.ClientConnectionError(str(e)) from e
+        return _HTTPXResponse(response)
+
+    async def __aenter__(self) -> _HTTPXResponse:
+        self._response = await self._send()
+        return self._response
+
+    async def __aexit__(self, *exc):
+        await self._response._response.aclose()
+
+
+class _HTTPXSession:
+    """Minimal aiohttp-compatible session over an HTTP/2 ``httpx.AsyncClient``"""
+
+    def __init__(self, config: PoolConfig):
+        self.config = config
+        self.client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=config.limit,
+                max_keepalive_connections=config.limit,
+                keepalive_expiry=config.keepalive_timeout,
+            ),
+            timeout=httpx.Timeout(config.total_timeout, connect=config.connect_timeout),
+        )
+
+    def timeout_for(self, timeout: Any) -> Any:
+        if isinstance(timeout, aiohttp.ClientTimeout):
+            read = timeout.sock_read if timeout.sock_read is not None else timeout.total
+            return httpx.Timeout(timeout.total, connect=self.config.connect_timeout, read=read)
+        if timeout is None:
+            return self.client.timeout
+        return httpx.Timeout(timeout, connect=self.config.connect_timeout)
+
+    def request(self, method: str, url: str, **kwargs) -> _HTTPXRequest:
+        return _HTTPXRequest(self, method, url, kwargs)
+
+    def post(self, url: str, **kwargs) -> _HTTPXRequest:
+        return _HTTPXRequest(self, "POST", url, kwargs)
+
+    async def close(self):
+        await self.client.aclose()
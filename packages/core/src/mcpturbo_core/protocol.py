@@ -1,16 +1,34 @@
 import asyncio
 import aiohttp
 import time
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass, field
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Mapping,
+    Optional, Tuple, Union
+)
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
 from opentelemetry import metrics, trace
 
-from .messages import Request, Response, Event
-from .exceptions import MCPError, TimeoutError, RateLimitError, CircuitBreakerError
+from .messages import Request, Response, Event, AIResponse, Priority
+from .exceptions import (
+    MCPError, TimeoutError, RateLimitError, CircuitBreakerError,
+    AuthenticationError, APIError
+)
 from .config import get_config
+from .coalescing import RequestCoalescer, request_key
+from .cache import CachePolicy, ResponseCache
+from .streaming import ResponseStream, SSEParser
+from .ratelimit import RateLimiter, parse_retry_after
+from .retry import RetryBudget, RetryPolicy, default_retry_budget
+from .admission import AdmissionQueue
+from .policy import ConfirmationHook, console_confirmation, current_policy
+from .codecs import Codec, get_codec
+from .transport import TransportClient
+from .pools import ConnectionPools
+from .hedging import HedgeBudget, Hedger, HedgePolicy
+from .events import EventBus, Subscription
 
 
 tracer = trace.get_tracer(__name__)
@@ -47,6 +65,14 @@ class CircuitBreaker:
                 return True
             return False
         return True
+
+    @property
+    def is_open(self) -> bool:
+        """Open and still inside the recovery timeout (no state change)"""
+        return self.state == CircuitState.OPEN and not (
+            self.last_failure_time and
+            (datetime.utcnow() - self.last_failure_time).total_seconds() >= self.recovery_timeout
+        )
     
     def record_success(self):
         self.failure_count = 0
@@ -59,54 +85,132 @@ class CircuitBreaker:
         if self.failure_count >= self.failure_threshold:
             self.state = CircuitState.OPEN
 
-@dataclass
-class RateLimiter:
-    requests_per_minute: int = 50
-    tokens: float = 50
-    last_refill: float = field(default_factory=time.time)
-    
-    def can_proceed(self) -> bool:
-        now = time.time()
-        time_passed = now - self.last_refill
-        self.tokens = min(self.requests_per_minute, self.tokens + (time_passed * self.requests_per_minute / 60))
-        self.last_refill = now
-        
-        if self.tokens >= 1:
-            self.tokens -= 1
-            return True
-        return False
+# Compatibilidad: RetryConfig es ahora una RetryPolicy con jitter
+RetryConfig = RetryPolicy
+
+
+class _AgentFailure(Exception):
+    """Carries an error raised by the agent itself (not by the protocol)"""
+    def __init__(self, error: Exception):
+        super().__init__(str(error))
+        self.error = error
+
+
+async def iter_windowed(send: Callable[[Any], Awaitable[Any]],
+                        items: Union[Iterable[Any], AsyncIterable[Any]], limit: int,
+                        return_exceptions: bool = False) -> AsyncIterator[Tuple[int, Any]]:
+    """Run ``send(item)`` with at most ``limit`` in flight, yielding ``(index, result)``.
+
+    ``items`` is read lazily; closing the generator cancels what is in flight.
+    Shared by :meth:`MCPProtocol.iter_batch` and the sharded runtime.
+    """
+    if limit < 1:
+        raise ValueError("concurrency must be positive")
+
+    if hasattr(items, "__aiter__"):
+        source = items.__aiter__()
+
+        async def next_item():
+            return await source.__anext__()
+    else:
+        source = iter(items)
+
+        async def next_item():
+            try:
+                return next(source)
+            except StopIteration:
+                raise StopAsyncIteration
+
+    pending: Dict[asyncio.Future, int] = {}
+    index = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < limit:
+                try:
+                    data = await next_item()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                task = asyncio.ensure_future(send(data))
+                pending[task] = index
+                index += 1
+
+            if not pending:
+                return
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                position = pending.pop(task)
+                error = task.exception()
+                if error is None:
+                    yield position, task.result()
+                elif return_exceptions:
+                    yield position, error
+                else:
+                    raise error
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
-@dataclass
-class RetryConfig:
-    max_attempts: int = 3
-    initial_delay: float = 1.0
-    max_delay: float = 30.0
-    exponential_base: float = 2.0
 
 class MCPProtocol:
-    def __init__(self):
+    def __init__(self, coalesce_requests: bool = False,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 retry_budget: Optional[RetryBudget] = None,
+                 admission: Optional[AdmissionQueue] = None,
+                 confirmation_hook: Optional[ConfirmationHook] = None,
+                 codec: Union[str, Codec, None] = None,
+                 pools: Optional[ConnectionPools] = None,
+                 hedge_budget: Optional[HedgeBudget] = None):
         self.agents: Dict[str, Any] = {}
         self.circuit_breakers: Dict[str, CircuitBreaker] = {}
         self.rate_limiters: Dict[str, RateLimiter] = {}
-        self.event_handlers: Dict[str, List[Callable]] = {}
+        # Cada suscriptor tiene su cola y su worker: publicar no espera handlers
+        self.events = EventBus()
         self.pending_requests: Dict[str, asyncio.Future] = {}
-        self.session: Optional[aiohttp.ClientSession] = None
         self.running = False
         self.messages_sent = 0
         self.messages_received = 0
+        # Single-flight de requests idénticos concurrentes (opcional)
+        self.coalesce_requests = coalesce_requests
+        self.coalescer = RequestCoalescer()
+        # Cache de respuestas de agentes externos (opt-in por acción)
+        self.response_cache = ResponseCache()
+        # Política de reintentos por defecto y presupuesto compartido
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_budget = retry_budget or default_retry_budget
+        # Cola de admisión por prioridad (max_concurrent_requests / queue_size)
+        self.admission = admission or AdmissionQueue()
+        # Confirmación de acciones sensibles, sin bloquear el event loop
+        self.confirmation_hook = confirmation_hook or console_confirmation
+        # Codec de los cuerpos HTTP; un agente puede fijar el suyo con .codec
+        self.codec = get_codec(codec)
+        # Un pool de conexiones por host de proveedor
+        self.pools = pools or ConnectionPools()
+        # Hedging entre agentes equivalentes (ver hedge())
+        self.hedging = Hedger(hedge_budget)
+        # Conexiones persistentes a nodos remotos, por (host, port, codec)
+        self.transport_clients: Dict[Tuple[str, int, str], TransportClient] = {}
         
     async def start(self):
         if not self.running:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=60),
-                connector=aiohttp.TCPConnector(limit=100)
-            )
+            # Abre (y precalienta si se pidió) los pools de los agentes externos
+            urls = [agent.api_url for agent in self.agents.values()
+                    if isinstance(getattr(agent, 'api_url', None), str)]
+            await self.pools.start(urls)
             self.running = True
     
     async def stop(self):
         if self.running:
-            if self.session:
-                await self.session.close()
+            await self.pools.close()
+            await self.events.close()
+            for client in self.transport_clients.values():
+                await client.close()
+            self.transport_clients.clear()
+            self.response_cache.close()
             self.running = False
     
     def register_agent(self, agent_id: str, agent: Any, **config):
@@ -122,183 +226,613 @@ class MCPProtocol:
         self.rate_limiters[agent_id] = RateLimiter(
             requests_per_minute=config.get('rate_limit', 50)
         )
+
+        # Configurar cache de respuestas
+        if config.get('cache_actions'):
+            self.response_cache.enable(
+                agent_id,
+                config['cache_actions'],
+                ttl=config.get('cache_ttl'),
+                deterministic_only=config.get('cache_deterministic_only', False)
+            )
+
+    def is_available(self, agent_id: str) -> bool:
+        """False while the agent's circuit breaker is open"""
+        circuit_breaker = self.circuit_breakers.get(agent_id)
+        return circuit_breaker is None or not circuit_breaker.is_open
+
+    def enable_response_cache(self, agent_id: str, actions: List[str],
+                              ttl: Optional[float] = None, deterministic_only: bool = False):
+        """Serve repeated external calls for ``actions`` of ``agent_id`` from the cache"""
+        self.response_cache.enable(agent_id, actions, ttl=ttl, deterministic_only=deterministic_only)
     
-    def subscribe(self, event: str, handler: Callable):
-        if event not in self.event_handlers:
-            self.event_handlers[event] = []
-        self.event_handlers[event].append(handler)
+    def subscribe(self, event: str, handler: Callable, **options) -> Subscription:
+        """Run ``handler`` for events matching the topic pattern ``event``
+        (``task.*``, ``workflow.#``); ``options`` set the queue, ``subscriber``
+        and ``scope`` (see :class:`~mcpturbo_core.events.Subscription`)"""
+        return self.events.subscribe(event, handler, **options)
     
     async def send_request(self, sender_id: str, target_id: str, action: str,
                           data: Dict[str, Any] = None, timeout: int = 30,
-                          retry_config: Optional[RetryConfig] = None) -> Response:
+                          retry_config: Optional[RetryConfig] = None,
+                          coalesce: Optional[bool] = None,
+                          priority: Priority = Priority.NORMAL) -> Response:
+        """Send a request to ``target_id`` and return its :class:`Response`.
+
+        With ``coalesce`` (or ``coalesce_requests`` on the protocol) enabled,
+        concurrent calls with the same ``(target_id, action, data)`` share a
+        single in-flight request and all receive the same ``Response``.
+
+        Failed attempts are retried according to ``retry_config`` (a
+        :class:`RetryPolicy`, defaulting to ``self.retry_policy``) within the
+        shared ``retry_budget``. Errors raised by the agent end up in a
+        ``Response`` with ``success=False``; protocol errors (timeouts,
+        circuit breaker, rate limit) are raised.
+
+        Each attempt takes a rate-limit token and then waits in
+        :attr:`admission` for one of the ``max_concurrent_requests`` slots,
+        served by ``priority``. The slot is held only while the attempt
+        runs, not during rate-limit waits or retry backoff.
+        """
 
         if not self.running:
             await self.start()
 
-        config = get_config()
-        if action in config.tool_permissions and not config.tool_permissions[action]:
-            raise MCPError(f"Action '{action}' is not permitted by configuration.")
-
-        if action in config.sensitive_actions:
-            confirm = input(
-                f"Action '{action}' requires confirmation. Proceed? (y/N): "
-            ).strip().lower()
-            if confirm not in {"y", "yes"}:
+        if current_policy().check(action, data, timeout):
+            if not await self.confirmation_hook(action, data or {}):
                 raise MCPError(f"Action '{action}' cancelled by user.")
 
-        if timeout > config.timeout:
-            raise MCPError(
-                f"Request timeout {timeout} exceeds configured maximum {config.timeout}"
+        # Los aciertos de cache no consumen rate limit ni plazas de admisión
+        cache_entry = self._cache_entry(sender_id, target_id, action, data, timeout)
+        if cache_entry is not None:
+            cached = await self.response_cache.get(cache_entry[0])
+            if cached is not None:
+                return Response(sender=target_id, target=sender_id, success=True, result=cached)
+
+        if coalesce is None:
+            coalesce = self.coalesce_requests
+        policy = self.hedging.policy_for(target_id, action)
+        if policy:
+            send = lambda: self._send_hedged(
+                policy, sender_id, target_id, action, data, timeout, retry_config, priority
             )
-        max_tokens = (data or {}).get("max_tokens")
-        if max_tokens and max_tokens > config.max_tokens:
-            raise MCPError(
-                f"Request max_tokens {max_tokens} exceeds configured maximum {config.max_tokens}"
+        else:
+            send = lambda: self._send_with_retries(
+                sender_id, target_id, action, data, timeout, retry_config, priority
             )
+        if cache_entry is not None:
+            send = self._storing_in_cache(send, target_id, *cache_entry)
+        if coalesce:
+            try:
+                key = request_key(target_id, action, data)
+            except TypeError:
+                # Sin clave canónica no se puede compartir la llamada con seguridad
+                key = None
+            if key is not None:
+                return await self.coalescer.run(key, send)
+        return await send()
+
+    def _cache_entry(self, sender_id: str, target_id: str, action: str,
+                     data: Optional[Dict[str, Any]], timeout: int) -> Optional[Tuple[str, CachePolicy]]:
+        """``(key, policy)`` if this call may be served from the response cache"""
+        if not self.response_cache.enabled_for(target_id, action):
+            return None
+        agent = self.agents.get(target_id)
+        if agent is None or not hasattr(agent, 'api_url'):
+            return None
+        request = Request(sender=sender_id, target=target_id, action=action,
+                          data=data or {}, timeout=timeout)
+        payload = self._payload_for(agent, request)
+        cache_policy = self.response_cache.policy_for(target_id, action, payload)
+        if cache_policy is None:
+            return None
+        try:
+            return self.response_cache.make_key(agent.api_url, payload), cache_policy
+        except TypeError:
+            return None
+
+    def _storing_in_cache(self, send: Callable[[], Awaitable[Response]], target_id: str,
+                          cache_key: str, cache_policy: CachePolicy) -> Callable[[], Awaitable[Response]]:
+        async def send_and_store() -> Response:
+            response = await send()
+            # Solo respuestas del propio agente (no de un backup de hedging)
+            if response.success and response.sender == target_id:
+                try:
+                    await self.response_cache.set(cache_key, response.result, ttl=cache_policy.ttl)
+                except TypeError:
+                    pass  # resultado no serializable: no se cachea
+            return response
+        return send_and_store
+
+    def hedge(self, agent_id: str, action: str, backups: List[Any], **options) -> HedgePolicy:
+        """Hedge ``action`` on ``agent_id`` with equivalent ``backups``.
+
+        ``backups`` are agent ids, ``(agent_id, action)`` tuples or
+        :class:`~mcpturbo_core.hedging.HedgeTarget`; ``options`` are
+        :class:`~mcpturbo_core.hedging.HedgePolicy` fields.
+        """
+        return self.hedging.add_policy(agent_id, action, backups, **options)
+
+    def _action_cost(self, agent_id: str, action: str) -> float:
+        for capability in getattr(self.agents.get(agent_id), 'capabilities', None) or ():
+            if getattr(capability, 'name', None) == action:
+                return capability.cost_per_request or 0.0
+        return 0.0
 
+    async def _send_hedged(self, policy: HedgePolicy, sender_id: str, target_id: str,
+                           action: str, data: Optional[Dict[str, Any]], timeout: int,
+                           retry_config: Optional[RetryConfig], priority: Priority) -> Response:
+        """Race the primary against backups fired after the hedge delay"""
+        hedger = self.hedging
+        hedger.budget.record_request()
+        delay = hedger.delay_for(target_id, action, policy)
+        backups = list(policy.backups[:policy.max_hedges])
+        tasks: Dict[asyncio.Future, Tuple[str, str, float]] = {}
+
+        def launch(agent_id: str, agent_action: str):
+            task = asyncio.ensure_future(self._send_with_retries(
+                sender_id, agent_id, agent_action, data, timeout, retry_config, priority
+            ))
+            tasks[task] = (agent_id, agent_action, time.perf_counter())
+
+        def hedge_next() -> bool:
+            while backups:
+                backup = backups.pop(0)
+                backup_action = backup.action or action
+                cost = backup.cost if backup.cost is not None else self._action_cost(backup.agent_id, backup_action)
+                if hedger.budget.try_spend(cost):
+                    hedger.hedged += 1
+                    launch(backup.agent_id, backup_action)
+                    return True
+                backups.clear()  # sin presupuesto no se intenta el resto
+            return False
+
+        launch(target_id, action)
+        outcome: Any = None
+        try:
+            while tasks:
+                wait_for = delay if backups else None
+                done, _ = await asyncio.wait(tasks, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedge_next()
+                    continue
+                for task in done:
+                    agent_id, agent_action, started = tasks.pop(task)
+                    if task.exception() is None and task.result().success:
+                        hedger.record_latency(agent_id, agent_action, time.perf_counter() - started)
+                        if agent_id == target_id and agent_action == action:
+                            hedger.primary_wins += 1
+                        else:
+                            hedger.hedge_wins += 1
+                        return task.result()
+                    outcome = task.exception() or task.result()
+                if not tasks or policy.hedge_on_failure:
+                    hedge_next()
+        finally:
+            # Lo que se cancela tardó al menos esto; sin la muestra el delay
+            # solo vería a los ganadores y bajaría por debajo del p95 real
+            now = time.perf_counter()
+            for task, (agent_id, agent_action, started) in tasks.items():
+                hedger.record_latency(agent_id, agent_action, now - started)
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    async def send_batch(self, target_id: str, action: str,
+                         items: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+                         concurrency: Optional[int] = None, return_exceptions: bool = False,
+                         sender_id: str = "batch", timeout: int = 30,
+                         retry_config: Optional[RetryConfig] = None,
+                         priority: Priority = Priority.NORMAL) -> List[Any]:
+        """Send one request per item of ``items`` and return results in input order.
+
+        At most ``concurrency`` requests (default ``max_concurrent_requests``)
+        are in flight at once, each going through :meth:`send_request` and
+        therefore through the agent's rate limiter and circuit breaker. With
+        ``return_exceptions`` errors are placed in the result list; otherwise
+        the first error cancels the outstanding requests and is raised.
+        """
+        results: List[Any] = []
+        async for index, result in self.iter_batch(
+            target_id, action, items, concurrency=concurrency,
+            return_exceptions=return_exceptions, sender_id=sender_id,
+            timeout=timeout, retry_config=retry_config, priority=priority
+        ):
+            if index >= len(results):
+                results.extend([None] * (index + 1 - len(results)))
+            results[index] = result
+        return results
+
+    def iter_batch(self, target_id: str, action: str,
+                   items: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+                   concurrency: Optional[int] = None, return_exceptions: bool = False,
+                   sender_id: str = "batch", timeout: int = 30,
+                   retry_config: Optional[RetryConfig] = None,
+                   priority: Priority = Priority.NORMAL
+                   ) -> AsyncIterator[Tuple[int, Any]]:
+        """Like :meth:`send_batch` but yield ``(index, result)`` in completion order.
+
+        ``items`` is consumed lazily, so memory stays bounded by
+        ``concurrency`` however long the input is. Closing the generator
+        early cancels the requests still in flight.
+        """
+        limit = concurrency or get_config().max_concurrent_requests
+        send = lambda data: self.send_request(
+            sender_id, target_id, action, data,
+            timeout=timeout, retry_config=retry_config, priority=priority
+        )
+        return iter_windowed(send, items, limit, return_exceptions)
+
+    async def _send_with_retries(self, sender_id: str, target_id: str, action: str,
+                                 data: Optional[Dict[str, Any]], timeout: int,
+                                 retry_config: Optional[RetryConfig],
+                                 priority: Priority = Priority.NORMAL) -> Response:
         # Verificar circuit breaker
         circuit_breaker = self.circuit_breakers.get(target_id)
         if circuit_breaker and not circuit_breaker.should_allow_request():
             raise CircuitBreakerError(f"Circuit breaker open for {target_id}")
         
-        # Verificar rate limit
-        rate_limiter = self.rate_limiters.get(target_id)
-        if rate_limiter and not rate_limiter.can_proceed():
-            raise RateLimitError(f"Rate limit exceeded for {target_id}")
-        
         request = Request(
             sender=sender_id,
             target=target_id,
             action=action,
             data=data or {},
-            timeout=timeout
+            timeout=timeout,
+            priority=priority
         )
-        
-        retry_config = retry_config or RetryConfig()
-        last_error = None
-        
-        for attempt in range(retry_config.max_attempts):
-            try:
-                self.messages_sent += 1
-                response = await self._send_request_attempt(request)
-                
-                # Actualizar circuit breaker en éxito
+
+        return await self._run_attempts(request, retry_config, circuit_breaker)
+
+    async def _run_attempts(self, request: Request, retry_config: Optional[RetryConfig],
+                            circuit_breaker: Optional[CircuitBreaker]) -> Response:
+        policy = retry_config or self.retry_policy
+        budget = self.retry_budget if policy.use_budget else None
+        if budget:
+            budget.record_request()
+
+        rate_limiter = self.rate_limiters.get(request.target)
+        delay = 0.0
+        attempt = 0
+        while True:
+            # Cada intento (también los reintentos) consume un token del rate limiter
+            if rate_limiter:
+                try:
+                    await rate_limiter.acquire(timeout=request.timeout)
+                except RateLimitError as e:
+                    raise RateLimitError(
+                        f"Rate limit exceeded for {request.target}", **e.details
+                    ) from e
+            # El slot global solo cubre el intento: la espera al rate limiter
+            # y el backoff entre reintentos no ocupan concurrencia
+            failure = None
+            async with self.admission.slot(request.priority, timeout=request.timeout):
+                try:
+                    self.messages_sent += 1
+                    response = await self._send_request_attempt(request)
+                except Exception as e:
+                    failure = e
+
+            if failure is None:
                 if circuit_breaker:
                     circuit_breaker.record_success()
-                
                 return response
-                
-            except Exception as e:
-                last_error = e
-                
-                # Actualizar circuit breaker en fallo
-                if circuit_breaker:
-                    circuit_breaker.record_failure()
-                
-                if attempt < retry_config.max_attempts - 1:
-                    delay = min(
-                        retry_config.initial_delay * (retry_config.exponential_base ** attempt),
-                        retry_config.max_delay
-                    )
-                    await asyncio.sleep(delay)
-                    continue
-                break
-        
-        raise last_error or MCPError("Request failed after all retries")
-    
+
+            error = failure.error if isinstance(failure, _AgentFailure) else failure
+            next_delay = policy.next_delay(attempt, delay, error)
+            if next_delay is not None and (budget is None or budget.try_retry()):
+                delay = next_delay
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+
+            # Un solo fallo por petición lógica en el circuit breaker
+            if circuit_breaker:
+                circuit_breaker.record_failure()
+            if isinstance(failure, _AgentFailure):
+                self.messages_received += 1
+                return Response(
+                    sender=request.target,
+                    target=request.sender,
+                    request_id=request.id,
+                    success=False,
+                    error=str(error)
+                )
+            raise error
+
     async def _send_request_attempt(self, request: Request) -> Response:
+        """Run a single attempt; errors raised by the agent come wrapped in _AgentFailure"""
         agent = self.agents.get(request.target)
         if not agent:
             raise MCPError(f"Agent {request.target} not found")
-        
+        if not hasattr(agent, 'handle_request') and not hasattr(agent, 'api_url'):
+            raise MCPError(f"Agent {request.target} not compatible")
+
         try:
-            if hasattr(agent, 'handle_request'):
-                # Agente local
-                result = await agent.handle_request(request)
-            elif hasattr(agent, 'api_url'):
-                # Agente externo (API)
-                result = await self._send_external_request(agent, request)
+            if hasattr(agent, 'remote_address'):
+                # Agente en otro nodo
+                call = self._send_remote_request(agent, request)
+            elif hasattr(agent, 'execute_with_semaphore'):
+                # Agente local: respeta max_concurrent_requests y cuenta la carga
+                call = agent.execute_with_semaphore(request)
+            elif hasattr(agent, 'handle_request'):
+                call = agent.handle_request(request)
             else:
-                raise MCPError(f"Agent {request.target} not compatible")
-            
-            response = Response(
-                sender=request.target,
-                target=request.sender,
-                request_id=request.id,
-                success=True,
-                result=result
-            )
-            self.messages_received += 1
-            return response
-            
+                # Agente externo (API)
+                call = self._send_external_request(agent, request)
+            result = await asyncio.wait_for(call, timeout=request.timeout)
         except asyncio.TimeoutError:
-            raise TimeoutError(f"Request to {request.target} timed out")
+            raise TimeoutError(f"Request to {request.target} timed out", timeout=request.timeout)
         except Exception as e:
-            response = Response(
-                sender=request.target,
-                target=request.sender,
-                request_id=request.id,
-                success=False,
-                error=str(e)
+            raise _AgentFailure(e) from e
+
+        response = Response(
+            sender=request.target,
+            target=request.sender,
+            request_id=request.id,
+            success=True,
+            result=result
+        )
+        self.messages_received += 1
+        return response
+
+    def _transport_for(self, agent: Any) -> TransportClient:
+        host, port = agent.remote_address
+        codec = self._codec_for(agent)
+        key = (host, port, codec.name)
+        client = self.transport_clients.get(key)
+        if client is None:
+            client = self.transport_clients[key] = TransportClient(
+                host, port, codec=codec, pending=self.pending_requests
             )
-            self.messages_received += 1
-            return response
-    
+        return client
+
+    async def _send_remote_request(self, agent: Any, request: Request) -> Any:
+        """Forward a request to an agent served by another node's AgentServer"""
+        client = self._transport_for(agent)
+        response = await client.call(request, target=getattr(agent, 'remote_agent_id', None))
+        if not response.success:
+            details = response.data or {}
+            raise MCPError(response.error or "Remote agent failed",
+                           details.get("error_code", "REMOTE_ERROR"), details.get("details"))
+        return response.result
+
     async def _send_external_request(self, agent: Any, request: Request) -> Any:
-        if not self.session:
+        if not self.running:
             await self.start()
 
         start = time.perf_counter()
         with tracer.start_as_current_span("protocol.send_external_request") as span:
             span.set_attribute("agent", request.target)
 
-            # Construir payload según el tipo de agente
-            if hasattr(agent, 'build_payload'):
-                payload = agent.build_payload(request)
-            else:
-                payload = {
-                    "action": request.action,
-                    "data": request.data
-                }
-
+            payload = self._payload_for(agent, request)
+            codec = self._codec_for(agent)
             headers = {}
             if hasattr(agent, 'api_key'):
                 headers['Authorization'] = f"Bearer {agent.api_key}"
             if hasattr(agent, 'headers'):
                 headers.update(agent.headers)
+            headers['Content-Type'] = codec.content_type
 
-            async with self.session.post(
-                agent.api_url,
-                json=payload,
-                headers=headers,
-                timeout=request.timeout
-            ) as response:
-                if response.status >= 400:
-                    raise MCPError(f"API error {response.status}: {await response.text()}")
+            async with self.pools.pool_for(agent.api_url).track() as session:
+                async with session.post(
+                    agent.api_url,
+                    data=codec.dumps(payload),
+                    headers=headers,
+                    timeout=request.timeout
+                ) as response:
+                    self._observe_rate_limit_headers(request.target, response)
+                    if response.status >= 400:
+                        raise self._api_error(response.status, await response.text(), response)
 
-                result = await response.json()
+                    result = await self._decode_body(codec, response)
 
         duration = time.perf_counter() - start
         _ext_req_counter.add(1, {"agent": request.target})
         _ext_req_duration.record(duration, {"agent": request.target})
         return result
+
+    @staticmethod
+    def _payload_for(agent: Any, request: Request) -> Any:
+        # Construir payload según el tipo de agente
+        if hasattr(agent, 'build_payload'):
+            return agent.build_payload(request)
+        return {
+            "action": request.action,
+            "data": request.data
+        }
+
+    def _codec_for(self, agent: Any) -> Codec:
+        codec = getattr(agent, 'codec', None)
+        return get_codec(codec) if isinstance(codec, (str, Codec)) else self.codec
+
+    @staticmethod
+    async def _decode_body(codec: Codec, response: Any) -> Any:
+        if codec.name == "json":
+            # aiohttp mantiene la comprobación de Content-Type
+            return await response.json(loads=codec.loads)
+        return codec.loads(await response.read())
     
-    async def broadcast_event(self, sender_id: str, event: str, data: Dict[str, Any] = None):
-        event_msg = Event(
+    async def stream_request(self, sender_id: str, target_id: str, action: str,
+                             data: Dict[str, Any] = None, timeout: int = 30,
+                             priority: Priority = Priority.NORMAL) -> ResponseStream:
+        """Send a request to a streaming-capable external agent.
+
+        The HTTP request is sent before this coroutine returns, so API errors
+        are raised here. Iterating the returned :class:`ResponseStream`
+        yields text deltas as the provider sends them; afterwards
+        ``stream.response`` holds the final :class:`AIResponse` with usage.
+        Streamed requests are not retried. The admission slot is held until
+        the stream ends.
+        """
+        if not self.running:
+            await self.start()
+
+        if current_policy().check(action, data, timeout):
+            if not await self.confirmation_hook(action, data or {}):
+                raise MCPError(f"Action '{action}' cancelled by user.")
+
+        agent = self.agents.get(target_id)
+        if not agent:
+            raise MCPError(f"Agent {target_id} not found")
+        if not (hasattr(agent, 'api_url') and hasattr(agent, 'parse_stream_event')):
+            raise MCPError(f"Agent {target_id} does not support streaming")
+
+        circuit_breaker = self.circuit_breakers.get(target_id)
+        if circuit_breaker and not circuit_breaker.should_allow_request():
+            raise CircuitBreakerError(f"Circuit breaker open for {target_id}")
+
+        rate_limiter = self.rate_limiters.get(target_id)
+        if rate_limiter:
+            try:
+                await rate_limiter.acquire(timeout=timeout)
+            except RateLimitError as e:
+                raise RateLimitError(
+                    f"Rate limit exceeded for {target_id}", **e.details
+                ) from e
+        release_slot = await self.admission.reserve(priority, timeout=timeout)
+
+        request = Request(
             sender=sender_id,
-            event=event,
-            data=data or {}
+            target=target_id,
+            action=action,
+            data=data or {},
+            timeout=timeout,
+            priority=priority
         )
-        
-        handlers = self.event_handlers.get(event, [])
-        for handler in handlers:
+        codec = self._codec_for(agent)
+        headers = {"Accept": "text/event-stream"}
+        if hasattr(agent, 'api_key'):
+            headers['Authorization'] = f"Bearer {agent.api_key}"
+        if hasattr(agent, 'headers'):
+            headers.update(agent.headers)
+        headers['Content-Type'] = codec.content_type
+
+        self.messages_sent += 1
+        pool = self.pools.pool_for(agent.api_url)
+        session = pool.acquire()
+        start = time.perf_counter()
+        try:
+            response = await session.post(
+                agent.api_url,
+                data=codec.dumps(agent.build_stream_payload(request)),
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=None, sock_read=request.timeout)
+            )
+            self._observe_rate_limit_headers(target_id, response)
+            if response.status >= 400:
+                text = await response.text()
+                response.release()
+                raise self._api_error(response.status, text, response)
+        except asyncio.TimeoutError:
+            pool.release()
+            release_slot()
+            if circuit_breaker:
+                circuit_breaker.record_failure()
+            raise TimeoutError(f"Request to {target_id} timed out")
+        except asyncio.CancelledError:
+            pool.release()
+            release_slot()
+            raise
+        except Exception:
+            pool.release()
+            release_slot()
+            if circuit_breaker:
+                circuit_breaker.record_failure()
+            raise
+
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                response.release()
+                pool.release()
+                release_slot()
+
+        async def deltas():
+            parser = SSEParser()
             try:
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(event_msg)
-                else:
-                    handler(event_msg)
+                async for chunk in response.content.iter_any():
+                    for event in parser.feed(chunk):
+                        delta = agent.parse_stream_event(event)
+                        if delta is not None:
+                            yield delta
+                for event in parser.flush():
+                    delta = agent.parse_stream_event(event)
+                    if delta is not None:
+                        yield delta
             except Exception:
-                continue
+                if circuit_breaker:
+                    circuit_breaker.record_failure()
+                raise
+            finally:
+                release()
+
+        def finalize(text: str, usage: Dict[str, Any], model: Optional[str]) -> AIResponse:
+            if circuit_breaker:
+                circuit_breaker.record_success()
+            self.messages_received += 1
+            duration = time.perf_counter() - start
+            _ext_req_counter.add(1, {"agent": target_id})
+            _ext_req_duration.record(duration, {"agent": target_id})
+
+            result = agent.build_stream_result(text, usage, model, request)
+            return AIResponse(
+                sender=target_id,
+                target=sender_id,
+                request_id=request.id,
+                success=True,
+                result=result,
+                execution_time=duration,
+                model_used=result.get("model", model),
+                tokens_used=result.get("tokens_used")
+            )
+
+        return ResponseStream(deltas(), finalize, started=start, release=release)
+
+    def _observe_rate_limit_headers(self, agent_id: str, response: Any):
+        """Feed upstream rate-limit headers and 429s back into the agent's limiter"""
+        rate_limiter = self.rate_limiters.get(agent_id)
+        headers = getattr(response, 'headers', None)
+        if not rate_limiter or not isinstance(headers, Mapping):
+            return
+        retry_after = rate_limiter.update_from_headers(headers)
+        if response.status == 429:
+            rate_limiter.on_rate_limited(retry_after)
+        elif response.status < 400:
+            rate_limiter.record_success()
+
+    def _api_error(self, status: int, text: str, response: Any) -> MCPError:
+        message = f"API error {status}: {text}"
+        if status == 429:
+            headers = getattr(response, 'headers', None)
+            retry_after = headers.get('retry-after') if isinstance(headers, Mapping) else None
+            delay = parse_retry_after(retry_after) if isinstance(retry_after, str) else None
+            return RateLimitError(message, reset_time=delay)
+        if status in (401, 403):
+            return AuthenticationError(message)
+        return APIError(message, status_code=status)
+
+    async def broadcast_event(self, sender_id: str, event: str, data: Dict[str, Any] = None,
+                              scope: str = "all", recipients: Optional[List[str]] = None) -> int:
+        """Publish ``event`` to its topic subscribers; returns how many were queued.
+
+        With ``recipients`` only subscriptions whose ``subscriber`` is listed
+        receive it; a ``scope`` other than ``"all"`` limits it to
+        subscriptions in that scope.
+        """
+        event_msg = Event(
+            sender=sender_id,
+            event=event,
+            data=data or {},
+            scope=scope,
+            recipients=recipients
+        )
+        return await self.events.publish(event, event_msg, scope, recipients)
     
     def get_stats(self) -> Dict[str, Any]:
         return {
@@ -316,10 +850,21 @@ class MCPProtocol:
             "rate_limits": {
                 agent_id: {
                     "tokens": rl.tokens,
-                    "limit": rl.requests_per_minute
+                    "limit": rl.requests_per_minute,
+                    "rate": rl.rate,
+                    "provider_limit": rl.provider_limit,
+                    "waiters": rl.waiters,
+                    "throttled": rl.throttled
                 }
                 for agent_id, rl in self.rate_limiters.items()
-            }
+            },
+            "coalescing": self.coalescer.get_stats(),
+            "retry_budget": self.retry_budget.get_stats(),
+            "admission": self.admission.get_stats(),
+            "cache": self.response_cache.get_stats(),
+            "connection_pools": self.pools.get_stats(),
+            "hedging": self.hedging.get_stats(),
+            "events": self.events.get_stats()
         }
 
 # Instancia global
@@ -0,0 +1,198 @@
+"""Adaptive token-bucket rate limiting for agents."""
+
+import asyncio
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Mapping, Optional
+
+from .exceptions import RateLimitError
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """Parse ``x-ratelimit-reset-*`` durations such as ``"6m0s"`` or ``"20ms"``"""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def parse_retry_after(value: str, now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` (seconds or HTTP date) or RFC 3339 reset time"""
+    seconds = parse_duration(value)
+    if seconds is not None:
+        return max(seconds, 0.0)
+
+    now = time.time() if now is None else now
+    for parse in (parsedate_to_datetime, lambda v: datetime.fromisoformat(v.replace("Z", "+00:00"))):
+        try:
+            moment = parse(value)
+        except (TypeError, ValueError, IndexError):
+            continue
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return max(moment.timestamp() - now, 0.0)
+    return None
+
+
+@dataclass
+class RateLimiter:
+    """Token bucket with FIFO waiters that adapts to upstream limits.
+
+    ``requests_per_minute`` is the configured ceiling. The effective
+    ``rate`` is lowered multiplicatively on ``429`` responses, capped by
+    the limit providers advertise in ``x-ratelimit-*`` headers, and raised
+    additively again on successful calls.
+    """
+    requests_per_minute: int = 50
+    tokens: float = 50
+    last_refill: float = field(default_factory=time.time)
+    min_requests_per_minute: float = 1.0
+    backoff_factor: float = 0.5
+    recovery_step: float = 0.01
+
+    rate: float = field(init=False)
+    provider_limit: Optional[float] = field(init=False, default=None)
+    blocked_until: float = field(init=False, default=0.0)
+    throttled: int = field(init=False, default=0)
+    _waiters: Deque[asyncio.Future] = field(init=False, default_factory=deque, repr=False)
+
+    def __post_init__(self):
+        self.rate = float(self.requests_per_minute)
+
+    @property
+    def ceiling(self) -> float:
+        if self.provider_limit is None:
+            return float(self.requests_per_minute)
+        return min(float(self.requests_per_minute), self.provider_limit)
+
+    def _refill(self, now: float):
+        time_passed = max(now - self.last_refill, 0.0)
+        self.tokens = min(self.rate, self.tokens + (time_passed * self.rate / 60))
+        self.last_refill = now
+
+    def _time_until_token(self, now: float) -> float:
+        self._refill(now)
+        wait = max(self.blocked_until - now, 0.0)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) * 60 / self.rate)
+        return wait
+
+    def _try_take(self, now: float) -> float:
+        """Take a token if one is available; otherwise seconds until the next"""
+        wait = self._time_until_token(now)
+        if wait <= 0:
+            self.tokens -= 1
+        return wait
+
+    def can_proceed(self) -> bool:
+        return self._try_take(time.time()) <= 0
+
+    async def acquire(self, timeout: Optional[float] = None):
+        """Wait for a token, serving waiters in FIFO order.
+
+        Raises :class:`RateLimitError` straight away when the wait would
+        exceed ``timeout``, or when ``timeout`` elapses while queued.
+        """
+        if not self._waiters and self.can_proceed():
+            return
+
+        now = time.time()
+        expected = self._time_until_token(now) + len(self._waiters) * 60 / self.rate
+        if timeout is not None and expected > timeout:
+            raise RateLimitError(
+                f"Rate limit exceeded: next slot in {expected:.2f}s",
+                limit=int(self.rate),
+                reset_time=int(expected),
+            )
+
+        deadline = None if timeout is None else now + timeout
+        ticket = asyncio.get_running_loop().create_future()
+        self._waiters.append(ticket)
+        try:
+            if self._waiters[0] is not ticket:
+                await asyncio.wait_for(ticket, None if deadline is None else deadline - time.time())
+            while True:
+                now = time.time()
+                wait = self._try_take(now)
+                if wait <= 0:
+                    return
+                if deadline is not None and now + wait > deadline:
+                    raise RateLimitError("Rate limit exceeded while waiting", limit=int(self.rate))
+                await asyncio.sleep(wait)
+        except asyncio.TimeoutError:
+            raise RateLimitError("Rate limit exceeded while waiting", limit=int(self.rate))
+        finally:
+            was_head = self._waiters[0] is ticket
+            self._waiters.remove(ticket)
+            if was_head and self._waiters and not self._waiters[0].done():
+                self._waiters[0].set_result(None)
+
+    def record_success(self):
+        """Additively recover the rate after a successful upstream call"""
+        ceiling = self.ceiling
+        if self.rate < ceiling:
+            self.rate = min(ceiling, self.rate + max(1.0, ceiling * self.recovery_step))
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        """Back off after an upstream ``429``"""
+        self.throttled += 1
+        self._refill(time.time())
+        self.rate = max(self.min_requests_per_minute, self.rate * self.backoff_factor)
+        self.tokens = min(self.tokens, 0.0)
+        if retry_after is not None:
+            self.blocked_until = max(self.blocked_until, time.time() + retry_after)
+
+    def update_from_headers(self, headers: Mapping[str, Any]) -> Optional[float]:
+        """Adjust to ``x-ratelimit-*``/``anthropic-ratelimit-*``/``retry-after`` headers.
+
+        Returns the ``retry-after`` delay in seconds when one was sent.
+        """
+        lowered = {k.lower(): v for k, v in headers.items()}
+        now = time.time()
+
+        limit = lowered.get("x-ratelimit-limit-requests") or lowered.get("anthropic-ratelimit-requests-limit")
+        if limit is not None:
+            try:
+                self.provider_limit = max(float(limit), self.min_requests_per_minute)
+            except ValueError:
+                pass
+            self.rate = min(self.rate, self.ceiling)
+
+        remaining = lowered.get("x-ratelimit-remaining-requests") or lowered.get("anthropic-ratelimit-requests-remaining")
+        reset = lowered.get("x-ratelimit-reset-requests") or lowered.get("anthropic-ratelimit-requests-reset")
+        if remaining is not None:
+            try:
+                remaining_value = float(remaining)
+            except ValueError:
+                remaining_value = None
+            if remaining_value is not None:
+                self._refill(now)
+                self.tokens = min(self.tokens, remaining_value)
+                if remaining_value < 1 and reset is not None:
+                    delay = parse_retry_after(reset, now)
+                    if delay is not None:
+                        self.blocked_until = max(self.blocked_until, now + delay)
+
+        retry_after = lowered.get("retry-after")
+        if retry_after is not None:
+            delay = parse_retry_after(retry_after, now)
+            if delay is not None:
+                self.blocked_until = max(self.blocked_until, now + delay)
+            return delay
+        return None
+
+    @property
+    def waiters(self) -> int:
+        return len(self._waiters)
@@ -0,0 +1,155 @@
+"""Retry policies and process-wide retry budgets."""
+
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Tuple, Type
+
+import aiohttp
+
+from .exceptions import (
+    APIError, AgentNotFoundError, AuthenticationError, CircuitBreakerError,
+    ConfigurationError, RateLimitError, SerializationError, TimeoutError,
+    ValidationError
+)
+
+JITTER_MODES = ("none", "full", "equal", "decorrelated")
+
+# Status HTTP que indican un fallo transitorio del proveedor
+RETRYABLE_STATUS = frozenset({408, 409, 425, 429, 500, 502, 503, 504, 529})
+
+
+@dataclass
+class RetryPolicy:
+    """Backoff schedule and retry decision for :meth:`MCPProtocol.send_request`.
+
+    ``jitter`` is one of ``"none"``, ``"full"``, ``"equal"`` or
+    ``"decorrelated"``. Errors listed in ``no_retry_on`` (authentication,
+    validation, ...) fail immediately; others are retried when they match
+    ``retry_on``. ``APIError`` is retried only for transient status codes.
+    A ``Retry-After`` carried by the error overrides the computed delay, and
+    the request gives up if it is longer than ``max_retry_after``.
+    Subclass and override :meth:`should_retry` / :meth:`compute_delay` for
+    custom behaviour.
+    """
+    max_attempts: int = 3
+    initial_delay: float = 1.0
+    max_delay: float = 30.0
+    exponential_base: float = 2.0
+    jitter: str = "full"
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+    no_retry_on: Tuple[Type[BaseException], ...] = (
+        AuthenticationError, ValidationError, ConfigurationError,
+        SerializationError, AgentNotFoundError, CircuitBreakerError,
+    )
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+    use_budget: bool = True
+
+    def __post_init__(self):
+        if self.jitter not in JITTER_MODES:
+            raise ValueError(f"Unknown jitter mode {self.jitter!r}, expected one of {JITTER_MODES}")
+
+    def should_retry(self, error: BaseException) -> bool:
+        if isinstance(error, self.no_retry_on):
+            return False
+        if isinstance(error, RateLimitError):
+            return True
+        if isinstance(error, APIError):
+            status = error.details.get("status_code")
+            return status is None or status in RETRYABLE_STATUS or status >= 500
+        if isinstance(error, (TimeoutError, asyncio.TimeoutError, aiohttp.ClientConnectionError)):
+            return True
+        return isinstance(error, self.retry_on)
+
+    def compute_delay(self, attempt: int, previous_delay: float) -> float:
+        """Delay before retry number ``attempt + 1`` (``attempt`` starts at 0)"""
+        ceiling = min(self.initial_delay * (self.exponential_base ** attempt), self.max_delay)
+        if self.jitter == "full":
+            return random.uniform(0, ceiling)
+        if self.jitter == "equal":
+            return ceiling / 2 + random.uniform(0, ceiling / 2)
+        if self.jitter == "decorrelated":
+            upper = max(previous_delay, self.initial_delay) * 3
+            return min(self.max_delay, random.uniform(self.initial_delay, upper))
+        return ceiling
+
+    def next_delay(self, attempt: int, previous_delay: float, error: BaseException) -> Optional[float]:
+        """Delay before the next attempt, or None if ``error`` must not be retried"""
+        if attempt + 1 >= self.max_attempts or not self.should_retry(error):
+            return None
+        delay = self.compute_delay(attempt, previous_delay)
+        retry_after = retry_after_of(error) if self.respect_retry_after else None
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+
+def retry_after_of(error: BaseException) -> Optional[float]:
+    """``Retry-After`` seconds carried by an :class:`MCPError`, if any"""
+    details = getattr(error, "details", None) or {}
+    value = details.get("retry_after", details.get("reset_time")) if isinstance(details, dict) else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryBudget:
+    """Cap retries to a fraction of recent requests.
+
+    Over a sliding ``window`` (seconds), retries are allowed while
+    ``retries < min_retries_per_second * window + ratio * requests``, so a
+    provider outage cannot multiply traffic by ``max_attempts``.
+    """
+    ratio: float = 0.2
+    min_retries_per_second: float = 1.0
+    window: float = 10.0
+
+    _buckets: Deque[list] = field(default_factory=deque, init=False, repr=False)
+    _requests: int = field(default=0, init=False)
+    _retries: int = field(default=0, init=False)
+    exhausted: int = field(default=0, init=False)
+
+    def _bucket(self, now: float) -> list:
+        second = int(now)
+        while self._buckets and self._buckets[0][0] <= second - self.window:
+            _, requests, retries = self._buckets.popleft()
+            self._requests -= requests
+            self._retries -= retries
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0])
+        return self._buckets[-1]
+
+    def record_request(self):
+        self._bucket(time.time())[1] += 1
+        self._requests += 1
+
+    def try_retry(self) -> bool:
+        """Withdraw one retry from the budget; False if it is exhausted"""
+        bucket = self._bucket(time.time())
+        allowed = self.min_retries_per_second * self.window + self.ratio * self._requests
+        if self._retries + 1 > allowed:
+            self.exhausted += 1
+            return False
+        bucket[2] += 1
+        self._retries += 1
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._bucket(time.time())
+        return {
+            "requests": self._requests,
+            "retries": self._retries,
+            "ratio": self.ratio,
+            "exhausted": self.exhausted,
+        }
+
+
+# Presupuesto compartido por todos los protocolos del proceso
+default_retry_budget = RetryBudget()
@@ -0,0 +1,518 @@
+"""Multi-process MCP runtime with shared rate-limit and circuit state.
+
+:class:`ShardedRuntime` starts N worker processes, each with its own event
+loop and :class:`MCPProtocol`, and dispatches requests to them either
+round-robin (``shard_by="request"``) or by a stable hash of the target
+agent (``shard_by="agent"``). Every worker registers its agents through a
+picklable ``setup(protocol, worker_index)`` callable.
+
+Token buckets and circuit breakers of the agents listed in
+:class:`SharedState` live in shared memory, so a provider limit of 500
+requests per minute holds for the whole runtime rather than per worker.
+Pipe reads and writes run in a reader and a writer thread per pipe end,
+so large payloads never block the event loops on a full pipe buffer.
+"""
+
+import asyncio
+import functools
+import itertools
+import math
+import multiprocessing
+import pickle
+import queue
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple,
+    Union
+)
+
+from .config import get_config
+from .exceptions import MCPError
+from .messages import Priority, Response
+from .protocol import CircuitBreaker, CircuitState, MCPProtocol, iter_windowed
+from .ratelimit import RateLimiter
+
+# Campos por agente en la memoria compartida
+_RL_FIELDS = ("tokens", "last_refill", "rate", "provider_limit", "blocked_until", "throttled")
+_CB_FIELDS = ("state", "failure_count", "last_failure_time")
+_FIELDS = _RL_FIELDS + _CB_FIELDS
+_CB_STATES = list(CircuitState)
+_EPOCH = datetime(1970, 1, 1)
+
+SetupFn = Callable[[MCPProtocol, int], Any]
+
+
+class SharedState:
+    """Shared-memory table of per-agent limiter and breaker state.
+
+    Create it in the parent before starting workers. ``agents`` maps agent
+    ids to their ``register_agent`` options (``rate_limit``,
+    ``failure_threshold``, ``recovery_timeout``).
+    """
+
+    def __init__(self, agents: Dict[str, Dict[str, Any]], mp_context: Any = None):
+        ctx = mp_context or multiprocessing.get_context()
+        self.slots = {agent_id: i for i, agent_id in enumerate(agents)}
+        self.options = {agent_id: dict(options) for agent_id, options in agents.items()}
+        self.lock = ctx.RLock()
+        self.values = ctx.RawArray("d", len(self.slots) * len(_FIELDS))
+        now = time.time()
+        for agent_id, options in self.options.items():
+            rate = float(options.get("rate_limit", 50))
+            self._write(agent_id, {
+                "tokens": min(float(RateLimiter.tokens), rate), "last_refill": now, "rate": rate, "provider_limit": math.nan,
+                "blocked_until": 0.0, "throttled": 0.0,
+                "state": 0.0, "failure_count": 0.0, "last_failure_time": math.nan,
+            })
+
+    def _offset(self, agent_id: str) -> int:
+        return self.slots[agent_id] * len(_FIELDS)
+
+    def _read(self, agent_id: str) -> Dict[str, float]:
+        base = self._offset(agent_id)
+        return {name: self.values[base + i] for i, name in enumerate(_FIELDS)}
+
+    def _write(self, agent_id: str, fields: Dict[str, float]):
+        base = self._offset(agent_id)
+        for i, name in enumerate(_FIELDS):
+            if name in fields:
+                self.values[base + i] = fields[name]
+
+    def rate_limiter(self, agent_id: str) -> "SharedRateLimiter":
+        return SharedRateLimiter(self, agent_id)
+
+    def circuit_breaker(self, agent_id: str) -> "SharedCircuitBreaker":
+        return SharedCircuitBreaker(self, agent_id)
+
+    def attach(self, protocol: MCPProtocol):
+        """Swap the protocol's limiters and breakers for the shared ones"""
+        for agent_id in self.slots:
+            if agent_id in protocol.agents:
+                protocol.rate_limiters[agent_id] = self.rate_limiter(agent_id)
+                protocol.circuit_breakers[agent_id] = self.circuit_breaker(agent_id)
+
+    def snapshot(self, agent_id: str) -> Dict[str, Any]:
+        with self.lock:
+            fields = self._read(agent_id)
+        return {
+            "tokens": fields["tokens"],
+            "rate": fields["rate"],
+            "throttled": int(fields["throttled"]),
+            "circuit_state": _CB_STATES[int(fields["state"])].value,
+            "failure_count": int(fields["failure_count"]),
+        }
+
+
+class _Synced(ABC):
+    """Load shared fields before an operation and store them after it"""
+    _shared: SharedState
+    _agent_id: str
+    _depth: int
+
+    @contextmanager
+    def _synced(self) -> Iterator[None]:
+        with self._shared.lock:
+            outer = self._depth == 0
+            if outer:
+                self._load(self._shared._read(self._agent_id))
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if outer:
+                    self._shared._write(self._agent_id, self._dump())
+
+    @abstractmethod
+    def _load(self, fields: Dict[str, float]):
+        ...
+
+    @abstractmethod
+    def _dump(self) -> Dict[str, float]:
+        ...
+
+
+class SharedRateLimiter(_Synced, RateLimiter):
+    """:class:`RateLimiter` whose bucket lives in :class:`SharedState`.
+
+    FIFO waiting stays per process; token accounting and adaptive rate
+    changes are atomic across all workers.
+    """
+
+    def __init__(self, shared: SharedState, agent_id: str):
+        self._shared = shared
+        self._agent_id = agent_id
+        self._depth = 0
+        rpm = shared.options[agent_id].get("rate_limit", 50)
+        RateLimiter.__init__(self, requests_per_minute=rpm, tokens=rpm)
+
+    def _load(self, fields: Dict[str, float]):
+        self.tokens = fields["tokens"]
+        self.last_refill = fields["last_refill"]
+        self.rate = fields["rate"]
+        self.provider_limit = None if math.isnan(fields["provider_limit"]) else fields["provider_limit"]
+        self.blocked_until = fields["blocked_until"]
+        self.throttled = int(fields["throttled"])
+
+    def _dump(self) -> Dict[str, float]:
+        return {
+            "tokens": self.tokens,
+            "last_refill": self.last_refill,
+            "rate": self.rate,
+            "provider_limit": math.nan if self.provider_limit is None else self.provider_limit,
+            "blocked_until": self.blocked_until,
+            "throttled": float(self.throttled),
+        }
+
+    def _time_until_token(self, now: float) -> float:
+        with self._synced():
+            return RateLimiter._time_until_token(self, now)
+
+    def _try_take(self, now: float) -> float:
+        with self._synced():
+            return RateLimiter._try_take(self, now)
+
+    def record_success(self):
+        with self._synced():
+            RateLimiter.record_success(self)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        with self._synced():
+            RateLimiter.on_rate_limited(self, retry_after)
+
+    def update_from_headers(self, headers):
+        with self._synced():
+            return RateLimiter.update_from_headers(self, headers)
+
+
+class SharedCircuitBreaker(_Synced, CircuitBreaker):
+    """:class:`CircuitBreaker` whose state lives in :class:`SharedState`"""
+
+    def __init__(self, shared: SharedState, agent_id: str):
+        self._shared = shared
+        self._agent_id = agent_id
+        self._depth = 0
+        options = shared.options[agent_id]
+        CircuitBreaker.__init__(
+            self,
+            failure_threshold=options.get("failure_threshold", 5),
+            recovery_timeout=options.get("recovery_timeout", 60),
+        )
+
+    def _load(self, fields: Dict[str, float]):
+        self.state = _CB_STATES[int(fields["state"])]
+        self.failure_count = int(fields["failure_count"])
+        last = fields["last_failure_time"]
+        self.last_failure_time = None if math.isnan(last) else _EPOCH + timedelta(seconds=last)
+
+    def _dump(self) -> Dict[str, float]:
+        last = self.last_failure_time
+        return {
+            "state": float(_CB_STATES.index(self.state)),
+            "failure_count": float(self.failure_count),
+            "last_failure_time": math.nan if last is None else (last - _EPOCH).total_seconds(),
+        }
+
+    def should_allow_request(self) -> bool:
+        with self._synced():
+            return CircuitBreaker.should_allow_request(self)
+
+    @property
+    def is_open(self) -> bool:
+        with self._synced():
+            return CircuitBreaker.is_open.fget(self)
+
+    def record_success(self):
+        with self._synced():
+            CircuitBreaker.record_success(self)
+
+    def record_failure(self):
+        with self._synced():
+            CircuitBreaker.record_failure(self)
+
+
+class _Channel:
+    """One pipe end served by a reader and a writer thread.
+
+    ``send`` only queues the message; ``on_message`` is called on ``loop``
+    for every message received, and with ``None`` once the pipe is closed.
+    """
+
+    _CLOSE = object()
+
+    def __init__(self, conn: Any, loop: asyncio.AbstractEventLoop,
+                 on_message: Callable[[Any], None], name: str):
+        self.conn = conn
+        self._outbox: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write, name=f"{name}-writer", daemon=True)
+        self._reader = threading.Thread(
+            target=self._read, args=(loop, on_message), name=f"{name}-reader", daemon=True
+        )
+        self._writer.start()
+        self._reader.start()
+
+    def send(self, message: Any):
+        self._outbox.put(message)
+
+    def _write(self):
+        while True:
+            message = self._outbox.get()
+            if message is self._CLOSE:
+                return
+            try:
+                self.conn.send(message)
+            except (BrokenPipeError, OSError):
+                return
+
+    def _read(self, loop: asyncio.AbstractEventLoop, on_message: Callable[[Any], None]):
+        while True:
+            try:
+                message = self.conn.recv()
+            except (EOFError, OSError):
+                message = None
+            try:
+                loop.call_soon_threadsafe(on_message, message)
+            except RuntimeError:
+                return  # el loop ya se cerró
+            if message is None:
+                return
+
+    async def close(self, timeout: float = 5):
+        """Flush pending writes, then close the pipe"""
+        self._outbox.put(self._CLOSE)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._writer.join, timeout)
+        self.conn.close()
+
+
+def _encode(index: int, ok: bool, value: Any) -> Tuple[bool, bytes]:
+    """Pickle a reply so that the parent is sure to be able to load it"""
+    try:
+        payload = pickle.dumps(value)
+        pickle.loads(payload)
+        return ok, payload
+    except Exception as e:
+        if isinstance(value, BaseException):
+            # Excepciones que no se reconstruyen: se envía tipo y mensaje
+            error = MCPError(f"{type(value).__name__}: {value}")
+        else:
+            error = MCPError(f"Cannot send result from worker {index}: {e}")
+        return False, pickle.dumps(error)
+
+
+def _worker_main(index: int, setup: SetupFn, shared: Optional[SharedState], conn: Any,
+                 protocol_options: Dict[str, Any]):
+    asyncio.run(_serve(index, setup, shared, conn, protocol_options))
+
+
+async def _serve(index: int, setup: SetupFn, shared: Optional[SharedState], conn: Any,
+                 protocol_options: Dict[str, Any]):
+    loop = asyncio.get_running_loop()
+    protocol = MCPProtocol(**protocol_options)
+    result = setup(protocol, index)
+    if asyncio.iscoroutine(result):
+        await result
+    if shared is not None:
+        shared.attach(protocol)
+    await protocol.start()
+
+    closed = loop.create_future()
+    tasks = set()
+
+    async def handle(call_id: int, payload: bytes):
+        try:
+            args, kwargs = pickle.loads(payload)
+            ok, value = True, await protocol.send_request(*args, **kwargs)
+        except Exception as e:
+            ok, value = False, e
+        channel.send((call_id, *_encode(index, ok, value)))
+
+    def on_message(message: Any):
+        if message is None:
+            if not closed.done():
+                closed.set_result(None)
+            return
+        task = loop.create_task(handle(*message))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    channel = _Channel(conn, loop, on_message, f"mcpturbo-shard-{index}")
+    channel.send(("ready", index))
+    await closed
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    await protocol.stop()
+    await channel.close()
+
+
+class ShardedRuntime:
+    """Run ``workers`` protocol processes and dispatch requests to them"""
+
+    def __init__(self, workers: int, setup: SetupFn, shared: Optional[SharedState] = None,
+                 shard_by: str = "request", mp_context: Any = None,
+                 protocol_options: Optional[Dict[str, Any]] = None):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if shard_by not in ("request", "agent"):
+            raise ValueError(f"Unknown shard_by {shard_by!r}, expected 'request' or 'agent'")
+        self.workers = workers
+        self.setup = setup
+        self.shared = shared
+        self.shard_by = shard_by
+        self.protocol_options = protocol_options or {}
+        self._ctx = mp_context or multiprocessing.get_context()
+        self._processes: List[Any] = []
+        self._channels: List[_Channel] = []
+        self._pending: Dict[int, Tuple[int, asyncio.Future]] = {}
+        self._outstanding: List[int] = []
+        self._call_ids = itertools.count()
+        self._next = itertools.cycle(range(workers))
+        self.running = False
+
+    async def start(self):
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        ready = []
+        for index in range(self.workers):
+            parent_conn, child_conn = self._ctx.Pipe()
+            process = self._ctx.Process(
+                target=_worker_main,
+                args=(index, self.setup, self.shared, child_conn, self.protocol_options),
+                name=f"mcpturbo-shard-{index}",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._processes.append(process)
+            self._outstanding.append(0)
+            started = loop.create_future()
+            ready.append(started)
+            self._channels.append(_Channel(
+                parent_conn, loop, functools.partial(self._on_reply, index, started), process.name
+            ))
+        self.running = True
+        await asyncio.gather(*ready)
+
+    def _on_reply(self, index: int, started: asyncio.Future, message: Any):
+        if message is None:
+            self._fail_worker(index)
+            if not started.done():
+                started.set_exception(MCPError(f"Shard worker {index} exited during startup"))
+            return
+        if message[0] == "ready":
+            if not started.done():
+                started.set_result(None)
+            return
+        call_id, ok, payload = message
+        self._outstanding[index] -= 1
+        _, future = self._pending.pop(call_id, (index, None))
+        if future is None or future.done():
+            return
+        try:
+            value = pickle.loads(payload)
+        except Exception as e:
+            future.set_exception(MCPError(f"Cannot decode reply from worker {index}: {e}"))
+            return
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+    def _fail_worker(self, index: int):
+        error = MCPError(f"Shard worker {index} exited")
+        for call_id, (worker, future) in list(self._pending.items()):
+            if worker == index:
+                del self._pending[call_id]
+                if not future.done():
+                    future.set_exception(error)
+
+    def worker_for(self, target_id: str) -> int:
+        if self.shard_by == "agent":
+            return zlib.crc32(target_id.encode()) % self.workers
+        return next(self._next)
+
+    async def send_request(self, sender_id: str, target_id: str, action: str,
+                           data: Dict[str, Any] = None, timeout: int = 30,
+                           priority: Priority = Priority.NORMAL, **kwargs) -> Response:
+        if not self.running:
+            await self.start()
+        index = self.worker_for(target_id)
+        call_id = next(self._call_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[call_id] = (index, future)
+        self._outstanding[index] += 1
+        kwargs.update(data=data, timeout=timeout, priority=priority)
+        try:
+            payload = pickle.dumps(((sender_id, target_id, action), kwargs))
+        except Exception:
+            self._pending.pop(call_id, None)
+            self._outstanding[index] -= 1
+            raise
+        self._channels[index].send((call_id, payload))
+        return await future
+
+    async def send_batch(self, target_id: str, action: str,
+                         items: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+                         sender_id: str = "batch", concurrency: Optional[int] = None,
+                         return_exceptions: bool = False, **kwargs) -> List[Any]:
+        """Send one request per item and return the results in input order.
+
+        Like :meth:`MCPProtocol.send_batch`, at most ``concurrency`` requests
+        are in flight (default ``max_concurrent_requests`` per worker).
+        """
+        results: List[Any] = []
+        async for index, result in self.iter_batch(
+            target_id, action, items, sender_id=sender_id, concurrency=concurrency,
+            return_exceptions=return_exceptions, **kwargs
+        ):
+            if index >= len(results):
+                results.extend([None] * (index + 1 - len(results)))
+            results[index] = result
+        return results
+
+    def iter_batch(self, target_id: str, action: str,
+                   items: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+                   sender_id: str = "batch", concurrency: Optional[int] = None,
+                   return_exceptions: bool = False, **kwargs) -> AsyncIterator[Tuple[int, Any]]:
+        """Like :meth:`send_batch` but yield ``(index, result)`` in completion order"""
+        limit = concurrency or get_config().max_concurrent_requests * self.workers
+        send = lambda data: self.send_request(sender_id, target_id, action, data=data, **kwargs)
+        return iter_windowed(send, items, limit, return_exceptions)
+
+    async def stop(self, timeout: float = 10):
+        if not self.running:
+            return
+        loop = asyncio.get_running_loop()
+        for channel in self._channels:
+            channel.send(None)
+        # Los workers terminan lo que tienen en curso; las respuestas siguen llegando
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            await loop.run_in_executor(None, process.join, max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                process.terminate()
+        for channel in self._channels:
+            await channel.close()
+        for index in range(len(self._channels)):
+            self._fail_worker(index)
+        self._processes.clear()
+        self._channels.clear()
+        self._outstanding.clear()
+        self.running = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            "workers": self.workers,
+            "shard_by": self.shard_by,
+            "alive": sum(p.is_alive() for p in self._processes),
+            "outstanding": list(self._outstanding),
+        }
+        if self.shared is not None:
+            stats["shared"] = {agent_id: self.shared.snapshot(agent_id) for agent_id in self.shared.slots}
+        return stats
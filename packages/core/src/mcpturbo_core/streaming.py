@@ -0,0 +1,157 @@
+"""Server-sent events parsing and streamed responses for external agents."""
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from .messages import AIResponse
+
+
+@dataclass
+class SSEEvent:
+    data: str
+    event: str = "message"
+    id: Optional[str] = None
+
+    def json(self) -> Any:
+        return json.loads(self.data)
+
+
+@dataclass
+class StreamDelta:
+    """Incremental piece of a streamed completion, as parsed by an adapter"""
+    text: str = ""
+    usage: Optional[Dict[str, Any]] = None
+    model: Optional[str] = None
+    done: bool = False
+
+
+class SSEParser:
+    """Incremental ``text/event-stream`` parser.
+
+    Bytes can be fed in arbitrary chunks; complete events are returned as
+    soon as their terminating blank line arrives.
+    """
+
+    def __init__(self):
+        self._buffer = b""
+        self._data: List[str] = []
+        self._event = ""
+        self._id: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        self._buffer += chunk
+        events = []
+        while True:
+            newline = self._buffer.find(b"\n")
+            if newline < 0:
+                break
+            line = self._buffer[:newline].rstrip(b"\r").decode("utf-8")
+            self._buffer = self._buffer[newline + 1:]
+            event = self._process_line(line)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def flush(self) -> List[SSEEvent]:
+        """Return the pending event if the stream ended without a blank line"""
+        events = self.feed(b"\n") if self._buffer else []
+        event = self._process_line("")
+        if event is not None:
+            events.append(event)
+        return events
+
+    def _process_line(self, line: str) -> Optional[SSEEvent]:
+        if not line:
+            if not self._data:
+                self._event = ""
+                return None
+            event = SSEEvent(data="\n".join(self._data), event=self._event or "message", id=self._id)
+            self._data = []
+            self._event = ""
+            return event
+        if line.startswith(":"):
+            return None
+
+        name, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if name == "data":
+            self._data.append(value)
+        elif name == "event":
+            self._event = value
+        elif name == "id":
+            self._id = value
+        return None
+
+
+class ResponseStream:
+    """Async iterator over the text deltas of a streamed completion.
+
+    Once iteration finishes, :attr:`response` holds the final
+    :class:`AIResponse` built from the accumulated text and the usage
+    reported by the provider. ``started`` is the ``time.perf_counter()``
+    value taken before the request was sent, so :attr:`time_to_first_token`
+    includes sending it and waiting for the headers. ``release`` frees what
+    the request holds (connection, admission slot); it runs on
+    :meth:`aclose` even if the stream was never iterated, and only once.
+    """
+
+    def __init__(self, deltas: AsyncIterator[StreamDelta],
+                 finalize: Callable[[str, Dict[str, Any], Optional[str]], AIResponse],
+                 started: Optional[float] = None,
+                 release: Optional[Callable[[], None]] = None):
+        self._deltas = deltas
+        self._finalize = finalize
+        self._started = time.perf_counter() if started is None else started
+        self._release = release
+        self.response: Optional[AIResponse] = None
+        self.time_to_first_token: Optional[float] = None
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[str]:
+        parts: List[str] = []
+        usage: Dict[str, Any] = {}
+        model: Optional[str] = None
+        try:
+            async for delta in self._deltas:
+                if delta.usage:
+                    usage.update(delta.usage)
+                if delta.model:
+                    model = delta.model
+                if delta.text:
+                    if self.time_to_first_token is None:
+                        self.time_to_first_token = time.perf_counter() - self._started
+                    parts.append(delta.text)
+                    yield delta.text
+                if delta.done:
+                    break
+        finally:
+            await self.aclose()
+        self.response = self._finalize("".join(parts), usage, model)
+
+    async def collect(self) -> AIResponse:
+        """Consume the remaining stream and return the final response"""
+        async for _ in self:
+            pass
+        return self.response
+
+    async def aclose(self):
+        try:
+            aclose = getattr(self._deltas, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        finally:
+            # Un generador que nunca arrancó no ejecuta su finally
+            release, self._release = self._release, None
+            if release is not None:
+                release()
+
+    async def __aenter__(self) -> "ResponseStream":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -0,0 +1,268 @@
+"""TCP transport for serving agents to other MCPturbo nodes.
+
+Frames are a 4-byte big-endian length followed by a payload encoded with
+a codec from :mod:`mcpturbo_core.codecs`. The first frame on a connection
+is a JSON ``hello`` naming the codec for the rest of the connection.
+
+:class:`AgentServer` exposes an agent registry (anything with ``get`` and
+``list_agents``, or a plain mapping). :class:`TransportClient` keeps one
+persistent connection per node. Many requests share that connection, and
+responses are matched to waiting callers by request id.
+"""
+
+import asyncio
+import struct
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Tuple
+
+from .codecs import Codec, get_codec
+from .exceptions import AgentNotFoundError, MCPError, SerializationError, TimeoutError
+from .messages import Message, Request, Response
+
+_HEADER = struct.Struct(">I")
+DEFAULT_MAX_FRAME = 64 * 1024 * 1024
+PROTOCOL_VERSION = 1
+
+
+async def read_frame(reader: asyncio.StreamReader, codec: Codec,
+                     max_size: int = DEFAULT_MAX_FRAME) -> Any:
+    header = await reader.readexactly(_HEADER.size)
+    (size,) = _HEADER.unpack(header)
+    if size > max_size:
+        raise SerializationError(f"Frame of {size} bytes exceeds limit of {max_size}", data_type="frame")
+    return codec.loads(await reader.readexactly(size))
+
+
+def encode_frame(codec: Codec, value: Any) -> bytes:
+    payload = codec.dumps(value)
+    return _HEADER.pack(len(payload)) + payload
+
+
+def _error_response(request: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    code = getattr(error, "error_code", type(error).__name__)
+    return Response(
+        sender=request.get("target", ""),
+        target=request.get("sender", ""),
+        request_id=request.get("id", ""),
+        success=False,
+        error=str(error),
+        data={"error_code": code, "details": getattr(error, "details", {})},
+    ).to_dict()
+
+
+class AgentServer:
+    """Serve the agents of a registry over length-prefixed TCP frames"""
+
+    def __init__(self, registry: Any, host: str = "127.0.0.1", port: int = 0,
+                 max_frame: int = DEFAULT_MAX_FRAME):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.max_frame = max_frame
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+        self.requests_served = 0
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        if self._server is None:
+            return self.host, self.port
+        return self._server.sockets[0].getsockname()[:2]
+
+    def _get_agent(self, agent_id: str) -> Any:
+        return self.registry.get(agent_id)
+
+    def _list_agents(self) -> List[str]:
+        if isinstance(self.registry, Mapping):
+            return list(self.registry)
+        return list(self.registry.list_agents())
+
+    async def start(self):
+        if self._server is None:
+            self._server = await asyncio.start_server(self._on_connection, self.host, self.port)
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "AgentServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _on_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(writer)
+        tasks = set()
+        try:
+            hello = await read_frame(reader, get_codec("json"), self.max_frame)
+            codec = get_codec(hello.get("codec"))
+            writer.write(encode_frame(get_codec("json"), {
+                "op": "hello", "version": PROTOCOL_VERSION, "agents": self._list_agents()
+            }))
+            while True:
+                frame = await read_frame(reader, codec, self.max_frame)
+                if frame.get("op") == "list":
+                    writer.write(encode_frame(codec, {"op": "agents", "agents": self._list_agents()}))
+                    continue
+                # Multiplexado: cada petición en su propia tarea
+                task = asyncio.ensure_future(self._serve(frame.get("message") or {}, codec, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except SerializationError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _serve(self, message: Dict[str, Any], codec: Codec, writer: asyncio.StreamWriter):
+        try:
+            request = Message.from_dict(message)
+            agent = self._get_agent(request.target)
+            if agent is None:
+                raise AgentNotFoundError(request.target)
+            call = agent.execute_with_semaphore(request) if hasattr(agent, "execute_with_semaphore") \
+                else agent.handle_request(request)
+            try:
+                result = await asyncio.wait_for(call, request.timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"Request to {request.target} timed out", timeout=request.timeout)
+            reply = Response(
+                sender=request.target, target=request.sender,
+                request_id=request.id, success=True, result=result,
+            ).to_dict()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            reply = _error_response(message, e)
+        self.requests_served += 1
+        try:
+            frame = encode_frame(codec, {"op": "response", "message": reply})
+        except SerializationError as e:
+            frame = encode_frame(codec, {"op": "response", "message": _error_response(message, e)})
+        if not writer.is_closing():
+            writer.write(frame)
+            await writer.drain()
+
+
+class TransportClient:
+    """Persistent multiplexed connection to an :class:`AgentServer`.
+
+    ``pending`` maps request ids to the futures awaiting their response;
+    :class:`MCPProtocol` passes its ``pending_requests`` so in-flight remote
+    calls are visible there.
+    """
+
+    def __init__(self, host: str, port: int, codec: Any = None,
+                 pending: Optional[Dict[str, asyncio.Future]] = None,
+                 max_frame: int = DEFAULT_MAX_FRAME):
+        self.host = host
+        self.port = port
+        self.codec = get_codec(codec)
+        self.pending = pending if pending is not None else {}
+        self.max_frame = max_frame
+        self.agents: List[str] = []
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+        self._agents_waiter: Optional[asyncio.Future] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self):
+        async with self._connect_lock:
+            if self.connected:
+                return
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            writer.write(encode_frame(get_codec("json"), {
+                "op": "hello", "version": PROTOCOL_VERSION, "codec": self.codec.name
+            }))
+            hello = await read_frame(reader, get_codec("json"), self.max_frame)
+            self.agents = hello.get("agents", [])
+            self._reader, self._writer = reader, writer
+            self._read_task = asyncio.ensure_future(self._read_loop(reader))
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._read_task is not None:
+            self._read_task.cancel()
+            try:
+                await self._read_task
+            except asyncio.CancelledError:
+                pass
+        self._reader = self._writer = self._read_task = None
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        error: Exception = MCPError(f"Connection to {self.host}:{self.port} closed")
+        try:
+            while True:
+                frame = await read_frame(reader, self.codec, self.max_frame)
+                if frame.get("op") == "agents":
+                    self.agents = frame.get("agents", [])
+                    if self._agents_waiter is not None and not self._agents_waiter.done():
+                        self._agents_waiter.set_result(self.agents)
+                    continue
+                message = frame.get("message") or {}
+                future = self.pending.pop(message.get("request_id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except SerializationError as e:
+            error = e
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+            self._fail_pending(error)
+
+    def _fail_pending(self, error: Exception):
+        # Solo las peticiones de esta conexión (el mapa puede ser compartido)
+        for request_id in list(self.pending):
+            future = self.pending[request_id]
+            if getattr(future, "_mcp_client", None) is self:
+                del self.pending[request_id]
+                if not future.done():
+                    future.set_exception(error)
+        if self._agents_waiter is not None and not self._agents_waiter.done():
+            self._agents_waiter.set_exception(error)
+
+    async def call(self, request: Request, target: Optional[str] = None) -> Response:
+        """Send ``request`` and wait for the matching :class:`Response`.
+
+        ``target`` overrides the agent id used on the remote node.
+        """
+        if not self.connected:
+            await self.connect()
+        message = request.to_dict()
+        if target:
+            message["target"] = target
+        future = asyncio.get_running_loop().create_future()
+        future._mcp_client = self
+        self.pending[request.id] = future
+        try:
+            self._writer.write(encode_frame(self.codec, {"op": "request", "message": message}))
+            await self._writer.drain()
+            message = await future
+        finally:
+            self.pending.pop(request.id, None)
+        return Message.from_dict(message)
+
+    async def list_agents(self) -> List[str]:
+        if not self.connected:
+            await self.connect()
+        self._agents_waiter = asyncio.get_running_loop().create_future()
+        self._writer.write(encode_frame(self.codec, {"op": "list"}))
+        return await self._agents_waiter
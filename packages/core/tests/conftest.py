@@ -1,9 +1,11 @@
 """Test configuration for mcpturbo_core"""
 
 import pytest
+import socket
 import sys
 from pathlib import Path
 import structlog
+from aiohttp import web
 
 # Add package to Python path
 package_dir = Path(__file__).parent.parent
@@ -18,6 +20,34 @@ from mcpturbo_core.logger import configure_logging
 configure_logging()
 
 
+@pytest.fixture
+async def http_server():
+    """Start local HTTP servers: ``url = await http_server(handler)``.
+
+    The handler receives every method on ``/``; servers are cleaned up
+    when the test ends.
+    """
+    runners = []
+
+    async def start(handler) -> str:
+        app = web.Application()
+        app.router.add_route("*", "/", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        runners.append(runner)
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        site = web.TCPSite(runner, "127.0.0.1", port)
+        await site.start()
+        return f"http://127.0.0.1:{port}/"
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
+
+
 @pytest.fixture
 def package_name():
     """Package name fixture"""
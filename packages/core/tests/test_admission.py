@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+from mcpturbo_core.admission import AdmissionQueue
+from mcpturbo_core.exceptions import QueueFullError, TimeoutError
+from mcpturbo_core.messages import Priority
+from mcpturbo_core.protocol import MCPProtocol
+from mcpturbo_agents.base_agent import LocalAgent
+
+
+async def _fill(queue, priorities, order):
+    """Queue one waiter per priority behind a held slot, recording admission order"""
+    async def waiter(i, priority):
+        async with queue.slot(priority):
+            order.append((i, priority))
+
+    tasks = []
+    for i, priority in enumerate(priorities):
+        tasks.append(asyncio.ensure_future(waiter(i, priority)))
+        await asyncio.sleep(0)
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_critical_overtakes_low_backlog():
+    queue = AdmissionQueue(max_concurrent=1, max_depth=100)
+    order = []
+    await queue.acquire()
+    tasks = await _fill(queue, [Priority.LOW] * 20 + [Priority.CRITICAL], order)
+    assert queue.depth == 21
+
+    queue.release()
+    await asyncio.gather(*tasks)
+    # El CRITICAL pasa en el primer turno pese a llegar el último
+    assert order[0] == (20, Priority.CRITICAL)
+    assert [i for i, _ in order[1:]] == list(range(20))
+
+
+@pytest.mark.asyncio
+async def test_weighted_fair_share_does_not_starve_low():
+    queue = AdmissionQueue(max_concurrent=1, max_depth=100)
+    order = []
+    await queue.acquire()
+    tasks = await _fill(queue, [Priority.CRITICAL] * 16 + [Priority.LOW] * 4, order)
+    queue.release()
+    await asyncio.gather(*tasks)
+
+    first_ten = [p for _, p in order[:10]]
+    assert Priority.LOW in first_ten
+    assert first_ten.count(Priority.CRITICAL) >= 8
+
+
+@pytest.mark.asyncio
+async def test_overflow_policies():
+    shed = AdmissionQueue(max_concurrent=1, max_depth=1, overflow="shed")
+    await shed.acquire()
+    low = asyncio.ensure_future(shed.acquire(Priority.LOW))
+    await asyncio.sleep(0)
+    with pytest.raises(QueueFullError):
+        await shed.acquire(Priority.LOW)
+    high = asyncio.ensure_future(shed.acquire(Priority.HIGH))
+    await asyncio.sleep(0)
+    with pytest.raises(QueueFullError):
+        await low
+    shed.release()
+    await high
+    assert shed.get_stats()["shed"] == 1 and shed.get_stats()["rejected"] == 1
+
+    wait = AdmissionQueue(max_concurrent=1, max_depth=1, overflow="wait")
+    await wait.acquire()
+    queued = asyncio.ensure_future(wait.acquire())
+    await asyncio.sleep(0)
+    with pytest.raises(TimeoutError):
+        await wait.acquire(timeout=0.05)
+    wait.release()
+    await queued
+    assert wait.depth == 0 and wait.active == 1
+
+
+@pytest.mark.asyncio
+async def test_timed_out_waiter_leaves_queue():
+    queue = AdmissionQueue(max_concurrent=1, max_depth=10)
+    await queue.acquire()
+    with pytest.raises(TimeoutError):
+        await queue.acquire(timeout=0.01)
+    assert queue.depth == 0
+    queue.release()
+    assert queue.active == 0
+
+
+@pytest.mark.asyncio
+async def test_protocol_caps_concurrency_and_allows_nested_calls():
+    protocol = MCPProtocol(admission=AdmissionQueue(max_concurrent=2, max_depth=100))
+
+    class Worker(LocalAgent):
+        active = 0
+        peak = 0
+
+        async def handle_request(self, request):
+            Worker.active += 1
+            Worker.peak = max(Worker.peak, Worker.active)
+            await asyncio.sleep(0.01)
+            Worker.active -= 1
+            return "done"
+
+    class Caller(LocalAgent):
+        async def handle_request(self, request):
+            # Petición anidada mientras se ocupa un slot
+            response = await protocol.send_request("caller", "worker", "work")
+            return response.result
+
+    protocol.register_agent("worker", Worker("worker", "Worker"), rate_limit=10**6)
+    protocol.register_agent("caller", Caller("caller", "Caller"), rate_limit=10**6)
+    try:
+        results = await asyncio.gather(
+            *(protocol.send_request("u", "caller", "go", priority=Priority.HIGH) for _ in range(4)),
+            *(protocol.send_request("u", "worker", "work", priority=Priority.LOW) for _ in range(6)),
+        )
+        assert [r.result for r in results] == ["done"] * 10
+        assert Worker.peak <= 2
+        stats = protocol.get_stats()["admission"]
+        assert stats["active"] == 0 and stats["depth"] == 0
+    finally:
+        await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_throttled_requests_do_not_hold_slots():
+    protocol = MCPProtocol(admission=AdmissionQueue(max_concurrent=2, max_depth=100))
+
+    class Echo(LocalAgent):
+        async def handle_request(self, request):
+            return "done"
+
+    protocol.register_agent("idle", Echo("idle", "Idle"), rate_limit=10**6)
+    throttled = []
+    for n in range(3):
+        protocol.register_agent(f"limited{n}", Echo(f"limited{n}", "Limited"), rate_limit=6)
+        protocol.rate_limiters[f"limited{n}"].tokens = 0
+        throttled.append(asyncio.ensure_future(
+            protocol.send_request("u", f"limited{n}", "go", priority=Priority.LOW)
+        ))
+    try:
+        await asyncio.sleep(0.05)
+        assert protocol.admission.active == 0
+        response = await asyncio.wait_for(
+            protocol.send_request("u", "idle", "go", priority=Priority.CRITICAL), 0.5
+        )
+        assert response.result == "done"
+    finally:
+        for task in throttled:
+            task.cancel()
+        await asyncio.gather(*throttled, return_exceptions=True)
+        await protocol.stop()
@@ -0,0 +1,91 @@
+import asyncio
+import random
+
+import pytest
+
+from mcpturbo_core.protocol import MCPProtocol
+from mcpturbo_core.retry import RetryPolicy
+from mcpturbo_agents.base_agent import LocalAgent
+
+
+class EchoAgent(LocalAgent):
+    def __init__(self):
+        super().__init__("echo", "Echo")
+        self.active = 0
+        self.peak = 0
+
+    async def handle_request(self, request):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(random.uniform(0, 0.01))
+            if request.data.get("fail"):
+                raise ValueError(f"bad item {request.data['n']}")
+            return request.data["n"] * 2
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def protocol():
+    protocol = MCPProtocol(retry_policy=RetryPolicy(max_attempts=1))
+    protocol.agent = EchoAgent()
+    protocol.register_agent("echo", protocol.agent, rate_limit=10**6)
+    return protocol
+
+
+@pytest.mark.asyncio
+async def test_send_batch_preserves_input_order(protocol):
+    responses = await protocol.send_batch("echo", "double", ({"n": i} for i in range(50)), concurrency=5)
+    assert [r.result for r in responses] == [i * 2 for i in range(50)]
+    assert protocol.agent.peak <= 5
+    await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_iter_batch_consumes_input_lazily(protocol):
+    consumed = []
+
+    def items():
+        for i in range(1000):
+            consumed.append(i)
+            yield {"n": i}
+
+    seen = set()
+    stream = protocol.iter_batch("echo", "double", items(), concurrency=4)
+    async for index, response in stream:
+        assert response.result == index * 2
+        seen.add(index)
+        # Nunca se lee más allá de la ventana en vuelo
+        assert len(consumed) - len(seen) <= 4
+        if len(seen) == 20:
+            break
+    await stream.aclose()
+    assert len(consumed) <= 24
+    assert protocol.agent.active == 0
+    await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_iter_batch_accepts_async_iterables(protocol):
+    async def items():
+        for i in range(10):
+            yield {"n": i}
+
+    results = dict([pair async for pair in protocol.iter_batch("echo", "double", items())])
+    assert {i: r.result for i, r in results.items()} == {i: i * 2 for i in range(10)}
+    await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_send_batch_errors(protocol):
+    items = [{"n": 0}, {"n": 1, "fail": True}, {"n": 2}]
+    responses = await protocol.send_batch("echo", "double", items)
+    assert [r.success for r in responses] == [True, False, True]
+
+    protocol.register_agent("boom", object())
+    results = await protocol.send_batch("boom", "x", [{}, {}], return_exceptions=True)
+    assert all(isinstance(r, Exception) for r in results)
+    with pytest.raises(Exception, match="not compatible"):
+        await protocol.send_batch("boom", "x", [{}, {}])
+    await protocol.stop()
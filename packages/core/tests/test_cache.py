@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from mcpturbo_core.cache import ResponseCache
+from mcpturbo_core.protocol import MCPProtocol
+
+
+@pytest.mark.asyncio
+async def test_memory_and_disk_tiers(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), max_entries=10, default_ttl=60)
+    key = cache.make_key("http://x", {"prompt": "hi"})
+    assert await cache.get(key) is None
+    await cache.set(key, {"text": "hello"})
+    assert await cache.get(key) == {"text": "hello"}
+    cache.close()
+
+    # A fresh instance only has the disk tier
+    reopened = ResponseCache(cache_dir=str(tmp_path), max_entries=10, default_ttl=60)
+    assert await reopened.get(key) == {"text": "hello"}
+    assert await reopened.get(key) == {"text": "hello"}
+    stats = reopened.get_stats()
+    assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), default_ttl=60)
+    await cache.set("k", {"v": 1}, ttl=0.05)
+    await asyncio.sleep(0.1)
+    assert await cache.get("k") is None
+    assert cache.get_stats()["expirations"] >= 1
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_size_based_eviction(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), max_entries=2, max_bytes=250, default_ttl=60)
+    for i in range(5):
+        await cache.set(f"k{i}", {"blob": "x" * 100})
+    stats = cache.get_stats()
+    assert stats["memory_entries"] == 2
+    assert stats["disk_bytes"] <= 250
+    assert stats["evictions"] >= 3
+    cache._memory.clear()
+    assert await cache.get("k0") is None
+    assert await cache.get("k4") == {"blob": "x" * 100}
+    cache.close()
+
+
+def test_policy_opt_in():
+    cache = ResponseCache(cache_dir="unused", default_ttl=60)
+    assert cache.policy_for("deepseek", "code_optimization", {}) is None
+    cache.enable("deepseek", ["code_optimization"], deterministic_only=True)
+    assert cache.policy_for("deepseek", "code_optimization", {"temperature": 0.7}) is None
+    assert cache.policy_for("deepseek", "code_optimization", {"temperature": 0}).ttl == 60
+    assert cache.policy_for("deepseek", "fast_coding", {"temperature": 0}) is None
+
+
+class ApiAgent:
+    def __init__(self, url):
+        self.api_url = url
+
+
+@pytest.mark.asyncio
+async def test_values_are_copied_and_must_be_json(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), default_ttl=60)
+    value = {"items": [1, 2]}
+    await cache.set("k", value)
+    value["items"].append(3)
+    hit = await cache.get("k")
+    hit["items"].append(4)
+    assert await cache.get("k") == {"items": [1, 2]}
+
+    with pytest.raises(TypeError):
+        await cache.set("bad", {"when": object()})
+    assert await cache.get("bad") is None
+    cache._memory.clear()
+    assert await cache.get("k") == {"items": [1, 2]}
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_protocol_serves_cached_external_responses(tmp_path, http_server):
+    calls = {"count": 0}
+
+    async def handler(request):
+        calls["count"] += 1
+        return web.json_response({"n": calls["count"]})
+
+    url = await http_server(handler)
+    protocol = MCPProtocol()
+    protocol.response_cache = ResponseCache(cache_dir=str(tmp_path), default_ttl=60)
+    await protocol.start()
+    try:
+        protocol.register_agent("cached", ApiAgent(url), cache_actions=["optimize"], rate_limit=2)
+
+        first = await protocol.send_request("u", "cached", "optimize", data={"code": "x"})
+        assert first.result == {"n": 1}
+        # Los aciertos no gastan tokens del rate limiter (solo hay 2)
+        for _ in range(5):
+            hit = await protocol.send_request("u", "cached", "optimize", data={"code": "x"})
+            assert hit.success and hit.result == {"n": 1}
+
+        other = await protocol.send_request("u", "cached", "other", data={"code": "x"})
+        assert other.result == {"n": 2}
+
+        stats = protocol.get_stats()["cache"]
+        assert stats["hits"] == 5
+        assert stats["misses"] == 1
+        assert calls["count"] == 2
+    finally:
+        await protocol.stop()
@@ -0,0 +1,126 @@
+import asyncio
+from types import MappingProxyType
+
+import pytest
+
+from mcpturbo_core.coalescing import RequestCoalescer, request_key
+from mcpturbo_core.protocol import MCPProtocol
+from mcpturbo_agents.base_agent import LocalAgent
+
+
+class CountingAgent(LocalAgent):
+    def __init__(self):
+        super().__init__("counting", "Counting Agent")
+        self.calls = 0
+
+    async def handle_request(self, request):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return {"calls": self.calls, "data": request.data}
+
+
+def test_request_key_is_canonical():
+    assert request_key("a", "x", {"p": 1, "q": 2}) == request_key("a", "x", {"q": 2, "p": 1})
+    assert request_key("a", "x", {"p": 1}) != request_key("b", "x", {"p": 1})
+    assert request_key("a", "x", None) == request_key("a", "x", {})
+    # Mappings that are not dicts hash by content, not by repr
+    view = MappingProxyType({"p": {"big": "v1"}})
+    assert request_key("a", "x", view) == request_key("a", "x", {"p": {"big": "v1"}})
+    assert request_key("a", "x", view) != request_key("a", "x", MappingProxyType({"p": {"big": "v2"}}))
+
+
+class _SameText:
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return "same"
+
+
+def test_request_key_rejects_values_without_canonical_form():
+    with pytest.raises(TypeError):
+        request_key("a", "x", {"obj": _SameText(1)})
+
+
+@pytest.mark.asyncio
+async def test_uncanonical_payloads_are_not_coalesced():
+    protocol = MCPProtocol(coalesce_requests=True)
+    await protocol.start()
+    agent = CountingAgent()
+    protocol.register_agent("counting", agent)
+    try:
+        first, second = await asyncio.gather(
+            protocol.send_request("s", "counting", "run", data={"obj": _SameText(1)}),
+            protocol.send_request("s", "counting", "run", data={"obj": _SameText(2)}),
+        )
+        assert agent.calls == 2
+        assert first.result["data"]["obj"].value == 1 and second.result["data"]["obj"].value == 2
+    finally:
+        await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_call():
+    protocol = MCPProtocol(coalesce_requests=True)
+    await protocol.start()
+    agent = CountingAgent()
+    protocol.register_agent("counting", agent)
+    try:
+        responses = await asyncio.gather(*[
+            protocol.send_request(f"sender{i}", "counting", "run", data={"prompt": "same"})
+            for i in range(5)
+        ])
+        assert agent.calls == 1
+        assert all(r is responses[0] for r in responses)
+        assert protocol.get_stats()["coalescing"]["coalesced"] == 4
+
+        # Different payloads are not merged
+        await asyncio.gather(
+            protocol.send_request("s", "counting", "run", data={"prompt": "one"}),
+            protocol.send_request("s", "counting", "run", data={"prompt": "two"}),
+        )
+        assert agent.calls == 3
+    finally:
+        await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_coalescing_is_opt_in():
+    protocol = MCPProtocol()
+    await protocol.start()
+    agent = CountingAgent()
+    protocol.register_agent("counting", agent)
+    try:
+        await asyncio.gather(*[
+            protocol.send_request("s", "counting", "run", data={"prompt": "same"})
+            for _ in range(3)
+        ])
+        assert agent.calls == 3
+
+        await asyncio.gather(*[
+            protocol.send_request("s", "counting", "run", data={"prompt": "same"}, coalesce=True)
+            for _ in range(3)
+        ])
+        assert agent.calls == 4
+    finally:
+        await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    coalescer = RequestCoalescer()
+    started = asyncio.Event()
+
+    async def call():
+        started.set()
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.ensure_future(coalescer.run("k", call))
+    await started.wait()
+    second = asyncio.ensure_future(coalescer.run("k", call))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+    assert coalescer.get_stats() == {"in_flight": 0, "calls": 1, "coalesced": 1}
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mcpturbo_core import codecs
+from mcpturbo_core.codecs import JSONCodec, available_codecs, get_codec
+from mcpturbo_core.exceptions import SerializationError
+from mcpturbo_core.messages import (
+    AIRequest, AIResponse, Event, Message, MessageType, Priority, Request, Response,
+    create_request
+)
+from mcpturbo_core.protocol import MCPProtocol
+from mcpturbo_agents.base_agent import ExternalAgent
+
+
+def _roundtrip(message, codec):
+    clone = Message.from_bytes(message.to_bytes(codec), codec)
+    assert type(clone) is type(message)
+    assert clone == message
+    return clone
+
+
+def test_json_roundtrip_preserves_types():
+    request = create_request("a", "b", "generate", data={"code": "x" * 10_000}, priority=Priority.HIGH)
+    clone = _roundtrip(request, "json")
+    assert clone.priority is Priority.HIGH and clone.type is MessageType.REQUEST
+    assert isinstance(clone.timestamp, datetime)
+
+    _roundtrip(AIRequest(sender="a", model="m", max_tokens=10, system_prompt="s"), "json")
+    _roundtrip(Response(sender="b", request_id=request.id, result={"ok": [1, 2]}), "json")
+    _roundtrip(AIResponse(sender="b", model_used="m", tokens_used=3, cost=0.1), None)
+    _roundtrip(Event(sender="a", event="done", recipients=["x"]), get_codec("json"))
+
+
+def test_json_falls_back_to_stdlib(monkeypatch):
+    monkeypatch.setattr(codecs, "orjson", None)
+    codec = JSONCodec()
+    payload = {"when": datetime(2024, 1, 1), "priority": Priority.LOW, "tags": {"a"}}
+    assert codec.loads(codec.dumps(payload)) == {
+        "when": "2024-01-01T00:00:00", "priority": 1, "tags": ["a"]
+    }
+
+
+def test_invalid_payloads_raise_serialization_error():
+    with pytest.raises(SerializationError):
+        Message.from_bytes(b"{not json")
+    with pytest.raises(SerializationError):
+        Message.from_dict({"type": "gossip"})
+    with pytest.raises(SerializationError):
+        Request.from_dict({"priority": 42})
+    with pytest.raises(SerializationError):
+        get_codec("nope")
+    with pytest.raises(SerializationError):
+        get_codec("json").dumps({"x": object()})
+
+
+def test_msgpack_roundtrip():
+    pytest.importorskip("msgpack")
+    assert available_codecs()["msgpack"]
+    codec = get_codec("msgpack")
+    payload = {"at": datetime(2024, 1, 1, tzinfo=timezone.utc), "blob": b"\x00\x01"}
+    assert codec.loads(codec.dumps(payload)) == payload
+    _roundtrip(create_request("a", "b", "run", data={"n": 1}), "msgpack")
+
+
+@pytest.mark.asyncio
+async def test_external_request_uses_agent_codec():
+    protocol = MCPProtocol()
+    agent = ExternalAgent("svc", "Svc", api_url="https://svc.local/run")
+    protocol.register_agent("svc", agent)
+    try:
+        with patch("aiohttp.ClientSession.post") as post:
+            response = AsyncMock()
+            response.status = 200
+            response.json = AsyncMock(return_value={"ok": True})
+            post.return_value.__aenter__.return_value = response
+
+            await protocol._send_external_request(agent, create_request("u", "svc", "run", data={"x": 1}))
+            kwargs = post.call_args.kwargs
+            assert kwargs["headers"]["Content-Type"] == "application/json"
+            assert get_codec("json").loads(kwargs["data"]) == {"action": "run", "data": {"x": 1}}
+            assert response.json.call_args.kwargs["loads"] == protocol.codec.loads
+    finally:
+        await protocol.stop()
@@ -0,0 +1,146 @@
+import asyncio
+import time
+
+import pytest
+
+from mcpturbo_core.events import EventBus, TopicIndex
+from mcpturbo_core.protocol import MCPProtocol
+
+
+@pytest.mark.asyncio
+async def test_publish_does_not_wait_for_slow_handlers():
+    bus = EventBus()
+    seen = []
+
+    async def slow(payload):
+        await asyncio.sleep(0.2)
+        seen.append(("slow", payload))
+
+    def failing(payload):
+        raise RuntimeError("broken hook")
+
+    bus.subscribe("task_started", slow)
+    bus.subscribe("task_started", failing)
+    bus.subscribe("#", lambda payload: seen.append(("all", payload)))
+
+    start = time.perf_counter()
+    assert await bus.publish("task_started", 1) == 3
+    assert time.perf_counter() - start < 0.05
+
+    await bus.drain(timeout=1)
+    assert sorted(seen) == [("all", 1), ("slow", 1)]
+    stats = {s["handler"]: s for s in bus.get_stats()}
+    assert stats["test_publish_does_not_wait_for_slow_handlers.<locals>.failing"]["errors"] == 1
+    assert stats["test_publish_does_not_wait_for_slow_handlers.<locals>.slow"]["max_handler_ms"] >= 200
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_overflow_policies():
+    gate = asyncio.Event()
+    received = {"drop_oldest": [], "drop_new": [], "block": []}
+    bus = EventBus(queue_size=2)
+
+    for policy, items in received.items():
+        async def handler(payload, items=items):
+            await gate.wait()
+            items.append(payload)
+        bus.subscribe(policy, handler, overflow=policy)
+
+    for policy in ("drop_oldest", "drop_new"):
+        await bus.publish(policy, 0)
+        await asyncio.sleep(0.01)  # el worker toma el primero; caben dos más en la cola
+        for i in range(1, 5):
+            await bus.publish(policy, i)
+    blocked = asyncio.ensure_future(asyncio.gather(*(bus.publish("block", i) for i in range(5))))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    gate.set()
+    await blocked
+    await bus.drain(timeout=1)
+    assert received["drop_oldest"] == [0, 3, 4]
+    assert received["drop_new"] == [0, 1, 2]
+    assert received["block"] == [0, 1, 2, 3, 4]
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_batching_high_frequency_events():
+    batches = []
+    bus = EventBus()
+    bus.subscribe("progress", batches.append, batch_size=50, batch_interval=0.05)
+    for i in range(120):
+        await bus.publish("progress", i)
+    await bus.drain(timeout=1)
+    assert [item for batch in batches for item in batch] == list(range(120))
+    assert len(batches) <= 4
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_protocol_broadcast_uses_bus():
+    protocol = MCPProtocol()
+    events = []
+    subscription = protocol.subscribe("deploy", events.append)
+    await protocol.broadcast_event("ci", "deploy", {"env": "prod"})
+    await protocol.events.drain(timeout=1)
+    assert events[0].event == "deploy" and events[0].data == {"env": "prod"}
+    assert protocol.get_stats()["events"][0]["delivered"] == 1
+    protocol.events.unsubscribe(subscription)
+    await protocol.broadcast_event("ci", "deploy", {})
+    assert len(events) == 1
+
+
+def test_topic_index_wildcards():
+    index = TopicIndex()
+    for pattern in ("task.started", "task.*", "task.#", "#", "workflow.*.done", "*"):
+        index.add(pattern, _Sub(pattern))
+
+    def match(topic):
+        return sorted(s.event for s in index.match(topic))
+
+    assert match("task.started") == ["#", "task.#", "task.*", "task.started"]
+    assert match("task") == ["#", "*", "task.#"]
+    assert match("task.a.b") == ["#", "task.#"]
+    assert match("workflow.wf1.done") == ["#", "workflow.*.done"]
+    assert index.match("task.x") is index.match("task.x")  # ruta cacheada
+
+    sub = index.match("workflow.wf1.done")[-1]
+    assert index.remove("workflow.*.done", sub)
+    assert match("workflow.wf1.done") == ["#"]
+    assert "workflow" not in index._root.children
+    with pytest.raises(ValueError):
+        index.add("task.#.done", _Sub("bad"))
+
+
+class _Sub:
+    _counter = 0
+
+    def __init__(self, event):
+        _Sub._counter += 1
+        self._order = _Sub._counter
+        self.event = event
+        self.subscriber = None
+        self.scope = None
+
+
+@pytest.mark.asyncio
+async def test_scope_and_recipients_filter_delivery():
+    protocol = MCPProtocol()
+    got = {"coder": [], "reviewer": [], "dashboard": []}
+    protocol.subscribe("task.*", got["coder"].append, subscriber="coder", scope="agents")
+    protocol.subscribe("task.#", got["reviewer"].append, subscriber="reviewer", scope="agents")
+    protocol.subscribe("#", got["dashboard"].append, scope="ui")
+
+    assert await protocol.broadcast_event("o", "task.done", {"n": 1}) == 3
+    assert await protocol.broadcast_event("o", "task.done", {"n": 2}, recipients=["reviewer"]) == 1
+    assert await protocol.broadcast_event("o", "task.done", {"n": 3}, scope="ui") == 1
+    assert await protocol.broadcast_event("o", "task.done", {"n": 4},
+                                          scope="ui", recipients=["coder"]) == 0
+    await protocol.events.drain(timeout=1)
+
+    numbers = {name: [e.data["n"] for e in events] for name, events in got.items()}
+    assert numbers == {"coder": [1], "reviewer": [1, 2], "dashboard": [1, 3]}
+    assert got["reviewer"][1].recipients == ["reviewer"]
+    await protocol.events.close()
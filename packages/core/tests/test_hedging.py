@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+import pytest
+
+from mcpturbo_core.hedging import HedgeBudget, HedgePolicy, Hedger, HedgeTarget
+from mcpturbo_core.protocol import MCPProtocol
+from mcpturbo_core.retry import RetryPolicy
+from mcpturbo_agents.base_agent import AgentCapability, LocalAgent
+
+
+class DelayAgent(LocalAgent):
+    def __init__(self, agent_id, delay, fail=False, cost=None):
+        super().__init__(agent_id, agent_id.title())
+        self.delay = delay
+        self.fail = fail
+        self.cancelled = 0
+        if cost is not None:
+            self.add_capability(AgentCapability("code", "Code", {}, {}, cost_per_request=cost))
+
+    async def handle_request(self, request):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.config.agent_id} failed")
+        return {"by": self.config.agent_id, "prompt": request.data["prompt"]}
+
+
+def make_protocol(primary, backup, budget=None):
+    protocol = MCPProtocol(retry_policy=RetryPolicy(max_attempts=1), hedge_budget=budget)
+    protocol.register_agent("primary", primary)
+    protocol.register_agent("backup", backup)
+    protocol.hedge("primary", "code", [("backup", "code")], initial_delay=0.05)
+    return protocol
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled():
+    primary, backup = DelayAgent("primary", 1.0), DelayAgent("backup", 0.01)
+    protocol = make_protocol(primary, backup)
+
+    start = time.perf_counter()
+    response = await protocol.send_request("t", "primary", "code", {"prompt": "sort"})
+    assert time.perf_counter() - start < 0.5
+    assert response.result == {"by": "backup", "prompt": "sort"}
+    assert primary.cancelled == 1
+
+    stats = protocol.get_stats()["hedging"]
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_losing_primary_keeps_hedge_delay_at_its_p95():
+    class Bimodal(DelayAgent):
+        calls = 0
+
+        async def handle_request(self, request):
+            # Una de cada cinco peticiones es lenta: el p95 real es 0.1s
+            self.calls += 1
+            self.delay = 0.1 if self.calls % 5 == 0 else 0.001
+            return await super().handle_request(request)
+
+    primary, backup = Bimodal("primary", 0), DelayAgent("backup", 0.03)
+    protocol = make_protocol(primary, backup, budget=HedgeBudget(ratio=1.0))
+    protocol.hedge("primary", "code", [("backup", "code")], initial_delay=0.05,
+                   min_samples=5, min_delay=0.001)
+
+    for _ in range(40):
+        await protocol.send_request("t", "primary", "code", {"prompt": "x"})
+    policy = protocol.hedging.policy_for("primary", "code")
+    assert primary.cancelled > 0
+    assert protocol.hedging.delay_for("primary", "code", policy) >= 0.08
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    protocol = make_protocol(DelayAgent("primary", 0), DelayAgent("backup", 0))
+    response = await protocol.send_request("t", "primary", "code", {"prompt": "x"})
+    assert response.result["by"] == "primary"
+    assert protocol.hedging.hedged == 0 and protocol.hedging.primary_wins == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_primary_hedges_immediately():
+    protocol = make_protocol(DelayAgent("primary", 0, fail=True), DelayAgent("backup", 0))
+    protocol.hedging.policies[("primary", "code")].initial_delay = 5
+    response = await asyncio.wait_for(
+        protocol.send_request("t", "primary", "code", {"prompt": "x"}), 1
+    )
+    assert response.success and response.result["by"] == "backup"
+
+
+@pytest.mark.asyncio
+async def test_cost_cap_stops_hedging():
+    budget = HedgeBudget(max_cost=0.06)
+    primary, backup = DelayAgent("primary", 0.1), DelayAgent("backup", 0, cost=0.05)
+    protocol = make_protocol(primary, backup, budget)
+
+    responses = [
+        await protocol.send_request("t", "primary", "code", {"prompt": str(i)}) for i in range(3)
+    ]
+    assert [r.result["by"] for r in responses] == ["backup", "primary", "primary"]
+    assert budget.get_stats()["spent"] == pytest.approx(0.05)
+    assert budget.denied == 2
+
+
+def test_delay_follows_latency_percentile():
+    hedger = Hedger()
+    policy = HedgePolicy([HedgeTarget("b")], percentile=0.9, min_samples=10, min_delay=0.01)
+    assert hedger.delay_for("a", "x", policy) == policy.initial_delay
+    for ms in range(1, 101):
+        hedger.record_latency("a", "x", ms / 1000)
+    assert hedger.delay_for("a", "x", policy) == pytest.approx(0.09)
+
+    budget = HedgeBudget(ratio=0.5, min_hedges=0)
+    for _ in range(4):
+        budget.record_request()
+    assert [budget.try_spend(0) for _ in range(3)] == [True, True, False]
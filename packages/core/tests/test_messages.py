@@ -0,0 +1,83 @@
+import pickle
+from datetime import datetime, timedelta
+
+import pytest
+
+from mcpturbo_core import messages
+from mcpturbo_core.messages import (
+    AIRequest, AIResponse, Event, MessageType, Priority, Request, Response,
+    create_request, create_response
+)
+
+
+def test_messages_are_slotted():
+    for message in (Request(), Response(), Event(), AIRequest(), AIResponse()):
+        assert not hasattr(message, "__dict__")
+    with pytest.raises(AttributeError):
+        Request().unknown = 1
+
+
+def test_lazy_ids_and_timestamps():
+    first, second = Request(), Request()
+    assert first._id is None and first._timestamp is None and first._data is None
+    assert first.id != second.id
+    assert first.id == first.id
+    assert second.created_ns >= first.created_ns
+    assert abs(first.timestamp - datetime.utcnow()) < timedelta(seconds=5)
+
+    explicit = Request(id="req-1", timestamp=datetime(2024, 1, 1))
+    assert explicit.id == "req-1" and explicit.timestamp == datetime(2024, 1, 1)
+
+
+def test_to_dict_matches_field_layout():
+    request = create_request("a", "b", "run", data={"x": 1}, priority=Priority.HIGH)
+    assert request.to_dict() == {
+        "id": request.id,
+        "type": "request",
+        "sender": "a",
+        "timestamp": request.timestamp.isoformat(),
+        "data": {"x": 1},
+        "priority": 3,
+        "target": "b",
+        "action": "run",
+        "timeout": 30,
+        "correlation_id": None,
+    }
+
+    response = AIResponse(sender="b", request_id=request.id, model_used="m", tokens_used=5)
+    data = response.to_dict()
+    assert data["type"] == "response"
+    assert list(data)[-9:] == [
+        "target", "request_id", "success", "result", "error", "execution_time",
+        "model_used", "tokens_used", "cost",
+    ]
+
+
+def test_equality_repr_and_pickle():
+    request = create_request("a", "b", "run", data={"x": 1})
+    response = create_response(request, result={"ok": True})
+    assert response.target == "a" and response.request_id == request.id
+    assert response.type is MessageType.RESPONSE
+
+    clone = pickle.loads(pickle.dumps(response))
+    assert clone == response and clone is not response
+    assert response != create_response(request, result={"ok": True})
+    assert repr(request).startswith("Request(id=")
+
+
+def test_pickled_messages_keep_their_id_and_timestamp():
+    request = create_request("a", "b", "run")
+    payload = pickle.dumps(request)
+    assert request._id is not None and request._timestamp is not None
+
+    # El prefijo de ids de otro proceso no debe cambiar el id ya asignado
+    messages._reset_id_prefix()
+    clone = pickle.loads(payload)
+    assert clone.id == request.id and clone.timestamp == request.timestamp
+
+
+def test_ai_request_validation_still_applies():
+    with pytest.raises(ValueError):
+        AIRequest(max_tokens=10**9)
+    with pytest.raises(ValueError):
+        Request(timeout=10**9)
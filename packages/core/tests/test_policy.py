@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from mcpturbo_core.config import MCPConfig, set_config
+from mcpturbo_core.exceptions import MCPError
+from mcpturbo_core.policy import allow_all, console_confirmation, current_policy, deny_all
+from mcpturbo_core.protocol import MCPProtocol
+from mcpturbo_agents.base_agent import LocalAgent
+
+
+@pytest.fixture
+def config():
+    config = MCPConfig(tool_permissions={"rm": False})
+    set_config(config)
+    yield config
+    set_config(MCPConfig())
+
+
+def test_policy_compiled_once_per_config_version(config):
+    policy = current_policy()
+    assert current_policy() is policy
+    assert "rm" in policy.denied_actions and "write_file" in policy.sensitive_actions
+
+    config.timeout = 10
+    assert current_policy() is not policy
+    assert current_policy().timeout == 10
+
+    policy = current_policy()
+    config.sensitive_actions.append("deploy")
+    assert current_policy() is policy
+    config.touch()
+    assert "deploy" in current_policy().sensitive_actions
+
+
+def test_policy_checks(config):
+    policy = current_policy()
+    with pytest.raises(MCPError, match="not permitted"):
+        policy.check("rm", {}, 5)
+    with pytest.raises(MCPError, match="timeout"):
+        policy.check("read", {}, 31)
+    with pytest.raises(MCPError, match="max_tokens"):
+        policy.check("read", {"max_tokens": 10**6}, 5)
+    assert policy.check("write_file", None, 5) is True
+    assert policy.check("read", None, 5) is False
+
+
+@pytest.mark.asyncio
+async def test_sensitive_actions_use_async_hook(config, monkeypatch):
+    def no_input(prompt=""):
+        raise AssertionError("input() must not be called on the event loop")
+
+    monkeypatch.setattr("builtins.input", no_input)
+
+    class Writer(LocalAgent):
+        async def handle_request(self, request):
+            return "written"
+
+    protocol = MCPProtocol(confirmation_hook=deny_all)
+    protocol.register_agent("fs", Writer("fs", "FS"))
+    try:
+        with pytest.raises(MCPError, match="cancelled"):
+            await protocol.send_request("u", "fs", "write_file")
+
+        protocol.confirmation_hook = allow_all
+        response = await protocol.send_request("u", "fs", "write_file")
+        assert response.result == "written"
+    finally:
+        await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_console_confirmation_runs_off_loop(monkeypatch):
+    loop_thread = threading.get_ident()
+    threads = []
+
+    def fake_input(prompt=""):
+        threads.append(threading.get_ident())
+        return "yes"
+
+    monkeypatch.setattr("builtins.input", fake_input)
+    assert await console_confirmation("write_file", {}) is True
+    assert threads and threads[0] != loop_thread
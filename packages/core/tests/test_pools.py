@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from mcpturbo_core.exceptions import ConfigurationError
+from mcpturbo_core.pools import ConnectionPools, PoolConfig, httpx, origin_of
+from mcpturbo_core.messages import create_request
+from mcpturbo_core.protocol import MCPProtocol
+from mcpturbo_agents.base_agent import ExternalAgent
+
+
+def test_origin_and_config_lookup():
+    assert origin_of("https://api.openai.com/v1/chat") == "https://api.openai.com:443"
+    pools = ConnectionPools(PoolConfig(limit=7), {"api.openai.com": {"limit": 3}})
+    pools.configure("https://api.openai.com:8443", keepalive_timeout=5)
+    assert pools.config_for("https://api.openai.com:443").limit == 3
+    assert pools.config_for("https://api.openai.com:8443").keepalive_timeout == 5
+    assert pools.config_for("https://api.deepseek.com:443").limit == 7
+    with pytest.raises(ConfigurationError):
+        PoolConfig.from_dict({"limit": 1, "pipelining": True})
+
+
+@pytest.mark.asyncio
+async def test_slow_provider_does_not_starve_another(http_server):
+    async def slow(request):
+        await asyncio.sleep(0.3)
+        return web.json_response({"ok": "slow"})
+
+    async def fast(request):
+        return web.json_response({"ok": "fast"})
+
+    slow_url = await http_server(slow)
+    fast_url = await http_server(fast)
+    pools = ConnectionPools(hosts={origin_of(slow_url): PoolConfig(limit=2)})
+    protocol = MCPProtocol(pools=pools)
+    slow_agent = ExternalAgent("slow", "Slow", slow_url)
+    fast_agent = ExternalAgent("fast", "Fast", fast_url)
+    await protocol.start()
+    try:
+        pending = [
+            asyncio.ensure_future(protocol._send_external_request(slow_agent, create_request("t", "slow", "run")))
+            for _ in range(4)
+        ]
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        result = await protocol._send_external_request(fast_agent, create_request("t", "fast", "run"))
+        assert result == {"ok": "fast"}
+        assert time.perf_counter() - start < 0.2
+
+        stats = protocol.get_stats()["connection_pools"][origin_of(slow_url)]
+        assert stats["limit"] == 2 and stats["in_flight"] == 4
+        assert stats["utilization"] == 2.0 and stats["saturated"] == 2
+        assert await asyncio.gather(*pending) == [{"ok": "slow"}] * 4
+        assert protocol.pools.get_stats()[origin_of(slow_url)]["in_flight"] == 0
+    finally:
+        await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_start_warms_up_configured_pools(http_server):
+    methods = []
+
+    async def handler(request):
+        methods.append(request.method)
+        return web.json_response({})
+
+    url = await http_server(handler)
+    pools = ConnectionPools(hosts={"127.0.0.1": {"warmup": 3}})
+    protocol = MCPProtocol(pools=pools)
+    protocol.register_agent("api", ExternalAgent("api", "Api", url))
+    try:
+        await protocol.start()
+        assert methods == ["HEAD"] * 3
+        assert pools.get_stats()[origin_of(url)]["warmed"] == 3
+    finally:
+        await protocol.stop()
+
+
+@pytest.mark.skipif(httpx is not None, reason="httpx installed")
+@pytest.mark.asyncio
+async def test_http2_requires_httpx():
+    pools = ConnectionPools(hosts={"api.openai.com": PoolConfig(http2=True)})
+    with pytest.raises(ConfigurationError, match="httpx"):
+        pools.pool_for("https://api.openai.com/v1/chat")
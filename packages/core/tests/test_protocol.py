@@ -11,6 +11,7 @@ from aiohttp import web
 
 from mcpturbo_core.protocol import MCPProtocol, CircuitBreaker, RateLimiter, RetryConfig
 from mcpturbo_core.messages import Request, Response, create_request
+from mcpturbo_core.retry import RetryBudget
 from mcpturbo_core.exceptions import MCPError, TimeoutError, CircuitBreakerError, RateLimitError
 from mcpturbo_agents.base_agent import LocalAgent, ExternalAgent, AgentConfig, AgentType
 
@@ -23,7 +24,8 @@ class TestMCPProtocol:
     @pytest.fixture
     async def protocol(self):
         """Create a test protocol instance"""
-        protocol = MCPProtocol()
+        # Presupuesto propio: los reintentos de un test no agotan el de otro
+        protocol = MCPProtocol(retry_budget=RetryBudget())
         await protocol.start()
         yield protocol
         await protocol.stop()
@@ -300,6 +302,8 @@ class TestMCPProtocol:
             await protocol.send_request(
                 "s", "test_agent", "a", retry_config=RetryConfig(max_attempts=1)
             )
+        assert not protocol.is_available("test_agent")
+        assert protocol.is_available("unknown_agent")
 
     async def test_send_external_request(self, protocol):
         """Validate _send_external_request with a real HTTP server"""
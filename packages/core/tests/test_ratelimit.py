@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from mcpturbo_core.exceptions import RateLimitError
+from mcpturbo_core.protocol import MCPProtocol
+from mcpturbo_core.messages import create_request
+from mcpturbo_core.ratelimit import RateLimiter, parse_duration, parse_retry_after
+from mcpturbo_core.retry import RetryBudget, RetryPolicy
+from mcpturbo_agents.base_agent import ExternalAgent, LocalAgent
+
+
+def test_parse_durations():
+    assert parse_duration("6m0s") == 360
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("1.5") == 1.5
+    assert parse_duration("soon") is None
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:10 GMT", now=4) == 6
+    assert parse_retry_after("1970-01-01T00:00:10Z", now=4) == 6
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_in_fifo_order():
+    limiter = RateLimiter(requests_per_minute=600, tokens=1)  # 1 token every 0.1s
+    order = []
+
+    async def worker(i):
+        await limiter.acquire(timeout=5)
+        order.append(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(4)))
+    assert order == [0, 1, 2, 3]
+    assert time.perf_counter() - start >= 0.25
+    assert limiter.waiters == 0
+
+
+@pytest.mark.asyncio
+async def test_acquire_fails_fast_beyond_timeout():
+    limiter = RateLimiter(requests_per_minute=1, tokens=1)
+    await limiter.acquire(timeout=1)
+
+    start = time.perf_counter()
+    with pytest.raises(RateLimitError) as exc_info:
+        await limiter.acquire(timeout=1)
+    assert time.perf_counter() - start < 0.1
+    assert exc_info.value.details["reset_time"] >= 59
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_hands_over_turn():
+    limiter = RateLimiter(requests_per_minute=600, tokens=0)
+    first = asyncio.ensure_future(limiter.acquire(timeout=5))
+    second = asyncio.ensure_future(limiter.acquire(timeout=5))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.wait_for(second, 1)
+    assert limiter.waiters == 0
+
+
+def test_backoff_and_recovery():
+    limiter = RateLimiter(requests_per_minute=100)
+    limiter.on_rate_limited(retry_after=2)
+    assert limiter.rate == 50
+    assert limiter.throttled == 1
+    assert limiter.blocked_until > time.time() + 1
+    assert not limiter.can_proceed()
+
+    for _ in range(60):
+        limiter.record_success()
+    assert limiter.rate == 100
+
+
+def test_provider_headers_cap_rate():
+    limiter = RateLimiter(requests_per_minute=100)
+    delay = limiter.update_from_headers({
+        "x-ratelimit-limit-requests": "30",
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "1s",
+    })
+    assert delay is None
+    assert limiter.rate == 30 and limiter.ceiling == 30
+    assert limiter.blocked_until > time.time() + 0.5
+    assert not limiter.can_proceed()
+
+
+@pytest.mark.asyncio
+async def test_protocol_adapts_to_429(http_server):
+    async def handler(request):
+        return web.json_response(
+            {"error": "slow down"}, status=429, headers={"Retry-After": "3"}
+        )
+
+    url = await http_server(handler)
+    protocol = MCPProtocol()
+    await protocol.start()
+    try:
+        agent = ExternalAgent("limited", "Limited", api_url=url)
+        protocol.register_agent("limited", agent, rate_limit=100)
+        req = create_request(sender="u", target="limited", action="go")
+
+        with pytest.raises(RateLimitError) as exc_info:
+            await protocol._send_external_request(agent, req)
+        assert "429" in str(exc_info.value)
+        assert exc_info.value.details["reset_time"] == 3
+
+        stats = protocol.get_stats()["rate_limits"]["limited"]
+        assert stats["rate"] == 50
+        assert stats["throttled"] == 1
+    finally:
+        await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_retries_take_a_token_per_attempt():
+    calls = {"count": 0}
+
+    class Flaky(LocalAgent):
+        async def handle_request(self, request):
+            calls["count"] += 1
+            raise RuntimeError("flaky")
+
+    protocol = MCPProtocol(
+        retry_policy=RetryPolicy(initial_delay=0.01, max_delay=0.01), retry_budget=RetryBudget()
+    )
+    await protocol.start()
+    try:
+        protocol.register_agent("flaky", Flaky("flaky", "Flaky"), rate_limit=2)
+        with pytest.raises(RateLimitError, match="Rate limit exceeded for flaky"):
+            await protocol.send_request("u", "flaky", "go", timeout=1)
+        # Dos tokens: el intento inicial y un reintento; el segundo reintento no cabe
+        assert calls["count"] == 2
+    finally:
+        await protocol.stop()
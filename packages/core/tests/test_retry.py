@@ -0,0 +1,124 @@
+import pytest
+from aiohttp import web
+
+from mcpturbo_core.exceptions import (
+    APIError, AuthenticationError, MCPError, RateLimitError, TimeoutError
+)
+from mcpturbo_core.protocol import MCPProtocol
+from mcpturbo_core.retry import RetryBudget, RetryPolicy
+from mcpturbo_agents.base_agent import LocalAgent
+
+
+class ApiAgent:
+    """Bare external agent, sent through the protocol under test"""
+    def __init__(self, url):
+        self.api_url = url
+        self.headers = {"Content-Type": "application/json"}
+
+
+FAST = dict(initial_delay=0.01, max_delay=0.05)
+
+
+def test_jitter_bounds():
+    for attempt in range(5):
+        ceiling = min(1.0 * 2 ** attempt, 8.0)
+        assert 0 <= RetryPolicy(jitter="full", max_delay=8).compute_delay(attempt, 0) <= ceiling
+        equal = RetryPolicy(jitter="equal", max_delay=8).compute_delay(attempt, 0)
+        assert ceiling / 2 <= equal <= ceiling
+        assert RetryPolicy(jitter="none", max_delay=8).compute_delay(attempt, 0) == ceiling
+    decorrelated = RetryPolicy(jitter="decorrelated", max_delay=8).compute_delay(3, 2.0)
+    assert 1.0 <= decorrelated <= 6.0
+    with pytest.raises(ValueError):
+        RetryPolicy(jitter="random")
+
+
+def test_retry_decisions():
+    policy = RetryPolicy()
+    assert not policy.should_retry(AuthenticationError("bad key"))
+    assert not policy.should_retry(APIError("bad request", status_code=400))
+    assert policy.should_retry(APIError("unavailable", status_code=503))
+    assert policy.should_retry(TimeoutError("slow"))
+    assert policy.should_retry(RuntimeError("flaky"))
+    assert not RetryPolicy(retry_on=(MCPError,)).should_retry(RuntimeError("flaky"))
+
+
+def test_retry_after_overrides_backoff():
+    policy = RetryPolicy(jitter="none", max_retry_after=10)
+    assert policy.next_delay(0, 0, RateLimitError("429", reset_time=5)) == 5
+    assert policy.next_delay(0, 0, RateLimitError("429", reset_time=30)) is None
+    assert policy.next_delay(2, 0, RuntimeError("last attempt")) is None
+
+
+def test_budget_caps_retry_ratio():
+    budget = RetryBudget(ratio=0.1, min_retries_per_second=0, window=10)
+    for _ in range(20):
+        budget.record_request()
+    assert budget.try_retry()
+    assert budget.try_retry()
+    assert not budget.try_retry()
+    assert budget.get_stats()["exhausted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_authentication_errors_are_not_retried(http_server):
+    calls = {"count": 0}
+
+    async def handler(request):
+        calls["count"] += 1
+        return web.Response(status=401, text="Unauthorized")
+
+    url = await http_server(handler)
+    protocol = MCPProtocol(retry_policy=RetryPolicy(**FAST), retry_budget=RetryBudget())
+    await protocol.start()
+    try:
+        protocol.register_agent("ext", ApiAgent(url))
+        response = await protocol.send_request("u", "ext", "go")
+        assert not response.success and "401" in response.error
+        assert calls["count"] == 1
+    finally:
+        await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried_and_breaker_counts_once(http_server):
+    calls = {"count": 0}
+
+    async def handler(request):
+        calls["count"] += 1
+        if calls["count"] < 3:
+            return web.Response(status=503, text="Overloaded")
+        return web.json_response({"ok": True})
+
+    url = await http_server(handler)
+    protocol = MCPProtocol(retry_policy=RetryPolicy(**FAST), retry_budget=RetryBudget())
+    await protocol.start()
+    try:
+        protocol.register_agent("ext", ApiAgent(url), failure_threshold=2)
+        response = await protocol.send_request("u", "ext", "go")
+        assert response.success and response.result == {"ok": True}
+        assert calls["count"] == 3
+        assert protocol.circuit_breakers["ext"].failure_count == 0
+    finally:
+        await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_stops_retries():
+    calls = {"count": 0}
+
+    class Flaky(LocalAgent):
+        async def handle_request(self, request):
+            calls["count"] += 1
+            raise RuntimeError("still down")
+
+    budget = RetryBudget(ratio=0.0, min_retries_per_second=0.1, window=10)  # one retry
+    protocol = MCPProtocol(retry_policy=RetryPolicy(max_attempts=5, **FAST), retry_budget=budget)
+    protocol.register_agent("flaky", Flaky("flaky", "Flaky"))
+    try:
+        first = await protocol.send_request("u", "flaky", "go")
+        second = await protocol.send_request("u", "flaky", "go")
+        assert not first.success and not second.success
+        assert calls["count"] == 3
+        assert protocol.get_stats()["retry_budget"]["exhausted"] == 2
+    finally:
+        await protocol.stop()
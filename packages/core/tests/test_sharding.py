@@ -0,0 +1,159 @@
+import asyncio
+import os
+import pickle
+
+import pytest
+
+from mcpturbo_core.exceptions import CircuitBreakerError, MCPError, RateLimitError
+from mcpturbo_core.retry import RetryPolicy
+from mcpturbo_core.sharding import SharedState, ShardedRuntime, _encode
+from mcpturbo_agents.base_agent import LocalAgent
+
+
+class Unpicklable(Exception):
+    def __init__(self, code, reason):
+        super().__init__(f"{code}: {reason}")
+
+
+class PidAgent(LocalAgent):
+    async def handle_request(self, request):
+        if request.action == "fail":
+            raise RuntimeError("boom")
+        if request.action == "echo":
+            return request.data["blob"]
+        return os.getpid()
+
+
+class ProbeAgent(LocalAgent):
+    """Reports what the worker's protocol sees for another agent"""
+    def __init__(self, protocol):
+        super().__init__("probe", "Probe")
+        self.protocol = protocol
+
+    async def handle_request(self, request):
+        if request.action == "odd":
+            return Unpicklable(418, "teapot")
+        return self.protocol.is_available(request.data["agent"])
+
+
+def setup(protocol, index):
+    protocol.register_agent("probe", ProbeAgent(protocol), rate_limit=10**6)
+    protocol.register_agent("pid", PidAgent("pid", "Pid"), rate_limit=10**6)
+    protocol.register_agent("limited", PidAgent("limited", "Limited"), rate_limit=3)
+    protocol.register_agent("fragile", PidAgent("fragile", "Fragile"), failure_threshold=2)
+
+
+@pytest.fixture
+async def runtime():
+    shared = SharedState({
+        "limited": {"rate_limit": 3},
+        "fragile": {"failure_threshold": 2, "recovery_timeout": 60},
+    })
+    runtime = ShardedRuntime(
+        2, setup, shared=shared, protocol_options={"retry_policy": RetryPolicy(max_attempts=1)}
+    )
+    await runtime.start()
+    yield runtime
+    await runtime.stop()
+
+
+@pytest.mark.asyncio
+async def test_requests_are_spread_over_workers(runtime):
+    responses = await runtime.send_batch("pid", "run", [{}] * 6)
+    pids = {r.result for r in responses}
+    assert len(pids) == 2 and os.getpid() not in pids
+
+    runtime.shard_by = "agent"
+    responses = await runtime.send_batch("pid", "run", [{}] * 4)
+    assert len({r.result for r in responses}) == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_holds_across_workers(runtime):
+    results = await asyncio.gather(
+        *(runtime.send_request("u", "limited", "run", timeout=1) for _ in range(6)),
+        return_exceptions=True,
+    )
+    assert sum(not isinstance(r, Exception) for r in results) == 3
+    assert all(isinstance(r, RateLimitError) for r in results if isinstance(r, Exception))
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_is_shared(runtime):
+    for _ in range(2):
+        response = await runtime.send_request("u", "fragile", "fail")
+        assert not response.success
+    assert runtime.get_stats()["shared"]["fragile"]["circuit_state"] == "open"
+    for _ in range(2):
+        with pytest.raises(CircuitBreakerError):
+            await runtime.send_request("u", "fragile", "run")
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_is_seen_by_every_worker(runtime):
+    # Un fallo en cada worker abre el circuito compartido
+    for _ in range(2):
+        await runtime.send_request("u", "fragile", "fail")
+    probes = await runtime.send_batch("probe", "check", [{"agent": "fragile"}] * 4)
+    assert [p.result for p in probes] == [False] * 4
+
+
+@pytest.mark.asyncio
+async def test_replies_that_cannot_be_unpickled_fail_only_their_call(runtime):
+    for _ in range(2):
+        with pytest.raises(MCPError, match="Cannot send result"):
+            await runtime.send_request("u", "probe", "odd")
+    responses = await runtime.send_batch("pid", "run", [{}] * 2)
+    assert all(r.success for r in responses)
+
+    ok, payload = _encode(0, False, Unpicklable(418, "teapot"))
+    error = pickle.loads(payload)
+    assert not ok and isinstance(error, MCPError) and str(error) == "Unpicklable: 418: teapot"
+
+
+@pytest.mark.asyncio
+async def test_large_payloads_do_not_block_the_loop(runtime):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    clock = asyncio.ensure_future(ticker())
+    blob = os.urandom(4 * 1024 * 1024)
+    try:
+        responses = await asyncio.wait_for(
+            runtime.send_batch("pid", "echo", [{"blob": blob}] * 6), 30
+        )
+    finally:
+        clock.cancel()
+    assert all(r.result == blob for r in responses)
+    assert ticks > 1
+
+
+@pytest.mark.asyncio
+async def test_send_batch_bounds_in_flight_requests(runtime):
+    in_flight = peak = 0
+    send_request = runtime.send_request
+
+    async def counting(*args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await send_request(*args, **kwargs)
+        finally:
+            in_flight -= 1
+
+    runtime.send_request = counting
+    responses = await runtime.send_batch("pid", "run", ({} for _ in range(40)), concurrency=3)
+    assert len(responses) == 40 and all(r.success for r in responses)
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_stop_is_clean(runtime):
+    await runtime.stop()
+    assert runtime.get_stats()["alive"] == 0 and not runtime.running
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from mcpturbo_core.protocol import MCPProtocol
+from mcpturbo_core.streaming import SSEParser, StreamDelta
+from mcpturbo_core.exceptions import MCPError
+from mcpturbo_agents.base_agent import ExternalAgent
+
+
+class EchoStreamAgent(ExternalAgent):
+    def build_stream_payload(self, request):
+        return {"prompt": request.data.get("prompt", ""), "stream": True}
+
+    def parse_stream_event(self, event):
+        if event.data == "[DONE]":
+            return StreamDelta(done=True)
+        chunk = event.json()
+        return StreamDelta(text=chunk.get("t", ""), usage=chunk.get("usage"))
+
+    def build_stream_result(self, text, usage, model, request):
+        return {"text": text, "tokens_used": usage.get("total_tokens", 0)}
+
+
+def test_sse_parser_handles_split_chunks():
+    parser = SSEParser()
+    raw = b'event: delta\ndata: {"t": "he"}\n\n: comment\ndata: line1\r\ndata: line2\r\n\r\ndata: tail'
+    events = []
+    for i in range(0, len(raw), 3):
+        events.extend(parser.feed(raw[i:i + 3]))
+    events.extend(parser.flush())
+
+    assert [e.event for e in events] == ["delta", "message", "message"]
+    assert events[0].json() == {"t": "he"}
+    assert events[1].data == "line1\nline2"
+    assert events[2].data == "tail"
+
+
+@pytest.mark.asyncio
+async def test_stream_request_yields_deltas_before_completion(http_server):
+    release = asyncio.Event()
+
+    async def handler(request):
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+        await resp.write(b'data: {"t": "Hel"}\n\n')
+        await release.wait()
+        await resp.write(b'data: {"t": "lo", "usage": {"total_tokens": 7}}\n\n')
+        await resp.write(b"data: [DONE]\n\n")
+        return resp
+
+    url = await http_server(handler)
+    protocol = MCPProtocol()
+    await protocol.start()
+    try:
+        protocol.register_agent("streamer", EchoStreamAgent("streamer", "Streamer", api_url=url))
+        stream = await protocol.stream_request("user", "streamer", "generate", data={"prompt": "hi"})
+
+        assert protocol.admission.active == 1
+        deltas = []
+        async for delta in stream:
+            deltas.append(delta)
+            # The first token arrives while the server is still holding the rest
+            release.set()
+
+        assert deltas == ["Hel", "lo"]
+        assert stream.time_to_first_token is not None
+        assert protocol.admission.active == 0
+        assert stream.response.success
+        assert stream.response.result == {"text": "Hello", "tokens_used": 7}
+        assert stream.response.tokens_used == 7
+        assert protocol.messages_received == 1
+    finally:
+        await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_stream_request_raises_on_api_error(http_server):
+    async def handler(request):
+        return web.Response(status=429, text="slow down")
+
+    url = await http_server(handler)
+    protocol = MCPProtocol()
+    await protocol.start()
+    try:
+        protocol.register_agent("streamer", EchoStreamAgent("streamer", "Streamer", api_url=url))
+        with pytest.raises(MCPError, match="429"):
+            await protocol.stream_request("user", "streamer", "generate")
+        assert protocol.admission.active == 0
+        assert protocol.circuit_breakers["streamer"].failure_count == 1
+    finally:
+        await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_stream_request_requires_streaming_agent():
+    protocol = MCPProtocol()
+    await protocol.start()
+    try:
+        protocol.register_agent("plain", ExternalAgent("plain", "Plain", api_url="http://localhost"))
+        with pytest.raises(MCPError, match="does not support streaming"):
+            await protocol.stream_request("user", "plain", "generate")
+    finally:
+        await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_closing_an_unread_stream_releases_its_resources(http_server):
+    async def handler(request):
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+        await resp.write(b'data: {"t": "never read"}\n\n')
+        await asyncio.sleep(0.2)
+        return resp
+
+    url = await http_server(handler)
+    protocol = MCPProtocol()
+    await protocol.start()
+    try:
+        protocol.register_agent("streamer", EchoStreamAgent("streamer", "Streamer", api_url=url))
+        for _ in range(3):
+            async with await protocol.stream_request("user", "streamer", "generate"):
+                pass
+        stream = await protocol.stream_request("user", "streamer", "generate")
+        await stream.aclose()
+        await stream.aclose()
+
+        assert protocol.admission.active == 0
+        assert protocol.pools.pool_for(url).stats.in_flight == 0
+    finally:
+        await protocol.stop()
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from mcpturbo_core.exceptions import MCPError
+from mcpturbo_core.protocol import MCPProtocol
+from mcpturbo_core.retry import RetryPolicy
+from mcpturbo_core.transport import AgentServer, TransportClient
+from mcpturbo_core.messages import create_request
+from mcpturbo_agents.base_agent import LocalAgent, RemoteAgent
+from mcpturbo_agents.registry import AgentRegistry
+
+
+class SlowEcho(LocalAgent):
+    async def handle_request(self, request):
+        if request.action == "fail":
+            raise ValueError("bad input")
+        await asyncio.sleep(request.data.get("delay", 0))
+        return {"echo": request.data.get("value")}
+
+
+@pytest.fixture
+async def server():
+    registry = AgentRegistry()
+    registry.register(SlowEcho("echo", "Echo"))
+    async with AgentServer(registry) as server:
+        yield server
+
+
+@pytest.fixture
+async def client_protocol(server):
+    host, port = server.address
+    protocol = MCPProtocol(retry_policy=RetryPolicy(max_attempts=1))
+    protocol.register_agent("echo", RemoteAgent("echo", "Echo", host, port))
+    protocol.register_agent("alias", RemoteAgent("alias", "Alias", host, port, remote_agent_id="echo"))
+    protocol.register_agent("ghost", RemoteAgent("ghost", "Ghost", host, port))
+    await protocol.start()
+    yield protocol
+    await protocol.stop()
+
+
+@pytest.mark.asyncio
+async def test_remote_requests_share_one_connection(client_protocol, server):
+    # La respuesta lenta no bloquea a las rápidas: se correlacionan por id
+    slow = asyncio.ensure_future(
+        client_protocol.send_request("t", "echo", "run", {"value": "slow", "delay": 0.2})
+    )
+    fast = await asyncio.gather(*[
+        client_protocol.send_request("t", "alias", "run", {"value": i}) for i in range(5)
+    ])
+    assert not slow.done()
+    assert [r.result for r in fast] == [{"echo": i} for i in range(5)]
+    assert (await slow).result == {"echo": "slow"}
+
+    assert len(client_protocol.transport_clients) == 1
+    assert client_protocol.pending_requests == {}
+    assert server.requests_served == 6
+
+
+@pytest.mark.asyncio
+async def test_remote_errors_are_reported(client_protocol):
+    response = await client_protocol.send_request("t", "echo", "fail", {})
+    assert not response.success and response.error == "bad input"
+
+    response = await client_protocol.send_request("t", "ghost", "run", {})
+    assert not response.success and "not found" in response.error
+
+    host, port = client_protocol.agents["echo"].remote_address
+    client = TransportClient(host, port)
+    reply = await client.call(create_request("t", "ghost", "run"))
+    assert reply.data["error_code"] == "AGENT_NOT_FOUND"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_pending_requests_fail_when_server_goes_away(server):
+    host, port = server.address
+    client = TransportClient(host, port)
+    assert await client.list_agents() == ["echo"]
+
+    call = asyncio.ensure_future(client.call(create_request("t", "echo", "run", data={"delay": 5})))
+    await asyncio.sleep(0.05)
+    assert len(client.pending) == 1
+    await server.stop()
+    with pytest.raises(MCPError, match="closed"):
+        await call
+    assert client.pending == {}
+    await client.close()
@@ -13,6 +13,7 @@ from .orchestrator import (
     WorkflowStatus, TaskPriority, orchestrator
 )
 from .workflow_templates import TEMPLATE_BUILDERS
+from .artifacts import ArtifactRef, ArtifactStore, TaskInputs
 
 # Main exports
 __all__ = [
@@ -20,6 +21,9 @@ __all__ = [
     "ProjectOrchestrator",
     "Workflow", 
     "Task",
+    "ArtifactStore",
+    "ArtifactRef",
+    "TaskInputs",
     
     # Enums
     "WorkflowStatus",
@@ -0,0 +1,130 @@
+"""Workflow artifact store and lazy task inputs.
+
+Each completed task's result is stored once in an :class:`ArtifactStore`
+and dependents receive a :class:`TaskInputs` mapping that holds
+:class:`ArtifactRef` handles instead of the results themselves. A result is
+only looked up when an agent reads its ``"<task_id>_result"`` key, and
+bytes results can be read through a read-only ``memoryview`` so agents can
+slice large blobs without copying them.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+
+@dataclass(frozen=True)
+class ArtifactRef:
+    """Handle to a stored artifact.
+
+    The handle keeps the value alive, so inputs handed to an agent stay
+    readable after the workflow releases its artifacts.
+    """
+    key: str
+    kind: str  # "bytes", "text" u "object"
+    size: Optional[int] = None
+    value: Any = field(default=None, repr=False, compare=False)
+
+    def read(self) -> Any:
+        """The stored value itself, not a copy"""
+        return self.value
+
+    def view(self) -> memoryview:
+        """Zero-copy read-only view of a bytes artifact"""
+        if self.kind != "bytes":
+            raise TypeError(f"Artifact '{self.key}' is {self.kind}, not bytes")
+        return memoryview(self.value)
+
+
+class ArtifactStore:
+    """Holds each artifact once, keyed by ``"<workflow_id>/<task_id>"``."""
+
+    def __init__(self):
+        self._refs: Dict[str, ArtifactRef] = {}
+
+    def put(self, key: str, value: Any) -> ArtifactRef:
+        if isinstance(value, (bytearray, memoryview)):
+            # Una sola copia inmutable; el productor puede seguir mutando el suyo
+            value = bytes(value)
+        if isinstance(value, bytes):
+            ref = ArtifactRef(key, "bytes", len(value), value)
+        elif isinstance(value, str):
+            ref = ArtifactRef(key, "text", len(value), value)
+        else:
+            ref = ArtifactRef(key, "object", None, value)
+        self._refs[key] = ref
+        return ref
+
+    def ref(self, key: str) -> Optional[ArtifactRef]:
+        return self._refs.get(key)
+
+    def release(self, prefix: str):
+        """Forget every artifact whose key starts with ``prefix``"""
+        for key in [k for k in self._refs if k.startswith(prefix)]:
+            del self._refs[key]
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "artifacts": len(self._refs),
+            "bytes": sum(r.size for r in self._refs.values() if r.kind == "bytes"),
+            "text_chars": sum(r.size for r in self._refs.values() if r.kind == "text"),
+        }
+
+
+class TaskInputs(Mapping):
+    """Read-only view of a task's request data.
+
+    Keys resolve with the same precedence as the former merged dict:
+    dependency results over ``workflow.context`` over ``task.data``.
+    Nothing is copied; dependency results are only dereferenced when read.
+    """
+
+    __slots__ = ("_data", "_context", "_refs")
+
+    def __init__(self, data: Dict[str, Any], context: Dict[str, Any],
+                 refs: Dict[str, ArtifactRef]):
+        self._data = data
+        self._context = context
+        self._refs = refs
+
+    def __getitem__(self, key: str) -> Any:
+        ref = self._refs.get(key)
+        if ref is not None:
+            return ref.value
+        if key in self._context:
+            return self._context[key]
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._data
+        for key in self._context:
+            if key not in self._data:
+                yield key
+        for key in self._refs:
+            if key not in self._data and key not in self._context:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._refs or key in self._context or key in self._data
+
+    def ref(self, key: str) -> Optional[ArtifactRef]:
+        """Handle for a dependency result, without resolving it"""
+        return self._refs.get(key)
+
+    def view(self, key: str) -> memoryview:
+        ref = self._refs.get(key)
+        if ref is None:
+            raise KeyError(f"'{key}' is not an artifact")
+        return ref.view()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"TaskInputs({list(self)!r})"
@@ -1,13 +1,16 @@
 import asyncio
 import time
-from typing import Dict, List, Any, Callable, Optional
+from typing import Dict, List, Any, Callable, Optional, Set
 from datetime import datetime
 from .workflow_model import Workflow
 from .task_model import Task
 from .workflow_state import WorkflowStatus, TaskPriority
 from .workflow_templates import TEMPLATE_BUILDERS
+from .artifacts import ArtifactStore, TaskInputs
 from mcpturbo_core.protocol import protocol
+from mcpturbo_core.events import EventBus, Subscription
 from mcpturbo_core.exceptions import MCPError
+from mcpturbo_core.messages import Priority
 from mcpturbo_agents import BaseAgent
 from opentelemetry import metrics, trace
 
@@ -17,20 +20,32 @@ meter = metrics.get_meter(__name__)
 _workflow_counter = meter.create_counter("workflow_executions_total")
 _workflow_duration = meter.create_histogram("workflow_execution_duration")
 
+# Tópicos con puntos, para suscribirse con "task.*" o "workflow.#"
+_LEGACY_EVENTS = {
+    "workflow.started": "workflow_started",
+    "workflow.completed": "workflow_completed",
+    "task.started": "task_started",
+    "task.completed": "task_completed",
+}
+
+
 class ProjectOrchestrator:
     def __init__(self):
         self.workflows: Dict[str, Workflow] = {}
         self.agents: Dict[str, BaseAgent] = {}
-        self.event_handlers: Dict[str, List[Callable]] = {}
+        # Los handlers corren en sus propias tareas, fuera del camino crítico
+        self.events = EventBus()
         self.running_workflows: Dict[str, asyncio.Task] = {}
         self.max_concurrent_tasks = 10
+        # Resultados de tareas, guardados una vez y referenciados por handle
+        self.artifacts = ArtifactStore()
 
     def register_agent(self, agent: BaseAgent, **config):
         self.agents[agent.config.agent_id] = agent
         protocol.register_agent(agent.config.agent_id, agent, **config)
 
-    def subscribe_to_events(self, event: str, handler: Callable):
-        self.event_handlers.setdefault(event, []).append(handler)
+    def subscribe_to_events(self, event: str, handler: Callable, **options) -> Subscription:
+        return self.events.subscribe(event, handler, **options)
 
     def create_workflow_from_template(self, name: str, **kwargs) -> Workflow:
         """Instantiate a workflow from a named template.
@@ -76,29 +91,83 @@ class ProjectOrchestrator:
     async def _execute_workflow_internal(self, workflow: Workflow) -> Dict[str, Any]:
         workflow.status = WorkflowStatus.RUNNING
         workflow.started_at = datetime.utcnow()
-        await self._emit_event("workflow_started", {"workflow_id": workflow.id})
-
-        semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
+        await self._emit_event("workflow.started", {"workflow_id": workflow.id})
 
-        while not workflow.is_completed() and not workflow.has_failed():
-            ready_tasks = workflow.get_ready_tasks()
-            if not ready_tasks:
-                await asyncio.sleep(1)
-                continue
-            await asyncio.gather(*[
-                self._execute_task_with_semaphore(semaphore, workflow, task)
-                for task in ready_tasks
-            ])
+        try:
+            await self._run_scheduler(workflow)
+        finally:
+            # task.result y los handles ya entregados mantienen vivos los valores
+            self.artifacts.release(f"{workflow.id}/")
 
         workflow.completed_at = datetime.utcnow()
-        workflow.status = WorkflowStatus.FAILED if workflow.has_failed() else WorkflowStatus.COMPLETED
+        if workflow.is_completed() and not workflow.has_failed():
+            workflow.status = WorkflowStatus.COMPLETED
+        else:
+            workflow.status = WorkflowStatus.FAILED
 
-        await self._emit_event("workflow_completed", {
+        await self._emit_event("workflow.completed", {
             "workflow_id": workflow.id,
             "status": workflow.status.value
         })
         return self._generate_workflow_result(workflow)
 
+    async def _run_scheduler(self, workflow: Workflow):
+        """Launch each task as soon as its last dependency completes.
+
+        The workflow keeps a counter of unfinished dependencies per task.
+        Completion callbacks check only the finished task's dependents and
+        start the ones that became ready, so there are no polling sleeps and
+        no wave barriers between independent branches of the DAG. Once a
+        task fails no new tasks are started; in-flight ones may finish.
+        """
+        loop = asyncio.get_running_loop()
+        finished = loop.create_future()
+        semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
+        in_flight: Set[asyncio.Task] = set()
+        launched: Set[str] = set()
+        failed = False
+
+        def launch(tasks: List[Task]):
+            for task in sorted(tasks, key=lambda t: t.priority.value, reverse=True):
+                launched.add(task.id)
+                runner = asyncio.create_task(
+                    self._execute_task_with_semaphore(semaphore, workflow, task)
+                )
+                in_flight.add(runner)
+                runner.add_done_callback(lambda fut, task=task: on_done(task, fut))
+
+        def on_done(task: Task, fut: asyncio.Task):
+            nonlocal failed
+            in_flight.discard(fut)
+            if not fut.cancelled() and fut.exception() is not None:
+                task.error = str(fut.exception())
+                task.status = WorkflowStatus.FAILED
+
+            if task.status == WorkflowStatus.FAILED:
+                failed = True
+            elif not failed and task.status == WorkflowStatus.COMPLETED:
+                launch([
+                    dependent for dependent in workflow.get_dependents(task.id)
+                    if dependent.id not in launched and workflow.is_ready(dependent)
+                ])
+            elif not failed and task.status == WorkflowStatus.PENDING:
+                # _execute_task put the task back for another attempt
+                launch([task])
+
+            if not in_flight and not finished.done():
+                finished.set_result(None)
+
+        launch(workflow.get_ready_tasks())
+        if not in_flight:
+            return
+
+        try:
+            await finished
+        except asyncio.CancelledError:
+            for runner in list(in_flight):
+                runner.cancel()
+            raise
+
     async def _execute_task_with_semaphore(self, semaphore: asyncio.Semaphore, workflow: Workflow, task: Task):
         async with semaphore:
             await self._execute_task(workflow, task)
@@ -108,24 +177,29 @@ class ProjectOrchestrator:
         task.started_at = datetime.utcnow()
         task.attempts += 1
 
-        await self._emit_event("task_started", {"workflow_id": workflow.id, "task_id": task.id})
+        await self._emit_event("task.started", {"workflow_id": workflow.id, "task_id": task.id})
 
         try:
-            task_data = {**task.data, **workflow.context}
+            refs = {}
             for dep_id in task.dependencies:
-                dep = next((t for t in workflow.tasks if t.id == dep_id), None)
-                if dep and dep.status == WorkflowStatus.COMPLETED:
-                    task_data[f"{dep_id}_result"] = dep.result
+                ref = self.artifacts.ref(f"{workflow.id}/{dep_id}")
+                if ref is not None:
+                    refs[f"{dep_id}_result"] = ref
+            task_data = TaskInputs(task.data, workflow.context, refs)
 
             response = await protocol.send_request(
                 sender_id="orchestrator",
                 target_id=task.agent_id,
                 action=task.action,
                 data=task_data,
-                timeout=task.timeout
+                timeout=task.timeout,
+                priority=Priority(task.priority.value)
             )
 
             task.result = response.result if response.success else None
+            if response.success:
+                # Un bytearray se congela una vez; tarea y dependientes comparten el valor
+                task.result = self.artifacts.put(f"{workflow.id}/{task.id}", task.result).value
             task.error = response.error if not response.success else None
             task.status = WorkflowStatus.COMPLETED if response.success else WorkflowStatus.FAILED
 
@@ -138,7 +212,7 @@ class ProjectOrchestrator:
 
         task.completed_at = datetime.utcnow()
 
-        await self._emit_event("task_completed", {
+        await self._emit_event("task.completed", {
             "workflow_id": workflow.id,
             "task_id": task.id,
             "status": task.status.value
@@ -164,14 +238,12 @@ class ProjectOrchestrator:
         }
 
     async def _emit_event(self, event: str, data: Dict[str, Any]):
-        for handler in self.event_handlers.get(event, []):
-            try:
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(data)
-                else:
-                    handler(data)
-            except Exception:
-                continue
+        data = {"event": event, **data}
+        await self.events.publish(event, data)
+        # Nombres antiguos ("task_started"...), solo para quien se suscribió a ellos
+        legacy = _LEGACY_EVENTS.get(event)
+        if legacy and self.events.subscriptions.get(legacy):
+            await self.events.publish(legacy, data)
 
 # Singleton instance
 orchestrator = ProjectOrchestrator()
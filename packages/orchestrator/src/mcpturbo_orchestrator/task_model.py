@@ -21,3 +21,26 @@ class Task:
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     attempts: int = 0
+
+    def __setattr__(self, name: str, value: Any):
+        workflow = self.__dict__.get("_workflow")
+        if name == "dependencies" and workflow is not None:
+            # Inside a workflow the list is frozen; reassigning it reindexes
+            object.__setattr__(self, name, tuple(value))
+            workflow._on_task_dependencies_change(self)
+            return
+        if name != "status":
+            object.__setattr__(self, name, value)
+            return
+
+        previous = self.__dict__.get("status")
+        object.__setattr__(self, name, value)
+        # Keep the owning workflow's dependency index in sync
+        if workflow is not None and previous is not None and previous != value:
+            workflow._on_task_status_change(self, previous, value)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Sin la referencia al workflow: copiar o enviar una tarea no arrastra el grafo
+        state = self.__dict__.copy()
+        state.pop("_workflow", None)
+        return state
@@ -1,9 +1,11 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 from .workflow_state import WorkflowStatus
 from .task_model import Task
 
+_FINISHED = (WorkflowStatus.COMPLETED, WorkflowStatus.FAILED)
+
 @dataclass
 class Workflow:
     id: str
@@ -15,25 +17,113 @@ class Workflow:
     completed_at: Optional[datetime] = None
     context: Dict[str, Any] = field(default_factory=dict)
 
-    def get_ready_tasks(self) -> List[Task]:
-        ready_tasks = []
+    def __post_init__(self):
+        self._build_index()
+
+    def _build_index(self):
+        """Build the id index, reverse dependencies and the ready set.
+
+        Afterwards every status change on a task is applied incrementally
+        through :meth:`_on_task_status_change`, so lookups stay O(1) and
+        readiness is resolved in O(dependents) per completed task. Task
+        dependencies become tuples; assigning new ones rebuilds the index.
+        """
+        self._index: Dict[str, Task] = {}
+        self._order: Dict[str, int] = {}
+        self._dependents: Dict[str, List[Task]] = {}
+        self._unmet: Dict[str, int] = {}
+        self._ready: Set[str] = set()
+        self._finished = 0
+        self._failed = 0
+
+        self._size = len(self.tasks)
+        for position, task in enumerate(self.tasks):
+            self._index[task.id] = task
+            self._order.setdefault(task.id, position)
+            self._dependents.setdefault(task.id, [])
+            object.__setattr__(task, "_workflow", self)
+            object.__setattr__(task, "dependencies", tuple(task.dependencies))
+
+        completed = {t.id for t in self.tasks if t.status == WorkflowStatus.COMPLETED}
         for task in self.tasks:
-            if task.status != WorkflowStatus.PENDING:
-                continue
+            deps = set(task.dependencies)
+            for dep_id in deps:
+                self._dependents.setdefault(dep_id, []).append(task)
+            # Unknown dependency ids are never satisfied
+            self._unmet[task.id] = len(deps - completed)
+            if task.status in _FINISHED:
+                self._finished += 1
+            if task.status == WorkflowStatus.FAILED:
+                self._failed += 1
+            if task.status == WorkflowStatus.PENDING and self._unmet[task.id] == 0:
+                self._ready.add(task.id)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The index is rebuilt on load, which also restores the tasks' back-references
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._build_index()
+
+    def _ensure_index(self):
+        # ``tasks`` is a public list; rebuild if it was modified directly
+        if self._size != len(self.tasks):
+            self._build_index()
 
-            deps_completed = all(
-                any(t.id == dep_id and t.status == WorkflowStatus.COMPLETED for t in self.tasks)
-                for dep_id in task.dependencies
-            )
+    def _on_task_status_change(self, task: Task, previous: WorkflowStatus, current: WorkflowStatus):
+        if self._index.get(task.id) is not task:
+            return
 
-            if not task.dependencies or deps_completed:
-                ready_tasks.append(task)
+        self._finished += (current in _FINISHED) - (previous in _FINISHED)
+        self._failed += (current == WorkflowStatus.FAILED) - (previous == WorkflowStatus.FAILED)
 
-        ready_tasks.sort(key=lambda t: t.priority.value, reverse=True)
+        if current == WorkflowStatus.COMPLETED or previous == WorkflowStatus.COMPLETED:
+            delta = -1 if current == WorkflowStatus.COMPLETED else 1
+            for dependent in self._dependents.get(task.id, ()):
+                self._unmet[dependent.id] += delta
+                self._refresh_ready(dependent)
+
+        self._refresh_ready(task)
+
+    def _on_task_dependencies_change(self, task: Task):
+        if self._index.get(task.id) is task:
+            self._build_index()
+
+    def _refresh_ready(self, task: Task):
+        if task.status == WorkflowStatus.PENDING and self._unmet[task.id] == 0:
+            self._ready.add(task.id)
+        else:
+            self._ready.discard(task.id)
+
+    def add_task(self, task: Task):
+        """Append a task and update the dependency index."""
+        self.tasks.append(task)
+        self._build_index()
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        self._ensure_index()
+        return self._index.get(task_id)
+
+    def get_dependents(self, task_id: str) -> List[Task]:
+        """Tasks that list ``task_id`` among their dependencies."""
+        self._ensure_index()
+        return list(self._dependents.get(task_id, ()))
+
+    def is_ready(self, task: Task) -> bool:
+        self._ensure_index()
+        return task.status == WorkflowStatus.PENDING and self._unmet.get(task.id) == 0
+
+    def get_ready_tasks(self) -> List[Task]:
+        self._ensure_index()
+        ready_tasks = [self._index[task_id] for task_id in self._ready]
+        ready_tasks.sort(key=lambda t: (-t.priority.value, self._order[t.id]))
         return ready_tasks
 
     def is_completed(self) -> bool:
-        return all(task.status in [WorkflowStatus.COMPLETED, WorkflowStatus.FAILED] for task in self.tasks)
+        self._ensure_index()
+        return self._finished == len(self.tasks)
 
     def has_failed(self) -> bool:
-        return any(task.status == WorkflowStatus.FAILED for task in self.tasks)
+        self._ensure_index()
+        return self._failed > 0
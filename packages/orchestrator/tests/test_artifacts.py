@@ -0,0 +1,57 @@
+import pytest
+
+from mcpturbo_core.protocol import protocol
+from mcpturbo_orchestrator import ArtifactStore, ProjectOrchestrator, Task, TaskInputs, Workflow, WorkflowStatus
+from mcpturbo_agents.base_agent import LocalAgent
+
+
+def test_task_inputs_precedence_and_laziness():
+    store = ArtifactStore()
+    ref = store.put("wf/gen", bytearray(b"abcdef"))
+    assert ref.kind == "bytes" and ref.size == 6 and isinstance(ref.value, bytes)
+
+    inputs = TaskInputs({"a": 1, "mode": "data"}, {"mode": "context"}, {"gen_result": ref})
+    assert dict(inputs) == {"a": 1, "mode": "context", "gen_result": b"abcdef"}
+    assert inputs.get("missing") is None and "gen_result" in inputs
+    assert inputs.ref("gen_result") is ref
+
+    view = inputs.view("gen_result")
+    assert view.readonly and bytes(view[2:4]) == b"cd"
+    with pytest.raises(TypeError):
+        store.put("wf/text", "code").view()
+
+    store.release("wf/")
+    assert len(store) == 0
+    # Los handles entregados siguen siendo legibles tras liberar el workflow
+    assert inputs["gen_result"] is ref.value
+
+
+@pytest.mark.asyncio
+async def test_dependents_share_one_stored_result():
+    protocol.agents.clear()
+    seen = []
+
+    class Producer(LocalAgent):
+        async def handle_request(self, request):
+            return b"x" * 1024
+
+    class Consumer(LocalAgent):
+        async def handle_request(self, request):
+            seen.append(request.data["gen_result"])
+            assert isinstance(request.data, TaskInputs)
+            return len(request.data.view("gen_result"))
+
+    orch = ProjectOrchestrator()
+    orch.register_agent(Producer("producer", "Producer"))
+    orch.register_agent(Consumer("consumer", "Consumer"))
+    tasks = [Task(id="gen", agent_id="producer", action="run", data={}, timeout=30)]
+    tasks += [
+        Task(id=f"c{i}", agent_id="consumer", action="run", data={}, dependencies=["gen"], timeout=30)
+        for i in range(3)
+    ]
+    result = await orch.execute_workflow(Workflow(id="wf_art", name="Artifacts", tasks=tasks))
+
+    assert result["status"] == WorkflowStatus.COMPLETED.value
+    assert [t["result"] for t in result["tasks"][1:]] == [1024] * 3
+    assert all(blob is seen[0] for blob in seen)
+    assert len(orch.artifacts) == 0
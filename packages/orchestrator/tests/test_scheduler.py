@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+import pytest
+
+from mcpturbo_orchestrator import ProjectOrchestrator, Task, Workflow, WorkflowStatus
+from mcpturbo_agents.base_agent import LocalAgent
+
+
+class SleepAgent(LocalAgent):
+    """Agent that sleeps for ``data['delay']`` seconds and records timings."""
+
+    def __init__(self, agent_id="sleeper"):
+        super().__init__(agent_id, "Sleep Agent")
+        self.started = {}
+        self.finished = {}
+
+    async def handle_request(self, request):
+        task_id = request.data["task_id"]
+        self.started[task_id] = time.perf_counter()
+        await asyncio.sleep(request.data.get("delay", 0))
+        self.finished[task_id] = time.perf_counter()
+        return {"task_id": task_id}
+
+
+def _task(task_id, agent_id, delay=0.0, deps=None):
+    return Task(
+        id=task_id,
+        agent_id=agent_id,
+        action="sleep",
+        data={"task_id": task_id, "delay": delay},
+        dependencies=deps or [],
+        timeout=30,
+    )
+
+
+@pytest.mark.asyncio
+async def test_dependent_starts_without_waiting_for_slow_sibling():
+    orch = ProjectOrchestrator()
+    agent = SleepAgent("sleeper_dag")
+    orch.register_agent(agent)
+
+    wf = Workflow(
+        id="wf_dag",
+        name="DAG",
+        tasks=[
+            _task("slow", agent.config.agent_id, delay=0.3),
+            _task("fast", agent.config.agent_id, delay=0.01),
+            _task("after_fast", agent.config.agent_id, deps=["fast"]),
+        ],
+    )
+
+    result = await orch.execute_workflow(wf)
+
+    assert result["status"] == WorkflowStatus.COMPLETED.value
+    # The dependent of the fast branch must not wait for the slow sibling
+    assert agent.started["after_fast"] < agent.finished["slow"]
+
+
+@pytest.mark.asyncio
+async def test_chain_runs_without_polling_delay():
+    orch = ProjectOrchestrator()
+    agent = SleepAgent("sleeper_chain")
+    orch.register_agent(agent)
+
+    tasks = [_task("t0", agent.config.agent_id)]
+    for i in range(1, 5):
+        tasks.append(_task(f"t{i}", agent.config.agent_id, deps=[f"t{i - 1}"]))
+    wf = Workflow(id="wf_chain", name="Chain", tasks=tasks)
+
+    start = time.perf_counter()
+    result = await orch.execute_workflow(wf)
+
+    assert result["status"] == WorkflowStatus.COMPLETED.value
+    assert time.perf_counter() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_unsatisfiable_dependency_fails_instead_of_hanging():
+    orch = ProjectOrchestrator()
+    agent = SleepAgent("sleeper_missing")
+    orch.register_agent(agent)
+
+    wf = Workflow(
+        id="wf_missing",
+        name="Missing dep",
+        tasks=[
+            _task("t1", agent.config.agent_id),
+            _task("t2", agent.config.agent_id, deps=["does_not_exist"]),
+        ],
+    )
+
+    result = await asyncio.wait_for(orch.execute_workflow(wf), timeout=2)
+
+    assert result["status"] == WorkflowStatus.FAILED.value
+    statuses = {t["id"]: t["status"] for t in result["tasks"]}
+    assert statuses["t1"] == WorkflowStatus.COMPLETED.value
+    assert statuses["t2"] == WorkflowStatus.PENDING.value
+
+
+@pytest.mark.asyncio
+async def test_slow_event_subscriber_does_not_delay_tasks():
+    orch = ProjectOrchestrator()
+    agent = SleepAgent("sleeper_events")
+    orch.register_agent(agent)
+    seen = []
+
+    async def slow_hook(data):
+        await asyncio.sleep(0.1)
+        seen.append(data["task_id"])
+
+    orch.subscribe_to_events("task_started", slow_hook)
+    orch.subscribe_to_events("task_completed", slow_hook)
+
+    tasks = [_task("t0", agent.config.agent_id)]
+    for i in range(1, 4):
+        tasks.append(_task(f"t{i}", agent.config.agent_id, deps=[f"t{i - 1}"]))
+    wf = Workflow(id="wf_events", name="Events", tasks=tasks)
+
+    start = time.perf_counter()
+    result = await orch.execute_workflow(wf)
+    assert result["status"] == WorkflowStatus.COMPLETED.value
+    # 8 eventos × 100 ms si el hook estuviera en el camino crítico
+    assert time.perf_counter() - start < 0.3
+
+    await orch.events.drain(timeout=2)
+    assert len(seen) == 8
+
+
+@pytest.mark.asyncio
+async def test_dotted_topics_match_wildcard_subscriptions():
+    orch = ProjectOrchestrator()
+    agent = SleepAgent("sleeper_topics")
+    orch.register_agent(agent)
+    task_events, workflow_events, legacy = [], [], []
+
+    orch.subscribe_to_events("task.*", lambda data: task_events.append((data["event"], data["task_id"])))
+    orch.subscribe_to_events("workflow.#", lambda data: workflow_events.append(data["event"]))
+    orch.subscribe_to_events("task_completed", lambda data: legacy.append(data["task_id"]))
+
+    wf = Workflow(id="wf_topics", name="Topics", tasks=[
+        _task("a", agent.config.agent_id), _task("b", agent.config.agent_id, deps=["a"]),
+    ])
+    result = await orch.execute_workflow(wf)
+    assert result["status"] == WorkflowStatus.COMPLETED.value
+
+    await orch.events.drain(timeout=2)
+    assert task_events == [
+        ("task.started", "a"), ("task.completed", "a"), ("task.started", "b"), ("task.completed", "b"),
+    ]
+    assert workflow_events == ["workflow.started", "workflow.completed"]
+    assert legacy == ["a", "b"]
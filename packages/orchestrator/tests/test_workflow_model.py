@@ -0,0 +1,92 @@
+import copy
+import pickle
+
+import pytest
+
+from mcpturbo_orchestrator import Task, Workflow, WorkflowStatus, TaskPriority
+
+
+def _wf():
+    tasks = [
+        Task(id="a", agent_id="x", action="run", data={}),
+        Task(id="b", agent_id="x", action="run", data={}, dependencies=["a"]),
+        Task(id="c", agent_id="x", action="run", data={}, dependencies=["a"], priority=TaskPriority.HIGH),
+        Task(id="d", agent_id="x", action="run", data={}, dependencies=["b", "c"]),
+    ]
+    return Workflow(id="wf", name="index", tasks=tasks)
+
+
+def test_index_lookups():
+    wf = _wf()
+    assert wf.get_task("c").id == "c"
+    assert wf.get_task("missing") is None
+    assert [t.id for t in wf.get_dependents("a")] == ["b", "c"]
+
+
+def test_ready_set_follows_status_changes():
+    wf = _wf()
+    assert [t.id for t in wf.get_ready_tasks()] == ["a"]
+
+    wf.get_task("a").status = WorkflowStatus.RUNNING
+    assert wf.get_ready_tasks() == []
+
+    wf.get_task("a").status = WorkflowStatus.COMPLETED
+    # Higher priority first
+    assert [t.id for t in wf.get_ready_tasks()] == ["c", "b"]
+
+    wf.get_task("b").status = WorkflowStatus.COMPLETED
+    assert not wf.is_ready(wf.get_task("d"))
+    wf.get_task("c").status = WorkflowStatus.COMPLETED
+    assert [t.id for t in wf.get_ready_tasks()] == ["d"]
+
+    # Reverting a dependency makes the dependent wait again
+    wf.get_task("c").status = WorkflowStatus.PENDING
+    assert [t.id for t in wf.get_ready_tasks()] == ["c"]
+
+
+def test_completion_and_failure_counters():
+    wf = _wf()
+    assert not wf.is_completed()
+    for task_id in ("a", "b", "c"):
+        wf.get_task(task_id).status = WorkflowStatus.COMPLETED
+    wf.get_task("d").status = WorkflowStatus.FAILED
+    assert wf.is_completed()
+    assert wf.has_failed()
+
+    wf.get_task("d").status = WorkflowStatus.PENDING
+    assert not wf.is_completed()
+    assert not wf.has_failed()
+
+
+def test_tasks_appended_after_creation_are_indexed():
+    wf = _wf()
+    wf.tasks.append(Task(id="e", agent_id="x", action="run", data={}))
+    assert wf.get_task("e") is not None
+    wf.add_task(Task(id="f", agent_id="x", action="run", data={}, dependencies=["e"]))
+    assert [t.id for t in wf.get_dependents("e")] == ["f"]
+    assert {t.id for t in wf.get_ready_tasks()} == {"a", "e"}
+
+
+def test_copied_tasks_leave_the_workflow_behind():
+    wf = _wf()
+    task = pickle.loads(pickle.dumps(wf.get_task("b")))
+    assert "_workflow" not in task.__dict__ and task.dependencies == ("a",)
+    assert len(pickle.dumps(wf.get_task("b"))) < len(pickle.dumps(wf))
+
+    clone = copy.deepcopy(wf)
+    clone.get_task("a").status = WorkflowStatus.COMPLETED
+    assert [t.id for t in clone.get_ready_tasks()] == ["c", "b"]
+    assert [t.id for t in wf.get_ready_tasks()] == ["a"]
+
+
+def test_reassigned_dependencies_update_the_index():
+    wf = _wf()
+    d = wf.get_task("d")
+    d.dependencies = ["a"]
+    assert [t.id for t in wf.get_dependents("a")] == ["b", "c", "d"]
+    assert wf.get_dependents("b") == []
+
+    wf.get_task("a").status = WorkflowStatus.COMPLETED
+    assert wf.is_ready(d)
+    with pytest.raises(AttributeError):
+        d.dependencies.append("c")  # congeladas dentro del workflow